@@ -46,25 +46,30 @@ logger = logging.getLogger(__name__)
 # Import required libraries with error handling
 try:
     from diagrams import Diagram, Cluster, Edge
-    from diagrams.aws.compute import EC2, Lambda, ECS
+    from diagrams.aws.compute import EC2, Lambda, ECS, AutoScaling
     from diagrams.aws.database import RDS, Dynamodb
-    from diagrams.aws.network import VPC, ELB, CloudFront
+    from diagrams.aws.network import (VPC, ELB, CloudFront, PublicSubnet, PrivateSubnet,
+                                      InternetGateway, NATGateway)
     from diagrams.aws.storage import S3
-    from diagrams.aws.security import IAM, KMS
-    from diagrams.aws.management import Cloudformation, Cloudwatch, Config
-    from diagrams.aws.devtools import Codepipeline, Codebuild, Codecommit
-    from diagrams.aws.analytics import Athena, Glue
+    from diagrams.aws.security import IAM
+    from diagrams.aws.management import Cloudformation, Cloudwatch, Cloudtrail, Config
+    from diagrams.aws.devtools import Codepipeline, Codecommit
     from diagrams.onprem.client import Users
     from diagrams.onprem.vcs import Git
-    from diagrams.programming.language import Python, Bash
+    from diagrams.onprem.ci import Jenkins
+    from diagrams.onprem.iac import Terraform
+    from diagrams.onprem.monitoring import Grafana
+    from diagrams.programming.language import Python
     from diagrams.generic.blank import Blank
     from diagrams.generic.compute import Rack
     from diagrams.generic.database import SQL
     from diagrams.generic.network import Firewall
-    import matplotlib.pyplot as plt
-    import matplotlib.patches as patches
-    from matplotlib.patches import FancyBboxPatch
-    import numpy as np
+    from diagrams.generic.storage import Storage
+    try:
+        from diagrams.aws.management import CloudwatchLogs
+    except ImportError:
+        # Older diagrams releases have no separate CloudWatch Logs icon
+        from diagrams.aws.management import Cloudwatch as CloudwatchLogs
     logger.info("Successfully imported all required diagram libraries")
 except ImportError as e:
     logger.error(f"Failed to import required libraries: {e}")
@@ -104,7 +109,26 @@ DIAGRAM_CONFIG = {
     'rankdir': 'TB',           # Top to bottom layout
     'splines': 'ortho',        # Orthogonal edge routing
     'nodesep': '0.8',          # Node separation
-    'ranksep': '1.0'           # Rank separation
+    'ranksep': '1.0',          # Rank separation
+    # Graphviz attribute sets passed to Diagram() by the second set of diagrams
+    'graph_attr': {
+        'fontsize': '16',
+        'fontname': 'Arial',
+        'bgcolor': AWS_COLORS['white'],
+        'pad': '1.0',
+        'nodesep': '1.0',
+        'ranksep': '1.5',
+        'dpi': '300'
+    },
+    'node_attr': {
+        'fontsize': '12',
+        'fontname': 'Arial'
+    },
+    'edge_attr': {
+        'fontsize': '10',
+        'fontname': 'Arial',
+        'color': AWS_COLORS['accent']
+    }
 }
 
 class AWSInfrastructureDiagramGenerator:
@@ -681,27 +705,18 @@ Generated Diagrams:
 5. Figure 1.5: Cost Optimization and ROI Analysis
 
 Requirements:
-- matplotlib >= 3.7.0
-- numpy >= 1.24.0
-- seaborn >= 0.12.0
-- plotly >= 5.15.0
-- Pillow >= 10.0.0
+- diagrams >= 0.23.0
+- matplotlib >= 3.7.0 (only for the setup_figure()/create_rounded_box() helpers;
+  imported when they are first called, so graphviz-only diagrams start fast)
 
 Author: AWS Terraform Training Team
 Version: 3.0.0 (Updated for Terraform 1.13.0 & AWS Provider 6.12.0)
 Date: January 2025
 """
 
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch, Circle, Rectangle, Arrow
-import numpy as np
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
@@ -722,13 +737,23 @@ COLORS = {
     'medium_gray': '#8C9196'   # Medium Gray
 }
 
-# Professional styling configuration
-plt.style.use('default')
-sns.set_palette([COLORS['primary'], COLORS['accent'], COLORS['success'],
-                COLORS['secondary'], COLORS['warning']])
+# Color cycle for matplotlib figures
+PALETTE = [COLORS['primary'], COLORS['accent'], COLORS['success'],
+           COLORS['secondary'], COLORS['warning']]
+
+@lru_cache(maxsize=None)
+def get_pyplot():
+    """Import matplotlib and apply the professional styling, once, on first use."""
+    import matplotlib.pyplot as plt
+    from cycler import cycler
+
+    plt.style.use('default')
+    plt.rcParams['axes.prop_cycle'] = cycler(color=PALETTE)
+    return plt
 
 def setup_figure(figsize=(16, 12), dpi=300):
     """Setup figure with professional styling and AWS branding."""
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=figsize, dpi=dpi)
     fig.patch.set_facecolor(COLORS['white'])
     ax.set_facecolor(COLORS['background'])
@@ -763,6 +788,8 @@ def add_aws_branding(ax, title, subtitle=""):
 
 def create_rounded_box(ax, x, y, width, height, text, color, text_color='white'):
     """Create a rounded rectangle with text."""
+    from matplotlib.patches import FancyBboxPatch
+
     box = FancyBboxPatch((x, y), width, height,
                         boxstyle="round,pad=0.02",
                         facecolor=color, edgecolor=COLORS['secondary'],
@@ -10,7 +10,6 @@ Version: 2.0
 Date: January 2025
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -23,18 +22,15 @@ try:
     from diagrams.aws.security import IAM, KMS
     from diagrams.aws.storage import S3
     from diagrams.aws.management import Cloudwatch, Cloudtrail, Organizations
-    from diagrams.aws.general import General, Users, Client
+    from diagrams.aws.general import General
     from diagrams.onprem.vcs import Git
     from diagrams.onprem.ci import Jenkins
     from diagrams.onprem.client import Users as LocalUsers
     from diagrams.onprem.iac import Terraform
     from diagrams.programming.language import Python
-    from diagrams.generic.blank import Blank
     from diagrams.generic.compute import Rack
-    from diagrams.generic.network import Switch
     from diagrams.generic.storage import Storage
     from diagrams.generic.os import Ubuntu, Windows, IOS
-    from diagrams.onprem.monitoring import Grafana
 except ImportError as e:
     print(f"Error importing required libraries: {e}")
     print("Please install required packages: pip install diagrams")
@@ -350,9 +350,13 @@ resource "aws_lambda_function" "auto_shutdown" {
 
   environment {
     variables = {
-      STUDENT_NAME = var.student_name
-      ENVIRONMENT  = var.environment
-      REGION       = var.aws_region
+      STUDENT_NAME            = var.student_name
+      ENVIRONMENT             = var.environment
+      REGION                  = var.aws_region
+      SHUTDOWN_REGIONS        = join(",", var.auto_shutdown_regions)
+      SHUTDOWN_RESOURCE_TYPES = join(",", var.auto_shutdown_resource_types)
+      MAX_UPTIME_HOURS        = var.auto_shutdown_hours
+      METRICS_NAMESPACE       = local.monitoring_configuration.cloudwatch.metric_namespace
     }
   }
 
@@ -388,6 +392,73 @@ resource "aws_iam_role" "lambda_role" {
   }
 }
 
+# IAM policy for Lambda role: only the calls the auto-shutdown function makes
+resource "aws_iam_role_policy" "lambda_policy" {
+  count = var.create_test_resources && var.auto_shutdown_enabled ? 1 : 0
+
+  name = "terraform-cli-lambda-policy"
+  role = aws_iam_role.lambda_role[0].id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "ec2:Describe*",
+          "ec2:StopInstances",
+          "ec2:TerminateInstances",
+          "ec2:DeleteNatGateway"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "rds:DescribeDBInstances",
+          "rds:StopDBInstance"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "autoscaling:Describe*",
+          "autoscaling:UpdateAutoScalingGroup"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "eks:List*",
+          "eks:Describe*",
+          "eks:UpdateNodegroupConfig"
+        ]
+        Resource = "*"
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "logs:CreateLogGroup",
+          "logs:CreateLogStream",
+          "logs:PutLogEvents"
+        ]
+        Resource = [
+          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${aws_lambda_function.auto_shutdown[0].function_name}",
+          "arn:${data.aws_partition.current.partition}:logs:${data.aws_region.current.name}:${data.aws_caller_identity.current.account_id}:log-group:/aws/lambda/${aws_lambda_function.auto_shutdown[0].function_name}:*"
+        ]
+      },
+      {
+        # Unprocessed resources are handed to a follow-up invocation of itself
+        Effect   = "Allow"
+        Action   = "lambda:InvokeFunction"
+        Resource = aws_lambda_function.auto_shutdown[0].arn
+      }
+    ]
+  })
+}
+
 # Lambda function code
 data "archive_file" "lambda_zip" {
   count = var.create_test_resources && var.auto_shutdown_enabled ? 1 : 0
@@ -402,4 +473,10 @@ data "archive_file" "lambda_zip" {
     })
     filename = "index.py"
   }
+  
+  # On-demand price table used for cost savings estimates
+  source {
+    content  = file("${path.module}/scripts/price_table.json")
+    filename = "price_table.json"
+  }
 }
@@ -8,24 +8,188 @@ based on tags to optimize costs for training environments.
 """
 
 import json
-import boto3
 import logging
 import os
-from datetime import datetime, timezone
-from typing import List, Dict, Any
+import queue
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone, tzinfo
+from fnmatch import translate
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-ec2_client = boto3.client('ec2')
-s3_client = boto3.client('s3')
-
 # Environment variables
 STUDENT_NAME = os.environ.get('STUDENT_NAME', 'unknown')
 ENVIRONMENT = os.environ.get('ENVIRONMENT', 'development')
 REGION = os.environ.get('REGION', 'us-east-1')
+SHUTDOWN_REGIONS = [
+    region.strip() for region in os.environ.get('SHUTDOWN_REGIONS', '').split(',')
+    if region.strip()
+] or [REGION]
+SHUTDOWN_RESOURCE_TYPES = [
+    resource_type.strip() for resource_type in os.environ.get('SHUTDOWN_RESOURCE_TYPES', '').split(',')
+    if resource_type.strip()
+] or ['ec2-instance', 'rds-instance', 'autoscaling-group', 'nat-gateway', 'eks-nodegroup']
+
+# Upper bound on concurrent (resource type, region) collectors
+COLLECTOR_MAX_WORKERS = int(os.environ.get('COLLECTOR_MAX_WORKERS', '16'))
+
+# Instances managed by these groups are shut down through the group instead
+GROUP_MANAGED_TAGS = ['aws:autoscaling:groupName', 'eks:nodegroup-name']
+
+# DescribeInstances accepts MaxResults between 5 and 1000 when filtering
+EC2_PAGE_SIZE = min(max(int(os.environ.get('EC2_PAGE_SIZE', '1000')), 5), 1000)
+
+# StopInstances/TerminateInstances accept up to 1000 instance IDs per request
+EC2_BATCH_SIZE = min(max(int(os.environ.get('EC2_BATCH_SIZE', '1000')), 1), 1000)
+
+# Shutdown work runs on a bounded pool and stops being scheduled once less
+# than SHUTDOWN_DEADLINE_BUFFER_MS of the Lambda timeout remains
+SHUTDOWN_MAX_WORKERS = int(os.environ.get('SHUTDOWN_MAX_WORKERS', '8'))
+SHUTDOWN_DEADLINE_BUFFER_MS = int(os.environ.get('SHUTDOWN_DEADLINE_BUFFER_MS', '10000'))
+
+# Unprocessed resources can be handed to a follow-up asynchronous invocation
+REQUEUE_UNPROCESSED = os.environ.get('REQUEUE_UNPROCESSED', 'false').lower() in ['true', '1', 'yes']
+MAX_RESUME_ATTEMPTS = int(os.environ.get('MAX_RESUME_ATTEMPTS', '3'))
+RESUME_CHUNK_SIZE = 1000  # Keeps each async payload well under the 256 KB limit
+# Resume payloads only name resources; everything else is looked up again
+RESUME_FIELDS = ['type', 'id', 'region']
+
+# Error codes caused by a single instance ID; EC2 rejects the whole request for
+# them, so a failing batch is split to isolate the instance. Any other error
+# (throttling, permissions, service errors) affects every instance alike.
+EC2_INSTANCE_ERRORS = {
+    'InvalidInstanceID.NotFound', 'InvalidInstanceID.Malformed',
+    'IncorrectInstanceState', 'OperationNotPermitted'
+}
+
+# Shutdown policy (see compile_shutdown_policy for the rule syntax)
+MAX_UPTIME_HOURS = float(os.environ.get('MAX_UPTIME_HOURS', '4'))
+GRACE_PERIOD_MINUTES = float(os.environ.get('GRACE_PERIOD_MINUTES', '0'))
+BUSINESS_HOURS = os.environ.get('BUSINESS_HOURS', '')
+BUSINESS_HOURS_TIMEZONE = os.environ.get('BUSINESS_HOURS_TIMEZONE', 'UTC')
+SHUTDOWN_TAG_OVERRIDES = os.environ.get('SHUTDOWN_TAG_OVERRIDES', '')
+DRY_RUN = os.environ.get('DRY_RUN', 'false').lower() in ['true', '1', 'yes']
+
+# Per-resource policy tags
+ACTION_TAG = 'AutoShutdownAction'
+MAX_UPTIME_TAG = 'AutoShutdownMaxUptime'
+SCHEDULE_TAG = 'AutoShutdownSchedule'
+GRACE_UNTIL_TAG = 'AutoShutdownGraceUntil'
+
+# Bundled on-demand price table (refresh with refresh_price_table.py)
+PRICE_TABLE_PATH = os.environ.get(
+    'PRICE_TABLE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'price_table.json')
+)
+PRICE_TABLE_MAX_AGE_DAYS = int(os.environ.get('PRICE_TABLE_MAX_AGE_DAYS', '90'))
+
+# Price table section used for each resource type
+PRICING_SERVICES = {
+    'ec2-instance': 'ec2',
+    'autoscaling-group': 'ec2',
+    'eks-nodegroup': 'ec2',
+    'rds-instance': 'rds',
+    'nat-gateway': 'nat-gateway'
+}
+
+# CloudWatch Embedded Metric Format settings
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'AutoShutdown')
+EMF_MAX_VALUES = 100  # EMF accepts at most 100 values per metric array
+
+# Actions a policy may name; each resource type supports only some of them
+# (see 'actions' in RESOURCE_HANDLERS), and 'skip' applies to every type
+POLICY_ACTIONS = ['stop', 'terminate', 'scale-to-zero', 'delete', 'skip']
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+
+# Per-service, per-region clients, created on first use and kept for the
+# lifetime of the Lambda container so warm invocations reuse them
+_clients: Dict[Tuple[str, str], Any] = {}
+_clients_lock = threading.Lock()
+
+# (operation, region, latency_ms, is_error) for each API call in this invocation
+_api_calls: List[Tuple[str, str, float, bool]] = []
+
+def get_client(service: str, region: str) -> Any:
+    """
+    Get the client for a service and region, creating it on first use.
+    
+    boto3 is imported here rather than at module level, so only the clients
+    an invocation actually needs are paid for. Creation is serialized because
+    the default boto3 session is not thread-safe.
+    
+    Args:
+        service: AWS service name (e.g. 'ec2', 'rds')
+        region: AWS region name
+        
+    Returns:
+        boto3 client for the service and region
+    """
+    key = (service, region)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                import boto3
+                client = boto3.client(service, region_name=region)
+                register_api_call_timing(client, region)
+                _clients[key] = client
+    return client
+
+def register_api_call_timing(client: Any, region: str) -> None:
+    """
+    Record the latency of every API call made through a client.
+    
+    Uses botocore's before-call/after-call events, so paginators and
+    retries are covered without wrapping each call site.
+    
+    Args:
+        client: boto3 client
+        region: AWS region of the client
+    """
+    def start_timer(context: Dict[str, Any], model: Any = None, **kwargs: Any) -> None:
+        context['auto_shutdown_call_start'] = time.perf_counter()
+        if model is not None:
+            context['auto_shutdown_operation'] = model.name
+    
+    def record(context: Dict[str, Any], event_name: str, is_error: bool) -> None:
+        start = context.pop('auto_shutdown_call_start', None)
+        if start is not None:
+            # Event names look like 'after-call.ec2.StopInstances'
+            operation = context.get('auto_shutdown_operation') or event_name.rsplit('.', 1)[-1]
+            _api_calls.append((operation, region, (time.perf_counter() - start) * 1000, is_error))
+    
+    def record_call(context: Dict[str, Any], model: Any = None, http_response: Any = None,
+                    event_name: str = '', **kwargs: Any) -> None:
+        is_error = http_response is None or http_response.status_code >= 400
+        record(context, event_name, is_error)
+    
+    def record_error(context: Dict[str, Any], exception: Optional[Exception] = None,
+                     event_name: str = '', **kwargs: Any) -> None:
+        # Emitted when no response arrived (connection errors); carries no model
+        record(context, event_name, True)
+    
+    client.meta.events.register('before-call', start_timer)
+    client.meta.events.register('after-call', record_call)
+    client.meta.events.register('after-call-error', record_error)
+
+def get_ec2_client(region: str) -> Any:
+    """
+    Get the EC2 client for a region, creating it on first use.
+    
+    Args:
+        region: AWS region name
+        
+    Returns:
+        boto3 EC2 client for the region
+    """
+    return get_client('ec2', region)
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -38,12 +202,30 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         Dict containing execution results
     """
+    dry_run = bool((event or {}).get('dry_run', DRY_RUN))
+    
+    # Clients outlive the invocation; API call metrics must not
+    _api_calls.clear()
+    
     logger.info(f"Auto-shutdown Lambda started for student: {STUDENT_NAME}")
     logger.info(f"Environment: {ENVIRONMENT}, Region: {REGION}")
+    logger.info(f"Shutdown regions: {', '.join(SHUTDOWN_REGIONS)}")
     
     try:
-        # Get resources to shutdown
-        resources_to_shutdown = get_resources_to_shutdown()
+        resume_resources = (event or {}).get('resume_resources')
+        resume_attempt = (event or {}).get('resume_attempt', 0)
+        
+        if resume_resources:
+            # A previous invocation ran out of time; check what it named against
+            # discovery's filters and the policy again before acting on it
+            logger.info(f"Resuming shutdown of {len(resume_resources)} resources (attempt {resume_attempt})")
+            resources_to_shutdown = rediscover_resources(resume_resources)
+            if len(resources_to_shutdown) < len(resume_resources):
+                logger.warning(f"Ignoring {len(resume_resources) - len(resources_to_shutdown)} resumed "
+                               f"resources that no longer qualify for auto-shutdown")
+        else:
+            # Get resources to shutdown
+            resources_to_shutdown = get_resources_to_shutdown()
         
         if not resources_to_shutdown:
             logger.info("No resources found for auto-shutdown")
@@ -57,11 +239,39 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 })
             }
         
-        # Process shutdown for each resource
-        shutdown_results = []
-        for resource in resources_to_shutdown:
-            result = process_resource_shutdown(resource)
-            shutdown_results.append(result)
+        # Evaluate the shutdown policy in one pass over the discovered resources
+        decisions = evaluate_shutdown_policy(resources_to_shutdown)
+        selected = [
+            dict(resource, shutdown_action=decision['action'])
+            for resource, decision in zip(resources_to_shutdown, decisions)
+            if decision['action'] != 'skip'
+        ]
+        skipped_count = len(decisions) - len(selected)
+        
+        if dry_run:
+            for decision in decisions:
+                logger.info(f"DRY RUN: {decision['resource_id']} -> {decision['action']} "
+                            f"({decision['rule']}: {decision['reason']})")
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    'message': f'Dry run: {len(selected)} of {len(decisions)} resources would be shut down',
+                    'student_name': STUDENT_NAME,
+                    'environment': ENVIRONMENT,
+                    'dry_run': True,
+                    'decisions': decisions,
+                    'timestamp': datetime.now(timezone.utc).isoformat()
+                })
+            }
+        
+        # Process shutdown concurrently, batching EC2 instances by region and action
+        shutdown_results, unprocessed = process_resources_shutdown(selected, context)
+        savings = get_cost_savings_estimate(shutdown_results)
+        log_shutdown_metrics(shutdown_results, savings=savings)
+        
+        requeued = False
+        if unprocessed and REQUEUE_UNPROCESSED:
+            requeued = requeue_unprocessed(unprocessed, context, resume_attempt + 1)
         
         # Return success response
         return {
@@ -71,6 +281,11 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'student_name': STUDENT_NAME,
                 'environment': ENVIRONMENT,
                 'resources_processed': len(shutdown_results),
+                'resources_skipped': skipped_count,
+                'resources_unprocessed': len(unprocessed),
+                'unprocessed': [serialize_resource(resource) for resource in unprocessed],
+                'requeued': requeued,
+                'estimated_savings': savings,
                 'results': shutdown_results,
                 'timestamp': datetime.now(timezone.utc).isoformat()
             })
@@ -90,22 +305,29 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             })
         }
 
-def get_resources_to_shutdown() -> List[Dict[str, Any]]:
+def get_resources_to_shutdown(resource_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Get resources that should be shut down based on tags.
     
+    Args:
+        resource_types: Resource types to collect (defaults to SHUTDOWN_RESOURCE_TYPES)
+        
     Returns:
         List of resource dictionaries
     """
-    resources = []
+    resource_types = resource_types or SHUTDOWN_RESOURCE_TYPES
     
     try:
-        # Get EC2 instances
-        ec2_instances = get_ec2_instances_to_shutdown()
-        resources.extend(ec2_instances)
+        unknown_types = [t for t in resource_types if t not in RESOURCE_HANDLERS]
+        if unknown_types:
+            logger.warning(f"Ignoring unknown resource types: {', '.join(unknown_types)}")
         
-        # Get other resources (S3 buckets, etc.) if needed
-        # For this lab, we'll focus on EC2 instances
+        tasks = [
+            (resource_type, region)
+            for resource_type in resource_types if resource_type in RESOURCE_HANDLERS
+            for region in SHUTDOWN_REGIONS
+        ]
+        resources = list(stream_collected_resources(tasks))
         
         logger.info(f"Found {len(resources)} resources for potential shutdown")
         return resources
@@ -114,55 +336,487 @@ def get_resources_to_shutdown() -> List[Dict[str, Any]]:
         logger.error(f"Error getting resources: {str(e)}")
         raise
 
-def get_ec2_instances_to_shutdown() -> List[Dict[str, Any]]:
+def get_ec2_instances_to_shutdown(regions: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
     """
-    Get EC2 instances that should be shut down.
+    Get EC2 instances that should be shut down across regions.
     
-    Returns:
-        List of EC2 instance dictionaries
+    Args:
+        regions: Regions to search (defaults to SHUTDOWN_REGIONS)
+        
+    Yields:
+        EC2 instance dictionaries
+    """
+    regions = regions or SHUTDOWN_REGIONS
+    return stream_collected_resources([('ec2-instance', region) for region in regions])
+
+def stream_collected_resources(tasks: List[Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+    """
+    Run resource collectors concurrently and stream their results.
+    
+    Each (resource type, region) pair is collected by its own worker with
+    its own client, and resources are yielded page by page as soon as any
+    collector returns one. A failing collector is logged and skipped without
+    affecting the others.
+    
+    Args:
+        tasks: (resource type, region) pairs to collect
+        
+    Yields:
+        Resource dictionaries
+    """
+    if not tasks:
+        return
+    
+    # Create clients on the calling thread so workers start without waiting
+    # on the client lock
+    clients = [
+        (resource_type, region, get_client(RESOURCE_HANDLERS[resource_type]['service'], region))
+        for resource_type, region in tasks
+    ]
+    pages: queue.Queue = queue.Queue()
+    
+    with ThreadPoolExecutor(max_workers=min(len(clients), COLLECTOR_MAX_WORKERS)) as executor:
+        for resource_type, region, client in clients:
+            executor.submit(run_collector, resource_type, client, region, pages)
+        
+        # Each worker puts a final None once its collector is exhausted
+        pending_collectors = len(clients)
+        while pending_collectors:
+            page = pages.get()
+            if page is None:
+                pending_collectors -= 1
+                continue
+            yield from page
+
+def run_collector(resource_type: str, client: Any, region: str, pages: queue.Queue) -> None:
+    """
+    Run one resource collector and forward its pages to the queue.
+    
+    Args:
+        resource_type: Resource type to collect
+        client: Client for the resource type's service in the region
+        region: AWS region name
+        pages: Queue receiving one list of resources per API page
     """
     try:
-        # Define filters for instances to shutdown
-        filters = [
-            {
-                'Name': 'tag:Student',
-                'Values': [STUDENT_NAME]
-            },
-            {
-                'Name': 'tag:Environment',
-                'Values': [ENVIRONMENT]
-            },
-            {
-                'Name': 'tag:AutoShutdown',
-                'Values': ['true', 'enabled']
-            },
-            {
-                'Name': 'instance-state-name',
-                'Values': ['running']
-            }
-        ]
+        resource_count = 0
+        for page in RESOURCE_HANDLERS[resource_type]['collect'](client, region):
+            resource_count += len(page)
+            pages.put(page)
         
-        # Get instances
-        response = ec2_client.describe_instances(Filters=filters)
+        logger.info(f"Found {resource_count} {resource_type} resources in {region}")
+        
+    except Exception as e:
+        logger.error(f"Error getting {resource_type} resources in {region}: {str(e)}")
+        
+    finally:
+        pages.put(None)
+
+def matches_shutdown_tags(tags: Dict[str, str]) -> bool:
+    """
+    Check whether a resource carries this student's auto-shutdown tags.
+    
+    Used by collectors whose APIs cannot filter on tags server-side.
+    
+    Args:
+        tags: Resource tags
         
+    Returns:
+        True if the resource is opted in to auto-shutdown
+    """
+    return (tags.get('Student') == STUDENT_NAME and
+            tags.get('Environment') == ENVIRONMENT and
+            tags.get('AutoShutdown') in ['true', 'enabled'])
+
+def get_tag_filters() -> List[Dict[str, Any]]:
+    """
+    Get the server-side tag filters for auto-shutdown resources.
+    
+    Returns:
+        List of EC2-style filters
+    """
+    return [
+        {
+            'Name': 'tag:Student',
+            'Values': [STUDENT_NAME]
+        },
+        {
+            'Name': 'tag:Environment',
+            'Values': [ENVIRONMENT]
+        },
+        {
+            'Name': 'tag:AutoShutdown',
+            'Values': ['true', 'enabled']
+        }
+    ]
+
+def collect_ec2_instances(client: Any, region: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through running, auto-shutdown tagged instances in one region.
+    
+    Instances launched by Auto Scaling groups or EKS node groups are left
+    to those collectors, since stopping them would only trigger replacements.
+    
+    Args:
+        client: EC2 client for the region
+        region: AWS region name
+        
+    Yields:
+        One list of instance dictionaries per API page
+    """
+    # Define filters for instances to shutdown
+    filters = get_tag_filters() + [
+        {
+            'Name': 'instance-state-name',
+            'Values': ['running']
+        }
+    ]
+    
+    paginator = client.get_paginator('describe_instances')
+    page_iterator = paginator.paginate(
+        Filters=filters,
+        PaginationConfig={'PageSize': EC2_PAGE_SIZE}
+    )
+    
+    for page in page_iterator:
         instances = []
-        for reservation in response['Reservations']:
+        for reservation in page['Reservations']:
             for instance in reservation['Instances']:
-                instance_info = {
+                tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
+                if any(tag in tags for tag in GROUP_MANAGED_TAGS):
+                    continue
+                instances.append({
                     'type': 'ec2-instance',
                     'id': instance['InstanceId'],
+                    'region': region,
                     'instance_type': instance['InstanceType'],
                     'launch_time': instance['LaunchTime'],
                     'state': instance['State']['Name'],
-                    'tags': {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-                }
-                instances.append(instance_info)
+                    'tags': tags
+                })
+        yield instances
+
+def collect_rds_instances(client: Any, region: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through available, auto-shutdown tagged RDS instances in one region.
+    
+    Aurora cluster members are skipped because they cannot be stopped
+    individually.
+    
+    Args:
+        client: RDS client for the region
+        region: AWS region name
+        
+    Yields:
+        One list of DB instance dictionaries per API page
+    """
+    paginator = client.get_paginator('describe_db_instances')
+    
+    for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
+        db_instances = []
+        for db_instance in page['DBInstances']:
+            tags = {tag['Key']: tag['Value'] for tag in db_instance.get('TagList', [])}
+            if (db_instance['DBInstanceStatus'] != 'available' or
+                    db_instance.get('DBClusterIdentifier') or not matches_shutdown_tags(tags)):
+                continue
+            db_instances.append({
+                'type': 'rds-instance',
+                'id': db_instance['DBInstanceIdentifier'],
+                'region': region,
+                'instance_type': db_instance['DBInstanceClass'],
+                'engine': db_instance['Engine'],
+                'launch_time': db_instance.get('InstanceCreateTime'),
+                'state': db_instance['DBInstanceStatus'],
+                'tags': tags
+            })
+        yield db_instances
+
+def collect_autoscaling_groups(client: Any, region: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through auto-shutdown tagged Auto Scaling groups with running capacity.
+    
+    Args:
+        client: Auto Scaling client for the region
+        region: AWS region name
         
-        return instances
+    Yields:
+        One list of Auto Scaling group dictionaries per API page
+    """
+    paginator = client.get_paginator('describe_auto_scaling_groups')
+    page_iterator = paginator.paginate(
+        Filters=get_tag_filters(),
+        PaginationConfig={'PageSize': 100}
+    )
+    
+    for page in page_iterator:
+        groups = []
+        for group in page['AutoScalingGroups']:
+            if group['DesiredCapacity'] == 0:
+                continue
+            instance_types = [instance['InstanceType'] for instance in group.get('Instances', [])
+                              if 'InstanceType' in instance]
+            groups.append({
+                'type': 'autoscaling-group',
+                'id': group['AutoScalingGroupName'],
+                'region': region,
+                'instance_type': instance_types[0] if instance_types else 'unknown',
+                'capacity': group['DesiredCapacity'],
+                'launch_time': group['CreatedTime'],
+                'state': 'running',
+                'tags': {tag['Key']: tag['Value'] for tag in group.get('Tags', [])}
+            })
+        yield groups
+
+def collect_nat_gateways(client: Any, region: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Page through available, auto-shutdown tagged NAT gateways in one region.
+    
+    Args:
+        client: EC2 client for the region
+        region: AWS region name
+        
+    Yields:
+        One list of NAT gateway dictionaries per API page
+    """
+    filters = get_tag_filters() + [
+        {
+            'Name': 'state',
+            'Values': ['available']
+        }
+    ]
+    
+    paginator = client.get_paginator('describe_nat_gateways')
+    
+    for page in paginator.paginate(Filter=filters, PaginationConfig={'PageSize': 1000}):
+        yield [
+            {
+                'type': 'nat-gateway',
+                'id': nat_gateway['NatGatewayId'],
+                'region': region,
+                'instance_type': 'nat-gateway',
+                'vpc_id': nat_gateway.get('VpcId'),
+                'launch_time': nat_gateway['CreateTime'],
+                'state': nat_gateway['State'],
+                'tags': {tag['Key']: tag['Value'] for tag in nat_gateway.get('Tags', [])}
+            }
+            for nat_gateway in page['NatGateways']
+        ]
+
+def collect_eks_nodegroups(client: Any, region: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Collect active, auto-shutdown tagged EKS managed node groups in one region.
+    
+    Args:
+        client: EKS client for the region
+        region: AWS region name
+        
+    Yields:
+        One list of node group dictionaries per cluster
+    """
+    for clusters_page in client.get_paginator('list_clusters').paginate():
+        for cluster_name in clusters_page['clusters']:
+            nodegroups = []
+            for nodegroups_page in client.get_paginator('list_nodegroups').paginate(clusterName=cluster_name):
+                for nodegroup_name in nodegroups_page['nodegroups']:
+                    nodegroup = client.describe_nodegroup(
+                        clusterName=cluster_name,
+                        nodegroupName=nodegroup_name
+                    )['nodegroup']
+                    tags = nodegroup.get('tags', {})
+                    scaling = nodegroup.get('scalingConfig', {})
+                    if (nodegroup['status'] != 'ACTIVE' or scaling.get('desiredSize', 0) == 0 or
+                            not matches_shutdown_tags(tags)):
+                        continue
+                    nodegroups.append({
+                        'type': 'eks-nodegroup',
+                        'id': f"{cluster_name}/{nodegroup_name}",
+                        'region': region,
+                        'instance_type': (nodegroup.get('instanceTypes') or ['unknown'])[0],
+                        'capacity': scaling['desiredSize'],
+                        'max_size': scaling.get('maxSize', 1),
+                        'launch_time': nodegroup['createdAt'],
+                        'state': nodegroup['status'],
+                        'tags': tags
+                    })
+            yield nodegroups
+
+def process_resources_shutdown(resources: List[Dict[str, Any]],
+                               context: Any = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Process shutdown for a list of resources on a bounded worker pool.
+    
+    EC2 instances are grouped by region and action into batches of up to
+    EC2_BATCH_SIZE per API call; other resource types have no batch APIs
+    and are one unit of work each. At most SHUTDOWN_MAX_WORKERS units run
+    at once, and no new unit is scheduled once the Lambda has less than
+    SHUTDOWN_DEADLINE_BUFFER_MS left, so in-flight calls can finish.
+    
+    Args:
+        resources: Resource information dictionaries
+        context: Lambda context object, used for the remaining time
+        
+    Returns:
+        Tuple of (shutdown results, resources that were not processed)
+    """
+    units = build_shutdown_units(resources)
+    results: List[Dict[str, Any]] = []
+    unprocessed: List[Dict[str, Any]] = []
+    pending: Dict[Future, List[Dict[str, Any]]] = {}
+    
+    def collect(done: set) -> None:
+        for future in done:
+            unit_resources = pending.pop(future)
+            try:
+                results.extend(future.result())
+            except Exception as e:
+                logger.error(f"Error processing shutdown batch: {str(e)}")
+                results.extend(
+                    build_shutdown_result(r, r.get('region', REGION), 'failed', 'error', error=str(e))
+                    for r in unit_resources
+                )
+    
+    with ThreadPoolExecutor(max_workers=SHUTDOWN_MAX_WORKERS) as executor:
+        for index, (unit_resources, task) in enumerate(units):
+            # Wait for a free worker before deciding whether there is time left
+            while len(pending) >= SHUTDOWN_MAX_WORKERS:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                collect(done)
+            
+            remaining_ms = get_remaining_time_ms(context)
+            if remaining_ms is not None and remaining_ms < SHUTDOWN_DEADLINE_BUFFER_MS:
+                unprocessed = [r for later_resources, _ in units[index:] for r in later_resources]
+                logger.warning(f"Deadline approaching ({remaining_ms} ms left): "
+                               f"{len(unprocessed)} resources left unprocessed")
+                break
+            
+            pending[executor.submit(task)] = unit_resources
+        
+        if pending:
+            done, _ = wait(list(pending))
+            collect(done)
+    
+    return results, unprocessed
+
+def build_shutdown_units(resources: List[Dict[str, Any]]) -> List[Tuple[List[Dict[str, Any]], Callable[[], List[Dict[str, Any]]]]]:
+    """
+    Split resources into independently schedulable units of shutdown work.
+    
+    Args:
+        resources: Resource information dictionaries
+        
+    Returns:
+        List of (resources in the unit, task returning their results)
+    """
+    units = []
+    ec2_groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    
+    for resource in resources:
+        if resource['type'] == 'ec2-instance':
+            action = resource.get('shutdown_action') or get_ec2_shutdown_action()
+            key = (resource.get('region', REGION), action)
+            ec2_groups.setdefault(key, []).append(resource)
+        else:
+            units.append(([resource], lambda resource=resource: [process_resource_shutdown(resource)]))
+    
+    for (region, action), instances in ec2_groups.items():
+        for start in range(0, len(instances), EC2_BATCH_SIZE):
+            batch = instances[start:start + EC2_BATCH_SIZE]
+            units.append((batch, lambda batch=batch, region=region, action=action:
+                          shutdown_ec2_instances(batch, region, action)))
+    
+    return units
+
+def get_remaining_time_ms(context: Any) -> Optional[int]:
+    """
+    Get the time left before the Lambda times out.
+    
+    Args:
+        context: Lambda context object
+        
+    Returns:
+        Milliseconds remaining, or None outside Lambda
+    """
+    get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    return get_remaining() if callable(get_remaining) else None
+
+def serialize_resource(resource: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce a resource to the JSON-safe fields that identify it for a resume.
+    
+    Args:
+        resource: Resource information dictionary
+        
+    Returns:
+        Serializable resource dictionary
+    """
+    return {field: resource[field] for field in RESUME_FIELDS if field in resource}
+
+def rediscover_resources(requested: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Look the resources named in a resume payload up again.
+    
+    Anyone allowed to invoke the function can send a payload, so it is not
+    trusted: the (resource type, region) pairs it names are collected again
+    with discovery's tag and state filters, limited to SHUTDOWN_RESOURCE_TYPES
+    and SHUTDOWN_REGIONS, and only resources found there are kept, with their
+    current tags for policy evaluation.
+    
+    Args:
+        requested: Resources from the payload, as written by serialize_resource
+        
+    Returns:
+        Resource dictionaries that still qualify for auto-shutdown
+    """
+    wanted = {
+        (resource.get('type'), resource.get('region', REGION), resource.get('id'))
+        for resource in requested if isinstance(resource, dict)
+    }
+    tasks = sorted({
+        (resource_type, region) for resource_type, region, _ in wanted
+        if resource_type in RESOURCE_HANDLERS and resource_type in SHUTDOWN_RESOURCE_TYPES
+        and region in SHUTDOWN_REGIONS
+    })
+    return [
+        resource for resource in stream_collected_resources(tasks)
+        if (resource['type'], resource['region'], resource['id']) in wanted
+    ]
+
+def requeue_unprocessed(resources: List[Dict[str, Any]], context: Any, attempt: int) -> bool:
+    """
+    Hand unprocessed resources to asynchronous invocations of this function.
+    
+    Args:
+        resources: Resources that were not processed
+        context: Lambda context object
+        attempt: Resume attempt number for the follow-up invocations
+        
+    Returns:
+        True if every chunk was enqueued
+    """
+    function_name = getattr(context, 'function_name', None)
+    if not function_name or attempt > MAX_RESUME_ATTEMPTS:
+        logger.warning(f"Not re-enqueuing {len(resources)} resources (attempt {attempt})")
+        return False
+    
+    try:
+        lambda_client = get_client('lambda', REGION)
+        for start in range(0, len(resources), RESUME_CHUNK_SIZE):
+            chunk = resources[start:start + RESUME_CHUNK_SIZE]
+            lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=json.dumps({
+                    'resume_resources': [serialize_resource(resource) for resource in chunk],
+                    'resume_attempt': attempt
+                })
+            )
+        
+        logger.info(f"Re-enqueued {len(resources)} resources for a follow-up invocation")
+        return True
         
     except Exception as e:
-        logger.error(f"Error getting EC2 instances: {str(e)}")
-        return []
+        logger.error(f"Error re-enqueuing unprocessed resources: {str(e)}")
+        return False
 
 def process_resource_shutdown(resource: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -180,8 +834,8 @@ def process_resource_shutdown(resource: Dict[str, Any]) -> Dict[str, Any]:
     try:
         logger.info(f"Processing shutdown for {resource_type}: {resource_id}")
         
-        if resource_type == 'ec2-instance':
-            return shutdown_ec2_instance(resource)
+        if resource_type in RESOURCE_HANDLERS:
+            return RESOURCE_HANDLERS[resource_type]['shutdown'](resource)
         else:
             logger.warning(f"Unknown resource type: {resource_type}")
             return {
@@ -203,6 +857,19 @@ def process_resource_shutdown(resource: Dict[str, Any]) -> Dict[str, Any]:
             'timestamp': datetime.now(timezone.utc).isoformat()
         }
 
+def get_ec2_shutdown_action() -> str:
+    """
+    Determine the default shutdown action for EC2 instances.
+    
+    Policy overrides and the AutoShutdownAction tag take precedence.
+    
+    Returns:
+        'terminate' in development/lab/test environments, otherwise 'stop'
+    """
+    if ENVIRONMENT in ['development', 'lab', 'test']:
+        return 'terminate'
+    return 'stop'
+
 def shutdown_ec2_instance(instance: Dict[str, Any]) -> Dict[str, Any]:
     """
     Shutdown an EC2 instance.
@@ -213,130 +880,797 @@ def shutdown_ec2_instance(instance: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict containing shutdown result
     """
-    instance_id = instance['id']
-    instance_type = instance['instance_type']
-    tags = instance['tags']
+    region = instance.get('region', REGION)
+    action = instance.get('shutdown_action') or get_ec2_shutdown_action()
+    return shutdown_ec2_instances([instance], region, action)[0]
+
+def shutdown_ec2_instances(instances: List[Dict[str, Any]], region: str,
+                           action: str) -> List[Dict[str, Any]]:
+    """
+    Stop or terminate EC2 instances in one region using batched API calls.
+    
+    Args:
+        instances: Instance information dictionaries, all in the same region
+        region: AWS region of the instances
+        action: 'stop' or 'terminate'
+        
+    Returns:
+        List of shutdown results, one per instance
+    """
+    ec2_client = get_ec2_client(region)
+    results = []
+    
+    for start in range(0, len(instances), EC2_BATCH_SIZE):
+        batch = instances[start:start + EC2_BATCH_SIZE]
+        batch_results = shutdown_ec2_batch(ec2_client, batch, region, action)
+        
+        succeeded = sum(1 for r in batch_results if r['status'] == 'success')
+        verb = 'Terminated' if action == 'terminate' else 'Stopped'
+        logger.info(f"{verb} {succeeded}/{len(batch)} instances in {region}")
+        results.extend(batch_results)
+    
+    return results
+
+def shutdown_ec2_batch(ec2_client: Any, batch: List[Dict[str, Any]], region: str,
+                       action: str) -> List[Dict[str, Any]]:
+    """
+    Send one StopInstances/TerminateInstances request and map the outcome
+    back to each instance.
+    
+    EC2 rejects the whole request if any single instance ID is invalid, so a
+    batch failing with a per-instance error is split in half and retried
+    until the failing instances are isolated and reported individually.
+    Other errors fail the whole batch at once.
+    
+    Args:
+        ec2_client: EC2 client for the region
+        batch: Instance information dictionaries
+        region: AWS region of the instances
+        action: 'stop' or 'terminate'
+        
+    Returns:
+        List of shutdown results, one per instance
+    """
+    instance_ids = [instance['id'] for instance in batch]
     
     try:
-        # Determine shutdown action based on environment
-        if ENVIRONMENT in ['development', 'lab', 'test']:
-            # Terminate instances in development/lab environments
-            action = 'terminate'
-            ec2_client.terminate_instances(InstanceIds=[instance_id])
-            logger.info(f"Terminated instance: {instance_id}")
+        if action == 'terminate':
+            response = ec2_client.terminate_instances(InstanceIds=instance_ids)
+            changes = response.get('TerminatingInstances', [])
         else:
-            # Stop instances in other environments
-            action = 'stop'
-            ec2_client.stop_instances(InstanceIds=[instance_id])
-            logger.info(f"Stopped instance: {instance_id}")
+            response = ec2_client.stop_instances(InstanceIds=instance_ids)
+            changes = response.get('StoppingInstances', [])
         
-        return {
-            'resource_type': 'ec2-instance',
-            'resource_id': instance_id,
-            'instance_type': instance_type,
-            'action': action,
-            'status': 'success',
-            'student': tags.get('Student', 'unknown'),
-            'environment': tags.get('Environment', 'unknown'),
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        }
+    except Exception as e:
+        error_code = getattr(e, 'response', {}).get('Error', {}).get('Code', '')
+        if len(batch) == 1 or error_code not in EC2_INSTANCE_ERRORS:
+            logger.error(f"Error shutting down instances {', '.join(instance_ids)}: {str(e)}")
+            return [build_shutdown_result(instance, region, 'failed', 'error', error=str(e))
+                    for instance in batch]
+        
+        middle = len(batch) // 2
+        return (shutdown_ec2_batch(ec2_client, batch[:middle], region, action) +
+                shutdown_ec2_batch(ec2_client, batch[middle:], region, action))
+    
+    current_states = {change['InstanceId']: change['CurrentState']['Name'] for change in changes}
+    results = []
+    for instance in batch:
+        if instance['id'] in current_states:
+            results.append(build_shutdown_result(
+                instance, region, action, 'success', state=current_states[instance['id']]
+            ))
+        else:
+            results.append(build_shutdown_result(
+                instance, region, 'failed', 'error', error='Instance missing from API response'
+            ))
+    
+    return results
+
+def build_shutdown_result(resource: Dict[str, Any], region: str, action: str, status: str,
+                          state: Optional[str] = None,
+                          error: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the shutdown result dictionary for a resource.
+    
+    Args:
+        resource: Resource information dictionary
+        region: AWS region of the resource
+        action: Action taken (e.g. 'stop', 'terminate', 'delete' or 'failed')
+        status: 'success' or 'error'
+        state: Resource state reported by the API, if any
+        error: Error message, if any
+        
+    Returns:
+        Dict containing shutdown result
+    """
+    tags = resource['tags']
+    result = {
+        'resource_type': resource['type'],
+        'resource_id': resource['id'],
+        'region': region,
+        'instance_type': resource['instance_type'],
+        'action': action,
+        'status': status,
+        'student': tags.get('Student', 'unknown'),
+        'environment': tags.get('Environment', 'unknown'),
+        'timestamp': datetime.now(timezone.utc).isoformat()
+    }
+    if state:
+        result['state'] = state
+    if error:
+        result['error'] = error
+    return result
+
+def run_single_shutdown(resource: Dict[str, Any], action: str,
+                        call: Callable[[Any, Dict[str, Any]], Any]) -> Dict[str, Any]:
+    """
+    Run a single-resource shutdown API call and build its result.
+    
+    Args:
+        resource: Resource information dictionary
+        action: Action recorded in the result
+        call: Function taking (client, resource) that performs the API call
+        
+    Returns:
+        Dict containing shutdown result
+    """
+    region = resource.get('region', REGION)
+    client = get_client(RESOURCE_HANDLERS[resource['type']]['service'], region)
+    
+    try:
+        call(client, resource)
+        logger.info(f"Shutdown ({action}) {resource['type']}: {resource['id']}")
+        result = build_shutdown_result(resource, region, action, 'success')
+        if 'capacity' in resource:
+            result['previous_capacity'] = resource['capacity']
+        return result
         
     except Exception as e:
-        logger.error(f"Error shutting down instance {instance_id}: {str(e)}")
-        return {
-            'resource_type': 'ec2-instance',
-            'resource_id': instance_id,
-            'instance_type': instance_type,
-            'action': 'failed',
-            'status': 'error',
-            'error': str(e),
-            'student': tags.get('Student', 'unknown'),
-            'environment': tags.get('Environment', 'unknown'),
-            'timestamp': datetime.now(timezone.utc).isoformat()
-        }
+        logger.error(f"Error shutting down {resource['type']} {resource['id']}: {str(e)}")
+        return build_shutdown_result(resource, region, 'failed', 'error', error=str(e))
 
-def get_resource_uptime_hours(launch_time: datetime) -> float:
+def shutdown_rds_instance(db_instance: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Stop an RDS instance. Databases are never deleted, whatever the policy action.
+    
+    Args:
+        db_instance: DB instance information dictionary
+        
+    Returns:
+        Dict containing shutdown result
+    """
+    return run_single_shutdown(db_instance, 'stop', lambda client, resource: client.stop_db_instance(
+        DBInstanceIdentifier=resource['id']
+    ))
+
+def shutdown_autoscaling_group(group: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Scale an Auto Scaling group to zero instances.
+    
+    Args:
+        group: Auto Scaling group information dictionary
+        
+    Returns:
+        Dict containing shutdown result
+    """
+    return run_single_shutdown(group, 'scale-to-zero', lambda client, resource: client.update_auto_scaling_group(
+        AutoScalingGroupName=resource['id'],
+        MinSize=0,
+        DesiredCapacity=0
+    ))
+
+def shutdown_nat_gateway(nat_gateway: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Delete a NAT gateway. NAT gateways cannot be stopped.
+    
+    Args:
+        nat_gateway: NAT gateway information dictionary
+        
+    Returns:
+        Dict containing shutdown result
+    """
+    return run_single_shutdown(nat_gateway, 'delete', lambda client, resource: client.delete_nat_gateway(
+        NatGatewayId=resource['id']
+    ))
+
+def shutdown_eks_nodegroup(nodegroup: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Scale an EKS managed node group to zero nodes.
+    
+    Args:
+        nodegroup: Node group information dictionary
+        
+    Returns:
+        Dict containing shutdown result
+    """
+    def scale_to_zero(client: Any, resource: Dict[str, Any]) -> Any:
+        cluster_name, nodegroup_name = resource['id'].split('/', 1)
+        return client.update_nodegroup_config(
+            clusterName=cluster_name,
+            nodegroupName=nodegroup_name,
+            scalingConfig={'minSize': 0, 'desiredSize': 0, 'maxSize': max(resource.get('max_size', 1), 1)}
+        )
+    
+    return run_single_shutdown(nodegroup, 'scale-to-zero', scale_to_zero)
+
+# Collector, shutdown handler, default action and the actions the handler can
+# actually carry out, for each supported resource type
+RESOURCE_HANDLERS: Dict[str, Dict[str, Any]] = {
+    'ec2-instance': {
+        'service': 'ec2',
+        'collect': collect_ec2_instances,
+        'shutdown': shutdown_ec2_instance,
+        'default_action': get_ec2_shutdown_action(),
+        'actions': ['stop', 'terminate']
+    },
+    'rds-instance': {
+        'service': 'rds',
+        'collect': collect_rds_instances,
+        'shutdown': shutdown_rds_instance,
+        'default_action': 'stop',
+        'actions': ['stop']
+    },
+    'autoscaling-group': {
+        'service': 'autoscaling',
+        'collect': collect_autoscaling_groups,
+        'shutdown': shutdown_autoscaling_group,
+        'default_action': 'scale-to-zero',
+        'actions': ['scale-to-zero']
+    },
+    'nat-gateway': {
+        'service': 'ec2',
+        'collect': collect_nat_gateways,
+        'shutdown': shutdown_nat_gateway,
+        'default_action': 'delete',
+        'actions': ['delete']
+    },
+    'eks-nodegroup': {
+        'service': 'eks',
+        'collect': collect_eks_nodegroups,
+        'shutdown': shutdown_eks_nodegroup,
+        'default_action': 'scale-to-zero',
+        'actions': ['scale-to-zero']
+    }
+}
+
+@lru_cache(maxsize=None)
+def get_shutdown_policy() -> Dict[str, Any]:
+    """
+    Get the compiled shutdown policy, built once per Lambda container.
+    
+    Returns:
+        Compiled policy dictionary
+    """
+    return compile_shutdown_policy()
+
+def compile_shutdown_policy(max_uptime_hours: float = MAX_UPTIME_HOURS,
+                            grace_period_minutes: float = GRACE_PERIOD_MINUTES,
+                            business_hours: str = BUSINESS_HOURS,
+                            timezone_name: str = BUSINESS_HOURS_TIMEZONE,
+                            tag_overrides: str = SHUTDOWN_TAG_OVERRIDES) -> Dict[str, Any]:
+    """
+    Compile shutdown rules from environment settings.
+    
+    Business hours use the schedule syntax "Mon-Fri 08:00-18:00", with
+    several windows separated by ";". Tag overrides are a JSON object
+    mapping "Key=ValuePattern" (shell-style wildcards) to an action or to
+    a dict with any of "action", "max_uptime_hours" and "business_hours",
+    for example:
+    
+        {"Role=bastion": "skip", "Tier=db*": {"action": "stop", "max_uptime_hours": 12}}
+    
+    Args:
+        max_uptime_hours: Default maximum uptime before shutdown
+        grace_period_minutes: Minimum age before a resource can be shut down
+        business_hours: Default business-hours schedule (empty for none)
+        timezone_name: IANA timezone used to evaluate schedules
+        tag_overrides: JSON tag override rules
+        
+    Returns:
+        Compiled policy dictionary
+        
+    Raises:
+        ValueError: If a rule cannot be parsed
+    """
+    overrides = []
+    if tag_overrides:
+        try:
+            raw_overrides = json.loads(tag_overrides)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid SHUTDOWN_TAG_OVERRIDES JSON: {e}")
+        
+        for selector, settings in raw_overrides.items():
+            if isinstance(settings, str):
+                settings = {'action': settings}
+            key, _, value_pattern = selector.partition('=')
+            if settings.get('action') and settings['action'] not in POLICY_ACTIONS:
+                raise ValueError(f"Invalid action for override {selector}: {settings['action']}")
+            overrides.append({
+                'label': selector,
+                'key': key,
+                'pattern': re.compile(translate(value_pattern or '*')),
+                'action': settings.get('action'),
+                'max_uptime_hours': settings.get('max_uptime_hours'),
+                'business_hours': parse_schedule(settings['business_hours'])
+                if 'business_hours' in settings else None
+            })
+    
+    return {
+        'default_actions': {resource_type: handler['default_action']
+                            for resource_type, handler in RESOURCE_HANDLERS.items()},
+        'max_uptime_hours': max_uptime_hours,
+        'grace_period_hours': grace_period_minutes / 60,
+        'business_hours': parse_schedule(business_hours) if business_hours else None,
+        'timezone': get_schedule_timezone(timezone_name),
+        'overrides': overrides
+    }
+
+def get_schedule_timezone(timezone_name: str) -> tzinfo:
+    """
+    Resolve the timezone used for business-hours schedules.
+    
+    Args:
+        timezone_name: IANA timezone name
+        
+    Returns:
+        tzinfo for the name, or UTC if it cannot be resolved
+    """
+    if timezone_name.upper() == 'UTC':
+        return timezone.utc
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(timezone_name)
+    except Exception as e:
+        logger.warning(f"Unknown timezone {timezone_name}, using UTC: {str(e)}")
+        return timezone.utc
+
+@lru_cache(maxsize=256)
+def parse_schedule(schedule: str) -> Tuple[Tuple[frozenset, int, int], ...]:
+    """
+    Parse a business-hours schedule into (weekdays, start, end) windows.
+    
+    Schedules look like "Mon-Fri 08:00-18:00" or "Daily 22:00-06:00;Sat 10:00-14:00".
+    Times are minutes past midnight; an end before the start spans midnight.
+    Parsed schedules are cached since the same tag value repeats across
+    many resources.
+    
+    Args:
+        schedule: Schedule string
+        
+    Returns:
+        Tuple of compiled windows
+        
+    Raises:
+        ValueError: If the schedule cannot be parsed
+    """
+    windows = []
+    for window in schedule.split(';'):
+        window = window.strip()
+        if not window:
+            continue
+        try:
+            day_spec, time_spec = window.split()
+            start, end = [int(h) * 60 + int(m) for h, m in
+                          (part.split(':') for part in time_spec.split('-'))]
+        except ValueError:
+            raise ValueError(f"Invalid schedule window: {window}")
+        
+        days = set()
+        for day_range in day_spec.lower().split(','):
+            if day_range in ['daily', '*']:
+                days.update(range(7))
+                continue
+            first, _, last = day_range.partition('-')
+            if first[:3] not in WEEKDAYS or (last and last[:3] not in WEEKDAYS):
+                raise ValueError(f"Invalid schedule days: {day_spec}")
+            first_index = WEEKDAYS.index(first[:3])
+            last_index = WEEKDAYS.index(last[:3]) if last else first_index
+            days.update((first_index + offset) % 7
+                        for offset in range((last_index - first_index) % 7 + 1))
+        
+        windows.append((frozenset(days), start, end))
+    
+    return tuple(windows)
+
+def in_schedule(windows: Tuple[Tuple[frozenset, int, int], ...], local_time: datetime) -> bool:
+    """
+    Check whether a local time falls inside any schedule window.
+    
+    Args:
+        windows: Compiled schedule windows
+        local_time: Time in the schedule's timezone
+        
+    Returns:
+        True if the time is inside a window
+    """
+    weekday = local_time.weekday()
+    minute = local_time.hour * 60 + local_time.minute
+    
+    for days, start, end in windows:
+        if start <= end:
+            if weekday in days and start <= minute < end:
+                return True
+        elif (weekday in days and minute >= start) or ((weekday - 1) % 7 in days and minute < end):
+            return True
+    
+    return False
+
+def evaluate_shutdown_policy(resources: List[Dict[str, Any]],
+                             policy: Optional[Dict[str, Any]] = None,
+                             now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """
+    Decide what to do with each resource in a single pass.
+    
+    Args:
+        resources: Resource information dictionaries
+        policy: Compiled policy (defaults to get_shutdown_policy())
+        now: Evaluation time (defaults to the current time)
+        
+    Returns:
+        List of decisions in the same order as resources
+    """
+    policy = policy or get_shutdown_policy()
+    now = now or datetime.now(timezone.utc)
+    local_now = now.astimezone(policy['timezone'])
+    
+    return [evaluate_resource_policy(resource, policy, now, local_now) for resource in resources]
+
+def evaluate_resource_policy(resource: Dict[str, Any], policy: Dict[str, Any],
+                             now: datetime, local_now: datetime) -> Dict[str, Any]:
+    """
+    Apply the shutdown rules to one resource.
+    
+    Rules are checked in order: AutoShutdownGraceUntil tag, launch grace
+    period, "skip" actions, business hours, then maximum uptime. Settings
+    from resource tags take precedence over tag overrides, which take
+    precedence over the resource type's default action. Override and tag
+    actions the resource type cannot carry out (e.g. "terminate" for an
+    RDS instance) are ignored and listed under 'ignored_actions'.
+    
+    Args:
+        resource: Resource information dictionary
+        policy: Compiled policy
+        now: Evaluation time in UTC
+        local_now: Evaluation time in the schedule timezone
+        
+    Returns:
+        Decision dictionary with the action and the rule that produced it
+    """
+    tags = resource.get('tags', {})
+    decision = {
+        'resource_type': resource['type'],
+        'resource_id': resource['id'],
+        'region': resource.get('region', REGION)
+    }
+    
+    def decide(action: str, rule: str, reason: str) -> Dict[str, Any]:
+        decision.update({'action': action, 'rule': rule, 'reason': reason})
+        return decision
+    
+    allowed_actions = RESOURCE_HANDLERS.get(resource['type'], {}).get('actions', []) + ['skip']
+    
+    def supported(requested: str, source: str) -> bool:
+        if requested in allowed_actions:
+            return True
+        decision.setdefault('ignored_actions', []).append(f"{requested} ({source})")
+        return False
+    
+    # Effective settings: defaults, then the first matching override, then tags
+    action, action_source = policy['default_actions'].get(resource['type'], 'skip'), 'default'
+    max_uptime, uptime_source = policy['max_uptime_hours'], 'default'
+    schedule, schedule_source = policy['business_hours'], 'default'
+    
+    for override in policy['overrides']:
+        if override['key'] in tags and override['pattern'].match(tags[override['key']]):
+            label = f"override:{override['label']}"
+            if override['action'] and supported(override['action'], label):
+                action, action_source = override['action'], label
+            if override['max_uptime_hours'] is not None:
+                max_uptime, uptime_source = float(override['max_uptime_hours']), label
+            if override['business_hours'] is not None:
+                schedule, schedule_source = override['business_hours'], label
+            break
+    
+    try:
+        tag_action = tags.get(ACTION_TAG, '').lower()
+        if tag_action in POLICY_ACTIONS and supported(tag_action, f"tag:{ACTION_TAG}"):
+            action, action_source = tag_action, f"tag:{ACTION_TAG}"
+        if MAX_UPTIME_TAG in tags:
+            max_uptime, uptime_source = float(tags[MAX_UPTIME_TAG]), f"tag:{MAX_UPTIME_TAG}"
+        if SCHEDULE_TAG in tags:
+            schedule_value = tags[SCHEDULE_TAG].strip()
+            schedule = None if schedule_value.lower() in ['', 'none', 'off'] else parse_schedule(schedule_value)
+            schedule_source = f"tag:{SCHEDULE_TAG}"
+        
+        if GRACE_UNTIL_TAG in tags:
+            grace_until = datetime.fromisoformat(tags[GRACE_UNTIL_TAG].replace('Z', '+00:00'))
+            if grace_until.tzinfo is None:
+                grace_until = grace_until.replace(tzinfo=timezone.utc)
+            if now < grace_until:
+                return decide('skip', f"tag:{GRACE_UNTIL_TAG}", f"grace period until {grace_until.isoformat()}")
+    except ValueError as e:
+        return decide('skip', 'invalid-tag', f"unparseable policy tag: {str(e)}")
+    
+    uptime_hours = None
+    if resource.get('launch_time'):
+        uptime_hours = get_resource_uptime_hours(resource['launch_time'], now)
+        decision['uptime_hours'] = round(uptime_hours, 2)
+        if uptime_hours < policy['grace_period_hours']:
+            return decide('skip', 'grace-period', f"launched {uptime_hours:.2f}h ago")
+    
+    if action == 'skip':
+        return decide('skip', action_source, 'shutdown disabled')
+    
+    if schedule and not in_schedule(schedule, local_now):
+        return decide(action, f"business-hours:{schedule_source}", 'outside business hours')
+    
+    if uptime_hours is not None and uptime_hours >= max_uptime:
+        return decide(action, f"max-uptime:{uptime_source}",
+                      f"uptime {uptime_hours:.2f}h >= {max_uptime:g}h")
+    
+    if uptime_hours is None:
+        return decide('skip', 'no-launch-time', 'uptime unknown')
+    
+    return decide('skip', 'within-limits', f"uptime {uptime_hours:.2f}h < {max_uptime:g}h")
+
+def get_resource_uptime_hours(launch_time: datetime, now: Optional[datetime] = None) -> float:
     """
     Calculate resource uptime in hours.
     
     Args:
         launch_time: Resource launch timestamp
+        now: Reference time (defaults to the current time)
         
     Returns:
         Uptime in hours
     """
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
     if launch_time.tzinfo is None:
         launch_time = launch_time.replace(tzinfo=timezone.utc)
     
     uptime_delta = now - launch_time
     return uptime_delta.total_seconds() / 3600
 
-def should_shutdown_resource(resource: Dict[str, Any], max_uptime_hours: int = 4) -> bool:
+def should_shutdown_resource(resource: Dict[str, Any], max_uptime_hours: Optional[float] = None) -> bool:
     """
-    Determine if a resource should be shut down based on uptime.
+    Determine if a resource should be shut down under the shutdown policy.
     
     Args:
         resource: Resource information
-        max_uptime_hours: Maximum allowed uptime in hours
+        max_uptime_hours: Maximum allowed uptime in hours (defaults to the policy)
         
     Returns:
         True if resource should be shut down
     """
     try:
-        if 'launch_time' in resource:
-            launch_time = resource['launch_time']
-            uptime_hours = get_resource_uptime_hours(launch_time)
-            
-            logger.info(f"Resource {resource['id']} uptime: {uptime_hours:.2f} hours")
-            
-            return uptime_hours >= max_uptime_hours
+        policy = get_shutdown_policy()
+        if max_uptime_hours is not None:
+            policy = dict(policy, max_uptime_hours=max_uptime_hours)
         
-        return False
+        decision = evaluate_shutdown_policy([resource], policy)[0]
+        logger.info(f"Resource {resource['id']}: {decision['action']} ({decision['reason']})")
+        
+        return decision['action'] != 'skip'
         
     except Exception as e:
         logger.error(f"Error checking resource uptime: {str(e)}")
         return False
 
-def get_cost_savings_estimate(resources_count: int) -> Dict[str, float]:
+@lru_cache(maxsize=None)
+def load_price_index() -> Dict[Tuple[str, str, str], float]:
+    """
+    Load the bundled price table into a flat (service, region, type) index.
+    
+    Loaded once per Lambda container; warm invocations only do dict lookups.
+    
+    Returns:
+        Mapping of (service, region, instance type) to hourly USD rate.
+        NAT gateways use the type 'nat-gateway'; region '*' holds the
+        default region's rates for regions missing from the table.
+    """
+    # A missing, unreadable or malformed table falls back to the default
+    # pricing; savings are reported after shutdowns and must not fail them
+    try:
+        with open(PRICE_TABLE_PATH) as price_file:
+            table = json.load(price_file)
+        
+        generated_at = datetime.fromisoformat(table['generated_at']).replace(tzinfo=timezone.utc)
+        
+        index = {}
+        for service, regions in table['prices'].items():
+            for region, rates in regions.items():
+                if isinstance(rates, dict):
+                    for instance_type, rate in rates.items():
+                        index[(service, region, instance_type)] = float(rate)
+                else:
+                    index[(service, region, service)] = float(rates)
+        
+        default_region = table.get('default_region', 'us-east-1')
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.error(f"Error loading price table {PRICE_TABLE_PATH}: {type(e).__name__}: {str(e)}")
+        return {}
+    
+    age_days = (datetime.now(timezone.utc) - generated_at).days
+    if age_days > PRICE_TABLE_MAX_AGE_DAYS:
+        logger.warning(f"Price table is {age_days} days old; run refresh_price_table.py")
+    
+    # Regions missing from the table are priced at the default region's rates
+    for (service, region, instance_type), rate in list(index.items()):
+        if region == default_region:
+            index.setdefault((service, '*', instance_type), rate)
+    
+    return index
+
+def get_hourly_rate(resource_type: str, region: str, instance_type: str) -> Optional[float]:
+    """
+    Look up the on-demand hourly rate for one unit of a resource.
+    
+    Args:
+        resource_type: Resource type (e.g. 'ec2-instance')
+        region: AWS region
+        instance_type: Instance or DB instance class
+        
+    Returns:
+        Hourly USD rate, or None if the type is not in the price table
+    """
+    service = PRICING_SERVICES.get(resource_type)
+    if service is None:
+        return None
+    if service == 'nat-gateway':
+        instance_type = service
+    
+    index = load_price_index()
+    rate = index.get((service, region, instance_type))
+    return rate if rate is not None else index.get((service, '*', instance_type))
+
+def get_cost_savings_estimate(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Calculate estimated cost savings from shutdown.
     
+    Each successful result is priced from its own instance type and region
+    (times its previous capacity for scaled-down groups), and savings are
+    aggregated per instance type, region and student in the same pass.
+    
     Args:
-        resources_count: Number of resources being shut down
+        results: Shutdown results
         
     Returns:
-        Dict with cost savings estimates
+        Dict with total cost savings estimates and per-dimension hourly savings
     """
-    # Estimated costs (approximate)
-    hourly_rate = 0.0116  # t3.micro pricing
+    hourly_savings = 0.0
+    by_instance_type: Dict[str, float] = {}
+    by_region: Dict[str, float] = {}
+    by_student: Dict[str, float] = {}
+    unpriced = 0
+    
+    for result in results:
+        if result['status'] != 'success':
+            continue
+        
+        region = result.get('region', REGION)
+        instance_type = result.get('instance_type', 'unknown')
+        rate = get_hourly_rate(result['resource_type'], region, instance_type)
+        if rate is None:
+            unpriced += 1
+            continue
+        
+        hourly = rate * result.get('previous_capacity', 1)
+        hourly_savings += hourly
+        by_instance_type[instance_type] = by_instance_type.get(instance_type, 0.0) + hourly
+        by_region[region] = by_region.get(region, 0.0) + hourly
+        student = result.get('student', 'unknown')
+        by_student[student] = by_student.get(student, 0.0) + hourly
+    
+    if unpriced:
+        logger.warning(f"{unpriced} shut-down resources have no price table entry")
     
     return {
-        'hourly_savings': resources_count * hourly_rate,
-        'daily_savings': resources_count * hourly_rate * 24,
-        'monthly_savings': resources_count * hourly_rate * 24 * 30
+        'hourly_savings': round(hourly_savings, 4),
+        'daily_savings': round(hourly_savings * 24, 2),
+        'monthly_savings': round(hourly_savings * 24 * 30, 2),
+        'hourly_by_instance_type': {k: round(v, 4) for k, v in by_instance_type.items()},
+        'hourly_by_region': {k: round(v, 4) for k, v in by_region.items()},
+        'hourly_by_student': {k: round(v, 4) for k, v in by_student.items()},
+        'unpriced_resources': unpriced
     }
 
-def log_shutdown_metrics(results: List[Dict[str, Any]]) -> None:
+def log_shutdown_metrics(results: List[Dict[str, Any]],
+                         api_calls: Optional[List[Tuple[str, str, float, bool]]] = None,
+                         savings: Optional[Dict[str, Any]] = None) -> None:
     """
     Log metrics for monitoring and analysis.
     
+    Counters are computed in a single pass and printed as CloudWatch
+    Embedded Metric Format documents, which CloudWatch Logs turns into
+    metrics without PutMetricData calls.
+    
     Args:
         results: Shutdown results
+        api_calls: API call records (defaults to this invocation's calls)
+        savings: Cost savings estimate (computed from results if omitted)
     """
     try:
-        successful_count = len([r for r in results if r['status'] == 'success'])
-        failed_count = len([r for r in results if r['status'] == 'error'])
+        api_calls = list(_api_calls) if api_calls is None else api_calls
+        
+        successful_count = 0
+        failed_count = 0
+        region_counts: Dict[str, List[int]] = {}
+        for result in results:
+            counts = region_counts.setdefault(result.get('region', REGION), [0, 0])
+            if result['status'] == 'success':
+                successful_count += 1
+                counts[0] += 1
+            elif result['status'] == 'error':
+                failed_count += 1
+                counts[1] += 1
         
-        logger.info(f"METRICS: successful_shutdowns={successful_count}")
-        logger.info(f"METRICS: failed_shutdowns={failed_count}")
-        logger.info(f"METRICS: total_processed={len(results)}")
-        logger.info(f"METRICS: student={STUDENT_NAME}")
-        logger.info(f"METRICS: environment={ENVIRONMENT}")
+        latencies: Dict[Tuple[str, str], List[float]] = {}
+        api_errors: Dict[Tuple[str, str], int] = {}
+        for operation, region, latency_ms, is_error in api_calls:
+            latencies.setdefault((operation, region), []).append(round(latency_ms, 2))
+            api_errors[(operation, region)] = api_errors.get((operation, region), 0) + is_error
+        
+        savings = savings or get_cost_savings_estimate(results)
+        dimensions = {'Student': STUDENT_NAME, 'Environment': ENVIRONMENT}
+        
+        emit_metrics(dimensions, {
+            'SuccessfulShutdowns': (successful_count, 'Count'),
+            'FailedShutdowns': (failed_count, 'Count'),
+            'ResourcesProcessed': (len(results), 'Count'),
+            'EstimatedHourlySavings': (round(savings['hourly_savings'], 4), 'None'),
+            'EstimatedMonthlySavings': (round(savings['monthly_savings'], 2), 'None')
+        })
+        
+        for region, (succeeded, failed) in region_counts.items():
+            emit_metrics(dict(dimensions, Region=region), {
+                'SuccessfulShutdowns': (succeeded, 'Count'),
+                'FailedShutdowns': (failed, 'Count'),
+                'EstimatedHourlySavings': (round(savings['hourly_by_region'].get(region, 0.0), 4), 'None')
+            })
+        
+        for (operation, region), values in latencies.items():
+            # The error count goes out with the first chunk only
+            errors = api_errors[(operation, region)]
+            for start in range(0, len(values), EMF_MAX_VALUES):
+                chunk = values[start:start + EMF_MAX_VALUES]
+                emit_metrics(dict(dimensions, Operation=operation, Region=region), {
+                    'ApiLatency': (chunk, 'Milliseconds'),
+                    'ApiCalls': (len(chunk), 'Count'),
+                    'ApiErrors': (errors if start == 0 else 0, 'Count')
+                })
+        
+        logger.info(f"Metrics: {successful_count} successful, {failed_count} failed, "
+                    f"{len(api_calls)} API calls")
         
     except Exception as e:
         logger.error(f"Error logging metrics: {str(e)}")
 
+def emit_metrics(dimensions: Dict[str, str], metrics: Dict[str, Tuple[Any, str]]) -> None:
+    """
+    Print one Embedded Metric Format document.
+    
+    EMF documents must be the whole log line, so they are printed rather
+    than sent through the logger, which adds a prefix in Lambda.
+    
+    Args:
+        dimensions: Dimension names and values
+        metrics: Metric name to (value or list of values, unit)
+    """
+    document = {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [list(dimensions)],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, (_, unit) in metrics.items()]
+            }]
+        }
+    }
+    document.update(dimensions)
+    document.update({name: value for name, (value, _) in metrics.items()})
+    
+    print(json.dumps(document))
+
 # Test function for local development
 if __name__ == "__main__":
     # Test event
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+AWS Terraform Training - Terraform CLI & AWS Provider Configuration
+Lab 2.1: Cold-Start Benchmark for the Auto-Shutdown Lambda
+
+Measures module import time and first-invocation time of auto_shutdown.py
+in fresh interpreters, against a local EC2 stand-in. Each dependency layout
+(for example boto3 from the runtime vs. boto3 bundled into the deployment
+package) is measured separately so they can be compared.
+
+Usage:
+    ./benchmark_cold_start.py --runs 10
+    ./benchmark_cold_start.py --bundle-dir build/bundled --import-profile
+    ./benchmark_cold_start.py --layout bundled=build/bundled --layout unbundled=
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ec2_standin import ec2_standin, seed_instances, standin_environment
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# Runs in a fresh interpreter so every measurement is a cold start
+DRIVER = """
+import json, time
+start = time.perf_counter()
+import auto_shutdown
+imported = time.perf_counter()
+context = type('Context', (), {
+    'function_name': 'cold-start-benchmark',
+    'aws_request_id': 'cold-start-benchmark',
+    'get_remaining_time_in_millis': lambda self: 60000
+})()
+response = auto_shutdown.lambda_handler({}, context)
+invoked = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'invoke_ms': (invoked - imported) * 1000,
+    'status': response['statusCode']
+}))
+"""
+
+def build_bundle(bundle_dir: Path) -> None:
+    """
+    Install the Lambda's dependencies into a directory, as a bundled package would.
+
+    Args:
+        bundle_dir: Target directory
+    """
+    print(f"📦 Bundling boto3 into {bundle_dir}")
+    subprocess.run(
+        [sys.executable, '-m', 'pip', 'install', '--quiet', '--upgrade', '--target', str(bundle_dir), 'boto3'],
+        check=True
+    )
+
+def layout_environment(layout_path: str, extra_env: Dict[str, str]) -> Dict[str, str]:
+    """
+    Build the child process environment for a dependency layout.
+
+    Args:
+        layout_path: Directory searched before site-packages (empty for none)
+        extra_env: Additional environment variables
+
+    Returns:
+        Environment dictionary
+    """
+    python_path = [str(SCRIPTS_DIR)]
+    if layout_path:
+        python_path.insert(0, str(Path(layout_path).resolve()))
+
+    env = dict(os.environ, **extra_env)
+    env['PYTHONPATH'] = os.pathsep.join(python_path)
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env
+
+def run_cold_start(env: Dict[str, str]) -> Dict[str, float]:
+    """
+    Import and invoke the Lambda once in a fresh interpreter.
+
+    Args:
+        env: Child process environment
+
+    Returns:
+        Dict with import_ms, invoke_ms and status
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', DRIVER],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def profile_imports(env: Dict[str, str], top: int = 15) -> List[Dict[str, object]]:
+    """
+    Profile module imports with -X importtime.
+
+    Args:
+        env: Child process environment
+        top: Number of modules to return
+
+    Returns:
+        Modules with the largest cumulative import time
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import auto_shutdown'],
+        env=env, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # Lines look like "import time:   self [us] | cumulative | module"
+        self_us, cumulative_us, name = [field.strip() for field in line[len('import time:'):].split('|')]
+        modules.append({'module': name, 'self_ms': int(self_us) / 1000, 'cumulative_ms': int(cumulative_us) / 1000})
+
+    return sorted(modules, key=lambda m: m['cumulative_ms'], reverse=True)[:top]
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Summarize cold-start samples.
+
+    Args:
+        samples: Per-run measurements
+
+    Returns:
+        Median and max of import, invoke and total time
+    """
+    totals = [s['import_ms'] + s['invoke_ms'] for s in samples]
+    return {
+        'import_ms_median': statistics.median(s['import_ms'] for s in samples),
+        'invoke_ms_median': statistics.median(s['invoke_ms'] for s in samples),
+        'total_ms_median': statistics.median(totals),
+        'total_ms_max': max(totals)
+    }
+
+def parse_layouts(values: Optional[List[str]], bundle_dir: Optional[str]) -> Dict[str, str]:
+    """
+    Parse --layout NAME=PATH options.
+
+    Args:
+        values: Raw option values
+        bundle_dir: Bundle directory to add as the 'bundled' layout
+
+    Returns:
+        Mapping of layout name to path
+    """
+    layouts = {'unbundled': ''} if not values else {}
+    for value in values or []:
+        name, _, path = value.partition('=')
+        layouts[name] = path
+    if bundle_dir:
+        layouts['bundled'] = bundle_dir
+    return layouts
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Cold-start benchmark for the auto-shutdown Lambda')
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per layout')
+    parser.add_argument('--instances', type=int, default=20, help='Instances seeded before each run')
+    parser.add_argument('--regions', default='us-east-1', help='Comma-separated regions to seed and scan')
+    parser.add_argument('--layout', action='append', metavar='NAME=PATH',
+                        help='Dependency layout to measure (PATH is prepended to PYTHONPATH)')
+    parser.add_argument('--bundle-dir', help='Build a bundled layout here with pip and measure it')
+    parser.add_argument('--import-profile', action='store_true', help='Print the slowest imports per layout')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+    regions = [r.strip() for r in args.regions.split(',') if r.strip()]
+
+    if args.bundle_dir and not Path(args.bundle_dir).exists():
+        build_bundle(Path(args.bundle_dir))
+    layouts = parse_layouts(args.layout, args.bundle_dir)
+
+    lambda_env = {
+        'STUDENT_NAME': 'cold-start-benchmark',
+        'ENVIRONMENT': 'development',
+        'SHUTDOWN_REGIONS': ','.join(regions),
+        'SHUTDOWN_RESOURCE_TYPES': 'ec2-instance',
+        'MAX_UPTIME_HOURS': '0'
+    }
+
+    results = {}
+    with ec2_standin() as endpoint:
+        lambda_env.update(standin_environment(endpoint))
+
+        for name, path in layouts.items():
+            env = layout_environment(path, lambda_env)
+            samples = []
+            for _ in range(args.runs):
+                seed_instances(endpoint, regions, args.instances, lambda_env['STUDENT_NAME'], 'development')
+                samples.append(run_cold_start(env))
+
+            results[name] = summarize(samples)
+            if args.import_profile:
+                results[name]['slowest_imports'] = profile_imports(env)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 70)
+    print(f"Cold-start benchmark ({args.runs} runs, {args.instances} instances per run)")
+    print("=" * 70)
+    print(f"{'Layout':<16}{'Import (ms)':>14}{'Invoke (ms)':>14}{'Total (ms)':>14}{'Max (ms)':>12}")
+    for name, summary in results.items():
+        print(f"{name:<16}{summary['import_ms_median']:>14.1f}{summary['invoke_ms_median']:>14.1f}"
+              f"{summary['total_ms_median']:>14.1f}{summary['total_ms_max']:>12.1f}")
+
+        for module in summary.get('slowest_imports', []):
+            print(f"    {module['cumulative_ms']:>9.1f} ms  {module['module']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+AWS Terraform Training - Terraform CLI & AWS Provider Configuration
+Lab 2.1: Fleet Load Test for the Auto-Shutdown Lambda
+
+Runs the auto-shutdown Lambda end to end against a local EC2 stand-in seeded
+with fleets of tagged instances, and records API call counts, wall time and
+peak memory per scenario. Compare against a saved baseline to catch
+discovery and batching regressions before deploying.
+
+Usage:
+    ./benchmark_fleet.py
+    ./benchmark_fleet.py --scenarios 10,1000 --regions us-east-1,eu-west-1
+    ./benchmark_fleet.py --json > baseline.json
+    ./benchmark_fleet.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from ec2_standin import ec2_standin, seed_instances, standin_environment
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_SCENARIOS = [10, 1000, 10000]
+DEFAULT_REGIONS = ['us-east-1', 'us-west-2', 'eu-west-1']
+
+# Allowed growth over the baseline before a scenario is flagged
+DEFAULT_TOLERANCE = 0.2
+
+# Runs in a fresh interpreter so module-level settings pick up the scenario
+DRIVER = """
+import json, time, tracemalloc
+from collections import Counter
+tracemalloc.start()
+import auto_shutdown
+context = type('Context', (), {
+    'function_name': 'fleet-benchmark',
+    'aws_request_id': 'fleet-benchmark',
+    'get_remaining_time_in_millis': lambda self: 900000
+})()
+start = time.perf_counter()
+response = auto_shutdown.lambda_handler({}, context)
+wall_ms = (time.perf_counter() - start) * 1000
+_, peak = tracemalloc.get_traced_memory()
+body = json.loads(response['body'])
+calls = Counter(call[0] for call in auto_shutdown._api_calls)
+print(json.dumps({
+    'status': response['statusCode'],
+    'resources_processed': body.get('resources_processed', 0),
+    'wall_ms': wall_ms,
+    'peak_memory_mb': peak / (1024 * 1024),
+    'api_calls': sum(calls.values()),
+    'api_errors': sum(1 for call in auto_shutdown._api_calls if call[3]),
+    'api_calls_by_operation': dict(sorted(calls.items()))
+}))
+"""
+
+def run_scenario(env: Dict[str, str]) -> Dict[str, object]:
+    """
+    Invoke the Lambda once in a fresh interpreter.
+
+    Args:
+        env: Child process environment
+
+    Returns:
+        Measurements printed by the driver
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', DRIVER],
+        env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def scenario_environment(endpoint: str, regions: List[str]) -> Dict[str, str]:
+    """
+    Build the child process environment for a scenario.
+
+    Args:
+        endpoint: Endpoint URL of the stand-in
+        regions: Regions the Lambda scans
+
+    Returns:
+        Environment dictionary
+    """
+    env = dict(os.environ, **standin_environment(endpoint))
+    env.update({
+        'STUDENT_NAME': 'fleet-benchmark',
+        'ENVIRONMENT': 'development',
+        'SHUTDOWN_REGIONS': ','.join(regions),
+        'SHUTDOWN_RESOURCE_TYPES': 'ec2-instance',
+        'MAX_UPTIME_HOURS': '0',
+        'PYTHONPATH': str(SCRIPTS_DIR),
+        'PYTHONDONTWRITEBYTECODE': '1'
+    })
+    return env
+
+def find_regressions(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline run.
+
+    API call counts are deterministic, so any increase is reported; wall time
+    and peak memory are reported when they grow by more than the tolerance.
+
+    Args:
+        results: Measurements per scenario
+        baseline: Measurements per scenario from a previous --json run
+        tolerance: Allowed relative growth for wall time and memory
+
+    Returns:
+        Human-readable regression messages
+    """
+    regressions = []
+    for scenario, current in results.items():
+        previous = baseline.get(scenario)
+        if not previous:
+            continue
+
+        if current['api_calls'] > previous['api_calls']:
+            regressions.append(f"{scenario}: api_calls {previous['api_calls']} -> {current['api_calls']}")
+        for metric in ['wall_ms', 'peak_memory_mb']:
+            if current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{scenario}: {metric} {previous[metric]:.1f} -> {current[metric]:.1f}")
+
+    return regressions
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Fleet load test for the auto-shutdown Lambda')
+    parser.add_argument('--scenarios', default=','.join(str(s) for s in DEFAULT_SCENARIOS),
+                        help='Comma-separated fleet sizes')
+    parser.add_argument('--regions', default=','.join(DEFAULT_REGIONS), help='Comma-separated regions to seed and scan')
+    parser.add_argument('--baseline', help='JSON results from a previous run to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed relative growth in wall time and memory')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+    regions = [r.strip() for r in args.regions.split(',') if r.strip()]
+    scenarios = [int(s) for s in args.scenarios.split(',') if s.strip()]
+
+    results = {}
+    for size in scenarios:
+        # A fresh stand-in per scenario keeps earlier fleets out of the scan
+        with ec2_standin() as endpoint:
+            if not args.json:
+                print(f"🚀 Seeding {size} instances across {len(regions)} regions")
+            seed_instances(endpoint, regions, size, 'fleet-benchmark', 'development')
+            results[str(size)] = run_scenario(scenario_environment(endpoint, regions))
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = find_regressions(results, json.load(baseline_file), args.tolerance)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("=" * 70)
+        print(f"Fleet load test ({len(regions)} regions)")
+        print("=" * 70)
+        print(f"{'Instances':>10}{'Processed':>12}{'API calls':>12}{'Errors':>9}{'Wall (ms)':>13}{'Peak (MB)':>12}")
+        for size, result in results.items():
+            print(f"{size:>10}{result['resources_processed']:>12}{result['api_calls']:>12}{result['api_errors']:>9}"
+                  f"{result['wall_ms']:>13.1f}{result['peak_memory_mb']:>12.1f}")
+            for operation, count in result['api_calls_by_operation'].items():
+                print(f"{'':>10}  {count:>6}  {operation}")
+
+    if regressions:
+        print("❌ Regressions against baseline:", file=sys.stderr)
+        for regression in regressions:
+            print(f"   {regression}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+AWS Terraform Training - Terraform CLI & AWS Provider Configuration
+Lab 2.1: Local EC2 Stand-in for the Auto-Shutdown Lambda
+
+Starts a local moto server and seeds it with tagged EC2 instances so the
+auto-shutdown Lambda can be run end to end without touching a real
+AWS account. Used by the benchmark scripts in this directory.
+
+Requires: pip install -r requirements-benchmark.txt
+"""
+
+import contextlib
+import socket
+from typing import Dict, Iterator, List
+
+# Credentials accepted by moto; never valid against real AWS
+STANDIN_CREDENTIALS = {
+    'AWS_ACCESS_KEY_ID': 'testing',
+    'AWS_SECRET_ACCESS_KEY': 'testing',
+    'AWS_SESSION_TOKEN': 'testing',
+    'AWS_DEFAULT_REGION': 'us-east-1'
+}
+
+# Instances launched per RunInstances call while seeding
+SEED_BATCH_SIZE = 500
+
+# Image used when the stand-in does not list any Amazon-owned AMIs
+DEFAULT_IMAGE_ID = 'ami-12c6146b'
+
+def find_free_port() -> int:
+    """
+    Find a free local TCP port.
+
+    Returns:
+        Port number
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+@contextlib.contextmanager
+def ec2_standin(port: int = 0) -> Iterator[str]:
+    """
+    Run a local moto server for the duration of the context.
+
+    Args:
+        port: Port to listen on (a free port is picked when 0)
+
+    Yields:
+        Endpoint URL of the stand-in
+    """
+    try:
+        from moto.server import ThreadedMotoServer
+    except ImportError:
+        raise SystemExit("❌ moto is required: pip install -r requirements-benchmark.txt")
+
+    port = port or find_free_port()
+    server = ThreadedMotoServer(ip_address='127.0.0.1', port=port, verbose=False)
+    server.start()
+
+    try:
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        server.stop()
+
+def standin_environment(endpoint: str) -> Dict[str, str]:
+    """
+    Get environment variables that point boto3 at the stand-in.
+
+    Args:
+        endpoint: Endpoint URL of the stand-in
+
+    Returns:
+        Environment variables to add to the Lambda process
+    """
+    return dict(STANDIN_CREDENTIALS, AWS_ENDPOINT_URL=endpoint)
+
+def get_client(endpoint: str, service: str, region: str):
+    """
+    Create a boto3 client bound to the stand-in.
+
+    Args:
+        endpoint: Endpoint URL of the stand-in
+        service: AWS service name
+        region: AWS region name
+
+    Returns:
+        boto3 client
+    """
+    import boto3
+
+    return boto3.client(
+        service,
+        region_name=region,
+        endpoint_url=endpoint,
+        aws_access_key_id=STANDIN_CREDENTIALS['AWS_ACCESS_KEY_ID'],
+        aws_secret_access_key=STANDIN_CREDENTIALS['AWS_SECRET_ACCESS_KEY']
+    )
+
+def seed_instances(endpoint: str, regions: List[str], count: int, student: str,
+                   environment: str, instance_type: str = 't3.micro') -> List[str]:
+    """
+    Launch auto-shutdown tagged instances spread evenly across regions.
+
+    Args:
+        endpoint: Endpoint URL of the stand-in
+        regions: Regions to seed
+        count: Total number of instances
+        student: Value of the Student tag
+        environment: Value of the Environment tag
+        instance_type: EC2 instance type to launch
+
+    Returns:
+        List of launched instance IDs
+    """
+    instance_ids = []
+    tags = [
+        {'Key': 'Student', 'Value': student},
+        {'Key': 'Environment', 'Value': environment},
+        {'Key': 'AutoShutdown', 'Value': 'true'}
+    ]
+
+    for index, region in enumerate(regions):
+        client = get_client(endpoint, 'ec2', region)
+        images = client.describe_images(Owners=['amazon']).get('Images', [])
+        image_id = images[0]['ImageId'] if images else DEFAULT_IMAGE_ID
+
+        # Give the first regions the remainder so the total matches count
+        remaining = count // len(regions) + (1 if index < count % len(regions) else 0)
+        while remaining:
+            batch = min(remaining, SEED_BATCH_SIZE)
+            response = client.run_instances(
+                ImageId=image_id,
+                InstanceType=instance_type,
+                MinCount=batch,
+                MaxCount=batch,
+                TagSpecifications=[{'ResourceType': 'instance', 'Tags': tags}]
+            )
+            instance_ids.extend(instance['InstanceId'] for instance in response['Instances'])
+            remaining -= batch
+
+    return instance_ids
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+AWS Terraform Training - Terraform CLI & AWS Provider Configuration
+Lab 2.1: Price Table Refresh for the Auto-Shutdown Lambda
+
+Rebuilds price_table.json from the AWS Price List API. The table is bundled
+with the Lambda and used by get_cost_savings_estimate, so re-run this
+monthly (or from a scheduled CI job) and re-apply Terraform to ship it.
+
+Usage:
+    ./refresh_price_table.py
+    ./refresh_price_table.py --regions us-east-1,eu-west-1 --families t3,t4g,m6i
+"""
+
+import argparse
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+import boto3
+
+DEFAULT_REGIONS = ['us-east-1', 'us-west-2', 'us-west-1', 'eu-west-1', 'ap-southeast-1']
+DEFAULT_FAMILIES = ['t2', 't3', 't3a', 't4g', 'm5', 'm6i', 'c5', 'r5']
+OUTPUT_PATH = Path(__file__).resolve().parent / 'price_table.json'
+
+# The Price List API is only served from a few regions
+PRICING_API_REGION = 'us-east-1'
+
+def term_filters(**attributes: str) -> List[Dict[str, str]]:
+    """
+    Build TERM_MATCH filters for get_products.
+
+    Args:
+        attributes: Product attribute names and values
+
+    Returns:
+        List of filters
+    """
+    return [{'Type': 'TERM_MATCH', 'Field': field, 'Value': value} for field, value in attributes.items()]
+
+def iter_products(client, service_code: str, filters: List[Dict[str, str]]) -> Iterator[Dict]:
+    """
+    Page through price list products.
+
+    Args:
+        client: Pricing client
+        service_code: Price list service code (e.g. 'AmazonEC2')
+        filters: get_products filters
+
+    Yields:
+        Parsed product documents
+    """
+    paginator = client.get_paginator('get_products')
+    for page in paginator.paginate(ServiceCode=service_code, Filters=filters):
+        for price_item in page['PriceList']:
+            yield json.loads(price_item)
+
+def on_demand_hourly_rate(product: Dict) -> float:
+    """
+    Extract the on-demand USD hourly rate from a product document.
+
+    Args:
+        product: Parsed product document
+
+    Returns:
+        Hourly rate in USD
+    """
+    for term in product['terms']['OnDemand'].values():
+        for dimension in term['priceDimensions'].values():
+            return float(dimension['pricePerUnit']['USD'])
+    return 0.0
+
+def fetch_ec2_rates(client, region: str, families: List[str]) -> Dict[str, float]:
+    """
+    Fetch on-demand Linux rates for EC2 instance families in a region.
+
+    Args:
+        client: Pricing client
+        region: AWS region code
+        families: Instance families to keep
+
+    Returns:
+        Mapping of instance type to hourly rate
+    """
+    filters = term_filters(
+        regionCode=region,
+        operatingSystem='Linux',
+        tenancy='Shared',
+        preInstalledSw='NA',
+        capacitystatus='Used',
+        licenseModel='No License required'
+    )
+
+    rates = {}
+    for product in iter_products(client, 'AmazonEC2', filters):
+        instance_type = product['product']['attributes'].get('instanceType', '')
+        if instance_type.split('.')[0] in families:
+            rate = on_demand_hourly_rate(product)
+            if rate:
+                rates[instance_type] = rate
+    return dict(sorted(rates.items()))
+
+def fetch_rds_rates(client, region: str, families: List[str]) -> Dict[str, float]:
+    """
+    Fetch on-demand MySQL Single-AZ rates for RDS instance classes in a region.
+
+    Args:
+        client: Pricing client
+        region: AWS region code
+        families: Instance families to keep (without the 'db.' prefix)
+
+    Returns:
+        Mapping of DB instance class to hourly rate
+    """
+    filters = term_filters(regionCode=region, databaseEngine='MySQL', deploymentOption='Single-AZ')
+
+    rates = {}
+    for product in iter_products(client, 'AmazonRDS', filters):
+        instance_class = product['product']['attributes'].get('instanceType', '')
+        if instance_class.startswith('db.') and instance_class.split('.')[1] in families:
+            rate = on_demand_hourly_rate(product)
+            if rate:
+                rates[instance_class] = rate
+    return dict(sorted(rates.items()))
+
+def fetch_nat_gateway_rate(client, region: str) -> float:
+    """
+    Fetch the hourly NAT gateway rate for a region.
+
+    Args:
+        client: Pricing client
+        region: AWS region code
+
+    Returns:
+        Hourly rate in USD
+    """
+    filters = term_filters(regionCode=region, productFamily='NAT Gateway')
+
+    for product in iter_products(client, 'AmazonEC2', filters):
+        if product['product']['attributes'].get('usagetype', '').endswith('NatGateway-Hours'):
+            return on_demand_hourly_rate(product)
+    return 0.0
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Refresh the auto-shutdown price table')
+    parser.add_argument('--regions', default=','.join(DEFAULT_REGIONS), help='Comma-separated regions')
+    parser.add_argument('--families', default=','.join(DEFAULT_FAMILIES), help='Comma-separated instance families')
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help='Output file')
+
+    args = parser.parse_args()
+    regions = [r.strip() for r in args.regions.split(',') if r.strip()]
+    families = [f.strip() for f in args.families.split(',') if f.strip()]
+
+    client = boto3.client('pricing', region_name=PRICING_API_REGION)
+    prices = {'ec2': {}, 'rds': {}, 'nat-gateway': {}}
+
+    for region in regions:
+        print(f"💲 Fetching prices for {region}")
+        prices['ec2'][region] = fetch_ec2_rates(client, region, families)
+        prices['rds'][region] = fetch_rds_rates(client, region, families)
+        prices['nat-gateway'][region] = fetch_nat_gateway_rate(client, region)
+
+    table = {
+        'generated_at': datetime.now(timezone.utc).date().isoformat(),
+        'source': 'AWS Price List API, on-demand Linux / MySQL Single-AZ, USD per hour. '
+                  'Regenerate with refresh_price_table.py',
+        'default_region': regions[0],
+        'prices': prices
+    }
+
+    with open(args.output, 'w') as output_file:
+        json.dump(table, output_file, indent=2)
+        output_file.write('\n')
+
+    print(f"✅ Wrote {args.output}")
+
+if __name__ == '__main__':
+    main()
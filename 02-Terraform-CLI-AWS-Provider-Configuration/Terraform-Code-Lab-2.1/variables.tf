@@ -338,6 +338,27 @@ variable "auto_shutdown_hours" {
   }
 }
 
+variable "auto_shutdown_regions" {
+  description = "Regions scanned by the auto-shutdown Lambda (defaults to the primary region when empty)"
+  type        = list(string)
+  default     = []
+}
+
+variable "auto_shutdown_resource_types" {
+  description = "Resource types handled by the auto-shutdown Lambda"
+  type        = list(string)
+  default     = ["ec2-instance", "rds-instance", "autoscaling-group", "nat-gateway", "eks-nodegroup"]
+  
+  validation {
+    condition = alltrue([
+      for resource_type in var.auto_shutdown_resource_types : contains([
+        "ec2-instance", "rds-instance", "autoscaling-group", "nat-gateway", "eks-nodegroup"
+      ], resource_type)
+    ])
+    error_message = "Resource types must be ec2-instance, rds-instance, autoscaling-group, nat-gateway or eks-nodegroup."
+  }
+}
+
 variable "cost_optimization_level" {
   description = "Level of cost optimization to apply"
   type        = string
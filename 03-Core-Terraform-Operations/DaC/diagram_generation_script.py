@@ -10,7 +10,6 @@ Version: 2.0
 Date: January 2025
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -24,17 +23,11 @@ try:
     from diagrams.generic.network import Firewall
     from diagrams.aws.storage import S3
     from diagrams.aws.management import Cloudwatch, Cloudtrail
-    from diagrams.aws.general import General, Users
     from diagrams.onprem.vcs import Git
     from diagrams.onprem.ci import Jenkins
     from diagrams.onprem.client import Users as LocalUsers
     from diagrams.onprem.iac import Terraform
-    from diagrams.programming.language import Python
-    from diagrams.generic.blank import Blank
-    from diagrams.generic.compute import Rack
-    from diagrams.generic.network import Switch
     from diagrams.generic.storage import Storage
-    from diagrams.generic.os import Ubuntu, Windows, IOS
     from diagrams.onprem.monitoring import Grafana
 except ImportError as e:
     print(f"Error importing required libraries: {e}")
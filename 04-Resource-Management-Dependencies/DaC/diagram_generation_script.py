@@ -10,7 +10,6 @@ Version: 2.0
 Date: January 2025
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -18,24 +17,13 @@ from pathlib import Path
 try:
     from diagrams import Diagram, Cluster, Edge
     from diagrams.aws.compute import EC2, AutoScaling
-    from diagrams.aws.database import RDS, RDSInstance, DynamodbTable
+    from diagrams.aws.database import RDS
     from diagrams.aws.network import VPC, ELB, InternetGateway, NATGateway, RouteTable, PublicSubnet, PrivateSubnet
     from diagrams.aws.security import IAM
     from diagrams.generic.network import Firewall as SecurityGroup
-    from diagrams.aws.storage import S3
-    from diagrams.aws.management import Cloudwatch as CloudWatch, Cloudtrail as CloudTrail
-    from diagrams.aws.general import General, Users
-    from diagrams.onprem.vcs import Git
-    from diagrams.onprem.ci import Jenkins
-    from diagrams.onprem.client import Users as LocalUsers
+    from diagrams.aws.management import Cloudwatch as CloudWatch
     from diagrams.onprem.iac import Terraform
-    from diagrams.programming.language import Python
-    from diagrams.generic.blank import Blank
-    from diagrams.generic.compute import Rack
-    from diagrams.generic.network import Switch
     from diagrams.generic.storage import Storage
-    from diagrams.generic.os import Ubuntu, Windows, IOS
-    from diagrams.onprem.monitoring import Grafana
 except ImportError as e:
     print(f"Error importing required libraries: {e}")
     print("Please install required packages: pip install diagrams")
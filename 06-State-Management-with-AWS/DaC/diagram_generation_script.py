@@ -10,7 +10,6 @@ Version: 2.0
 Date: January 2025
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -19,17 +18,13 @@ try:
     from diagrams import Diagram, Cluster, Edge
     from diagrams.aws.compute import EC2, AutoScaling
     from diagrams.aws.database import RDS, DynamodbTable
-    from diagrams.aws.network import VPC, PrivateSubnet, PublicSubnet, NATGateway, InternetGateway
-    from diagrams.aws.security import IAM, SecretsManager, KMS
-    from diagrams.generic.network import Firewall as SecurityGroup
+    from diagrams.aws.network import VPC, PrivateSubnet, PublicSubnet
+    from diagrams.aws.security import IAM, KMS
     from diagrams.aws.storage import S3
     from diagrams.aws.management import Cloudwatch as CloudWatch, Cloudtrail as CloudTrail, Organizations
     from diagrams.aws.integration import SNS
     from diagrams.onprem.iac import Terraform
     from diagrams.programming.language import Python
-    from diagrams.generic.blank import Blank
-    from diagrams.generic.database import SQL
-    from diagrams.generic.network import Firewall
     from diagrams.generic.storage import Storage
     from diagrams.onprem.vcs import Git
     from diagrams.onprem.ci import Jenkins
@@ -6,7 +6,7 @@ Shows the complete lifecycle of module development, testing, and deployment
 
 from diagrams import Diagram, Cluster, Edge
 from diagrams.onprem.vcs import Git, Github
-from diagrams.onprem.ci import Jenkins, GithubActions
+from diagrams.onprem.ci import GithubActions
 from diagrams.onprem.container import Docker
 from diagrams.aws.storage import S3
 from diagrams.aws.management import Cloudwatch
@@ -6,14 +6,11 @@ Shows comprehensive testing approaches for Terraform modules
 
 from diagrams import Diagram, Cluster, Edge
 from diagrams.generic.compute import Rack
-from diagrams.onprem.ci import Jenkins, GithubActions
-from diagrams.onprem.container import Docker
+from diagrams.onprem.ci import GithubActions
 from diagrams.onprem.monitoring import Grafana
 from diagrams.aws.management import Cloudwatch
 from diagrams.aws.security import Inspector
 from diagrams.generic.blank import Blank
-from diagrams.generic.device import Mobile
-from diagrams.onprem.vcs import Git
 
 # Configure diagram settings
 graph_attr = {
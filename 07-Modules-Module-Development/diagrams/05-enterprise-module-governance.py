@@ -6,12 +6,10 @@ Shows enterprise-scale module governance, distribution, and compliance patterns
 
 from diagrams import Diagram, Cluster, Edge
 from diagrams.generic.compute import Rack
-from diagrams.onprem.vcs import Github
 from diagrams.onprem.security import Vault
 from diagrams.aws.management import Organizations, Cloudwatch
 from diagrams.aws.security import IAM, SecurityHub
 from diagrams.aws.storage import S3
-from diagrams.aws.compute import Lambda
 from diagrams.aws.integration import SQS, SNS
 from diagrams.onprem.monitoring import Grafana
 from diagrams.generic.blank import Blank
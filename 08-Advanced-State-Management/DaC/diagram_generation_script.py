@@ -10,10 +10,9 @@ This script generates 5 professional diagrams for advanced Terraform state manag
 4. State Lifecycle and Operations Flow
 5. Disaster Recovery and Backup Strategy
 
-Requirements: diagrams, matplotlib, seaborn
+Requirements: diagrams
 """
 
-import os
 import sys
 from pathlib import Path
 
@@ -30,15 +29,10 @@ try:
     from diagrams.aws.network import VPC
     from diagrams.aws.general import Users, General
     from diagrams.programming.framework import Terraform
-    from diagrams.programming.language import Python
     from diagrams.onprem.vcs import Git
-    from diagrams.onprem.ci import Jenkins
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    import numpy as np
 except ImportError as e:
     print(f"Error importing required modules: {e}")
-    print("Please install required packages: pip install diagrams matplotlib seaborn")
+    print("Please install required packages: pip install diagrams")
     sys.exit(1)
 
 # AWS Brand Colors
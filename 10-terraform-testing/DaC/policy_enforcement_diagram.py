@@ -6,7 +6,6 @@ Generates a diagram showing policy as code enforcement
 
 from diagrams import Diagram, Cluster, Edge
 from diagrams.onprem.iac import Terraform
-from diagrams.onprem.security import Vault
 from diagrams.onprem.inmemory import Redis
 from diagrams.aws.compute import EC2
 
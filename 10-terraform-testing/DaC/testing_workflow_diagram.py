@@ -8,7 +8,6 @@ from diagrams import Diagram, Cluster, Edge
 from diagrams.onprem.iac import Terraform
 from diagrams.onprem.vcs import Github
 from diagrams.onprem.ci import GitlabCI
-from diagrams.onprem.inmemory import Redis
 from diagrams.aws.compute import EC2
 
 def create_testing_workflow_diagram():
@@ -6,9 +6,7 @@ Generates a diagram showing the validation pipeline stages
 
 from diagrams import Diagram, Cluster, Edge
 from diagrams.onprem.iac import Terraform
-from diagrams.onprem.ci import GitlabCI
 from diagrams.onprem.inmemory import Redis
-from diagrams.onprem.security import Vault
 
 def create_validation_pipeline_diagram():
     """Create Terraform validation pipeline diagram"""
@@ -5,7 +5,7 @@ Generates a professional diagram showing secure VPC design
 """
 
 from diagrams import Diagram, Cluster, Edge
-from diagrams.aws.network import VPC, Subnet, SecurityGroup, NatGateway
+from diagrams.aws.network import SecurityGroup, NatGateway
 from diagrams.aws.compute import EC2
 from diagrams.aws.database import RDS
 from diagrams.aws.network import ELB
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform API Client Benchmark
+Measures client throughput, connection reuse and backoff behavior against the
+local API stand-in (fake_tfc_api.py), so client changes can be measured in CI
+without a token
+
+Usage:
+    ./benchmark_clients.py
+    ./benchmark_clients.py --workspaces 3000 --latency 0.02 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict
+
+from fake_tfc_api import fake_tfc_api
+
+
+def measure(server, scenario: Callable[[], int]) -> Dict[str, float]:
+    """
+    Run a scenario and collect server-side counters.
+
+    Args:
+        server: Running fake API server
+        scenario: Callable returning the number of completed operations
+
+    Returns:
+        Operations, wall time, throughput and request/connection counts
+    """
+    server.reset_stats()
+    start = time.perf_counter()
+    operations = scenario()
+    elapsed = time.perf_counter() - start
+    stats = dict(server.stats)
+    return {
+        'operations': operations,
+        'seconds': round(elapsed, 3),
+        'ops_per_second': round(operations / elapsed, 1) if elapsed else 0.0,
+        'requests': stats['requests'],
+        'connections': stats['connections'],
+        'rate_limited': stats['rate_limited']
+    }
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Benchmark the HCP Terraform API clients offline')
+    parser.add_argument('--workspaces', type=int, default=1000, help='Workspaces seeded in the stand-in')
+    parser.add_argument('--updates', type=int, default=200, help='Workspaces updated per update scenario')
+    parser.add_argument('--latency', type=float, default=0.01, help='Seconds added to every response')
+    parser.add_argument('--server-rate-limit', type=float, default=30.0,
+                        help='Stand-in rate limit for the backoff scenario (req/s)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+
+    with fake_tfc_api(latency=args.latency, workspaces=args.workspaces) as server:
+        # The example modules read their settings at import time
+        os.environ.update(server.environment())
+        os.environ['TFC_RATE_LIMIT'] = '0'
+
+        import requests
+        import workspace_manager
+        from bulk_apply import bulk_apply
+        from tfc_client import TFCClient
+
+        names = [f'workspace-{index:05d}' for index in range(1, min(args.updates, args.workspaces) + 1)]
+        payload = {'data': {'type': 'workspaces', 'attributes': {'terraform-version': '1.6.6'}}}
+        headers = {'Authorization': f'Bearer {server.token}', 'Content-Type': 'application/vnd.api+json'}
+
+        def unpooled_updates() -> int:
+            # Baseline: a new connection per call, as the scripts did before tfc_client.py
+            for name in names:
+                requests.patch(f'{server.url}/organizations/{server.state.org}/workspaces/{name}',
+                               headers=headers, json=payload, timeout=30)
+            return len(names)
+
+        def pooled_updates() -> int:
+            client = TFCClient.from_env(rate_limit=0)
+            for name in names:
+                client.patch(f'/organizations/{client.org}/workspaces/{name}', json=payload)
+            client.close()
+            return len(names)
+
+        def async_updates() -> int:
+            changes = [{'action': 'update', 'workspace': name, 'attributes': {'terraform-version': '1.6.6'}}
+                       for name in names]
+            results = asyncio.run(bulk_apply(changes))
+            return sum(1 for result in results if result['status'] == 'success')
+
+        def listing(page_workers: int) -> Callable[[], int]:
+            def run() -> int:
+                return sum(1 for _ in workspace_manager.iter_workspaces(max_workers=page_workers))
+            return run
+
+        def rate_limited_updates() -> int:
+            # No client-side limit: every request over the server's limit gets a 429
+            server.set_rate_limit(args.server_rate_limit)
+            try:
+                client = TFCClient.from_env(rate_limit=0, max_retries=10)
+                completed = sum(
+                    1 for name in names
+                    if client.patch(f'/organizations/{client.org}/workspaces/{name}', json=payload).status_code == 200
+                )
+                client.close()
+                return completed
+            finally:
+                server.set_rate_limit(0)
+
+        def paced_updates() -> int:
+            # Client-side limit just under the server's: no 429s expected
+            server.set_rate_limit(args.server_rate_limit)
+            try:
+                client = TFCClient.from_env(rate_limit=args.server_rate_limit * 0.95)
+                completed = sum(
+                    1 for name in names
+                    if client.patch(f'/organizations/{client.org}/workspaces/{name}', json=payload).status_code == 200
+                )
+                client.close()
+                return completed
+            finally:
+                server.set_rate_limit(0)
+
+        scenarios = {
+            'update_unpooled': unpooled_updates,
+            'update_pooled': pooled_updates,
+            'update_async': async_updates,
+            'list_sequential': listing(1),
+            'list_concurrent': listing(8),
+            'update_rate_limited_backoff': rate_limited_updates,
+            'update_rate_limited_paced': paced_updates
+        }
+        results = {name: measure(server, scenario) for name, scenario in scenarios.items()}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 86)
+    print(f"HCP Terraform client benchmark ({args.workspaces} workspaces, {args.latency * 1000:.0f} ms latency)")
+    print("=" * 86)
+    print(f"{'Scenario':<30}{'Ops':>7}{'Seconds':>10}{'Ops/s':>10}{'Requests':>10}{'Conns':>8}{'429s':>8}")
+    for name, result in results.items():
+        print(f"{name:<30}{result['operations']:>7}{result['seconds']:>10.2f}{result['ops_per_second']:>10.1f}"
+              f"{result['requests']:>10}{result['connections']:>8}{result['rate_limited']:>8}")
+
+    incomplete = [name for name, result in results.items()
+                  if name.startswith('update') and result['operations'] != len(names)]
+    if incomplete:
+        print(f"❌ Scenarios with failed operations: {', '.join(incomplete)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform Bulk Apply
+Applies a CSV or JSON file of workspace changes concurrently with the async
+client and reports a result per item
+
+CSV columns: action, workspace, then one column per workspace attribute
+(empty cells are left unchanged), for example:
+    action,workspace,terraform-version,auto-apply
+    update,prod-infrastructure,1.6.6,
+    create,new-workspace,1.6.6,false
+
+JSON: a list of {"action": ..., "workspace": ..., "attributes": {...}}
+
+Actions: create, update, delete, run (attributes: message, is-destroy)
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+from tfc_async_client import CONCURRENCY, AsyncTFCClient
+
+ACTIONS = ['create', 'update', 'delete', 'run']
+
+
+def parse_value(value: str) -> Any:
+    """Convert CSV cells to booleans where the API expects them"""
+    if value.lower() in ['true', 'false']:
+        return value.lower() == 'true'
+    return value
+
+
+def load_changes(path: str) -> List[Dict]:
+    """Load changes from a CSV or JSON file"""
+    with open(path, newline='') as changes_file:
+        if path.endswith('.json'):
+            changes = json.load(changes_file)
+        else:
+            changes = [
+                {
+                    'action': row.pop('action', '') or 'update',
+                    'workspace': row.pop('workspace'),
+                    'attributes': {key: parse_value(value) for key, value in row.items() if value}
+                }
+                for row in csv.DictReader(changes_file)
+            ]
+
+    for index, change in enumerate(changes, 1):
+        change.setdefault('action', 'update')
+        change.setdefault('attributes', {})
+        if change['action'] not in ACTIONS or not change.get('workspace'):
+            raise SystemExit(f"❌ Invalid change #{index}: {change}")
+
+    return changes
+
+
+async def apply_change(client: AsyncTFCClient, change: Dict) -> Dict:
+    """Apply one change and return its result"""
+    action, workspace, attributes = change['action'], change['workspace'], change['attributes']
+    result = {'action': action, 'workspace': workspace}
+    start = time.perf_counter()
+
+    try:
+        if action == 'create':
+            data = await client.create_workspace(workspace, **{
+                'terraform_version': attributes.pop('terraform-version', '1.6.0'),
+                **attributes
+            })
+            result['id'] = data['id']
+        elif action == 'update':
+            data = await client.update_workspace(workspace, **attributes)
+            result['id'] = data['id']
+        elif action == 'delete':
+            await client.delete_workspace(workspace)
+        elif action == 'run':
+            workspace_id = workspace if workspace.startswith('ws-') else (await client.get_workspace(workspace))['id']
+            data = await client.create_run(
+                workspace_id,
+                message=attributes.get('message', 'Triggered via bulk apply'),
+                is_destroy=attributes.get('is-destroy', False)
+            )
+            result['id'] = data['id']
+        result['status'] = 'success'
+    except Exception as e:
+        result.update(status='error', error=str(e))
+
+    result['duration_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def bulk_apply(changes: List[Dict], concurrency: int = CONCURRENCY) -> List[Dict]:
+    """Apply changes concurrently, returning results in input order"""
+    async with AsyncTFCClient.from_env(concurrency=concurrency) as client:
+        return await asyncio.gather(*(apply_change(client, change) for change in changes))
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Apply workspace changes in bulk')
+    parser.add_argument('changes', help='CSV or JSON file of changes')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY, help='Requests in flight at once')
+    parser.add_argument('--output', help='Write per-item results to this JSON file')
+    parser.add_argument('--dry-run', action='store_true', help='Show the changes without applying them')
+
+    args = parser.parse_args()
+    changes = load_changes(args.changes)
+
+    print("=" * 70)
+    print(f"HCP Terraform Bulk Apply ({len(changes)} changes)")
+    print("=" * 70)
+
+    if args.dry_run:
+        for change in changes:
+            print(f"   - {change['action']} {change['workspace']} {change['attributes'] or ''}")
+        return
+
+    start = time.perf_counter()
+    results = asyncio.run(bulk_apply(changes, args.concurrency))
+    elapsed = time.perf_counter() - start
+
+    failed = [r for r in results if r['status'] != 'success']
+    for result in failed:
+        print(f"❌ {result['action']} {result['workspace']}: {result['error']}")
+
+    print(f"\n✅ {len(results) - len(failed)} succeeded, {len(failed)} failed in {elapsed:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,782 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform API Stand-in
+Local, in-memory fake of the JSON:API endpoints used by the examples
+(workspaces, tags, run triggers, runs and their plan/apply logs, run actions,
+variables and variable sets) with pagination, configurable latency and rate
+limiting. Lets the clients be tested and benchmarked without a token or a
+real organization.
+
+Usage:
+    ./fake_tfc_api.py --port 8800 --workspaces 3000 --latency 0.05
+    export TFC_TOKEN=fake TFC_ORG=fake-org TFC_ADDRESS=http://127.0.0.1:8800/api/v2
+"""
+
+import argparse
+import contextlib
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FAKE_ORG = 'fake-org'
+FAKE_TOKEN = 'fake-token'
+
+# Seconds a run spends in each status before moving to the next
+RUN_STEP_SECONDS = 0.5
+
+MAX_PAGE_SIZE = 100
+
+# Log lines written over the planning and applying steps of every run
+PLAN_LOG_LINES = [
+    'Terraform v1.6.6',
+    'on linux_amd64',
+    'Initializing plugins and modules...',
+    'aws_s3_bucket.logs: Refreshing state... [id=logs]',
+    '',
+    'Terraform will perform the following actions:',
+    '  # aws_instance.web will be created',
+    '',
+    'Plan: 1 to add, 0 to change, 0 to destroy.'
+]
+APPLY_LOG_LINES = [
+    'Terraform v1.6.6',
+    'aws_instance.web: Creating...',
+    'aws_instance.web: Still creating... [10s elapsed]',
+    'aws_instance.web: Creation complete after 12s [id=i-0abc123]',
+    '',
+    'Apply complete! Resources: 1 added, 0 changed, 0 destroyed.'
+]
+
+# Status timestamps a run collects, in order, as it moves through its steps
+PLAN_TIMESTAMPS = ['plan-queued-at', 'planning-at', 'planned-at']
+APPLY_TIMESTAMPS = ['apply-queued-at', 'applying-at', 'applied-at']
+
+# Logs are framed by STX and, once complete, ETX
+LOG_START = b'\x02'
+LOG_END = b'\x03'
+
+
+class FakeState:
+    """In-memory organization: workspaces, runs, variables and variable sets"""
+
+    def __init__(self, org: str = FAKE_ORG, run_step: float = RUN_STEP_SECONDS):
+        self.org = org
+        self.run_step = run_step
+        self.workspaces: Dict[str, Dict] = {}
+        self.runs: Dict[str, Dict] = {}
+        self.workspace_runs: Dict[str, List[str]] = {}
+        # Variables keyed by owner (workspace or variable set ID), then var ID
+        self.vars: Dict[str, Dict[str, Dict]] = {}
+        self.varsets: Dict[str, Dict] = {}
+        self.run_triggers: Dict[str, Dict] = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def new_id(self, prefix: str) -> str:
+        return f'{prefix}-{next(self.ids):012x}'
+
+    def add_workspace(self, name: str, **attributes) -> Dict:
+        workspace = {
+            'id': self.new_id('ws'),
+            'type': 'workspaces',
+            'attributes': {
+                'name': name,
+                'terraform-version': '1.6.0',
+                'auto-apply': False,
+                'execution-mode': 'remote',
+                'description': '',
+                'tag-names': [],
+                'vcs-repo': None,
+                'created-at': now_iso(),
+                **attributes
+            }
+        }
+        self.workspaces[workspace['id']] = workspace
+        self.vars[workspace['id']] = {}
+        self.workspace_runs[workspace['id']] = []
+        return workspace
+
+    def add_run(self, workspace_id: str, message: str = '', is_destroy: bool = False, confirmed: bool = False,
+                final_status: Optional[str] = None, timestamps: Optional[Dict[str, float]] = None) -> Dict:
+        """Add a live run, or a finished one with fixed status timestamps (epoch seconds)"""
+        created = timestamps['plan-queued-at'] if timestamps else time.time()
+        run = {
+            'id': self.new_id('run'),
+            'workspace_id': workspace_id,
+            'message': message,
+            'is-destroy': is_destroy,
+            'created-at': iso(created),
+            'created': created,
+            'started': time.monotonic(),
+            'confirmed': confirmed,
+            'final_status': final_status,
+            'timestamps': {key: iso(value) for key, value in timestamps.items()} if timestamps else None
+        }
+        self.runs[run['id']] = run
+        self.workspace_runs[workspace_id].append(run['id'])
+        return run
+
+    def add_varset(self, name: str, **attributes) -> Dict:
+        varset = {
+            'id': self.new_id('varset'),
+            'type': 'varsets',
+            'attributes': {'name': name, 'description': '', 'global': False, **attributes}
+        }
+        self.varsets[varset['id']] = varset
+        self.vars[varset['id']] = {}
+        return varset
+
+    def find_workspace(self, name: str) -> Optional[Dict]:
+        return next((ws for ws in self.workspaces.values() if ws['attributes']['name'] == name), None)
+
+    def run_view(self, run: Dict) -> Dict:
+        """Render a run with its status advanced by elapsed time"""
+        steps = ['pending', 'planning', 'planned']
+        if run['confirmed']:
+            steps += ['apply_queued', 'applying', 'applied']
+
+        if run['final_status']:
+            status = run['final_status']
+        else:
+            elapsed = time.monotonic() - run['started']
+            status = steps[min(int(elapsed / self.run_step), len(steps) - 1)] if self.run_step else steps[-1]
+
+        if run['timestamps']:
+            timestamps = run['timestamps']
+        else:
+            # One timestamp per step reached so far, run_step seconds apart
+            keys = PLAN_TIMESTAMPS + (APPLY_TIMESTAMPS if run['confirmed'] else [])
+            end = run.get('ended') or time.monotonic()
+            reached = min(int((end - run['started']) / self.run_step) + 1, len(keys)) if self.run_step else len(keys)
+            timestamps = {key: iso(run['created'] + index * self.run_step) for index, key in enumerate(keys[:reached])}
+
+        return {
+            'id': run['id'],
+            'type': 'runs',
+            'attributes': {
+                'status': status,
+                'message': run['message'],
+                'is-destroy': run['is-destroy'],
+                'created-at': run['created-at'],
+                'status-timestamps': timestamps,
+                'actions': {
+                    'is-confirmable': status == 'planned' and not run['confirmed'],
+                    'is-cancelable': status in steps[:2]
+                }
+            },
+            'relationships': {'workspace': {'data': {'type': 'workspaces', 'id': run['workspace_id']}}}
+        }
+
+    def phase_view(self, run: Dict, phase: str) -> Tuple[str, int]:
+        """Status of a run's plan or apply, and how many log lines it has written"""
+        lines = PLAN_LOG_LINES if phase == 'plan' else APPLY_LOG_LINES
+        if phase == 'apply' and not run['confirmed']:
+            return ('unreachable' if run['final_status'] else 'pending'), 0
+
+        if not self.run_step:
+            return 'finished', len(lines)
+
+        # Steps since the phase started running: 'planning' is step 1, 'applying' step 4
+        end = run.get('ended') or time.monotonic()
+        position = (end - run['started']) / self.run_step - (1 if phase == 'plan' else 4)
+        if position >= 1:
+            return 'finished', len(lines)
+        if run['final_status']:
+            status = 'canceled'
+        elif position >= 0:
+            status = 'running'
+        else:
+            status = 'queued' if phase == 'apply' and position >= -1 else 'pending'
+        return status, int(max(0.0, position) * len(lines))
+
+    def log_content(self, run: Dict, phase: str) -> bytes:
+        status, count = self.phase_view(run, phase)
+        lines = PLAN_LOG_LINES if phase == 'plan' else APPLY_LOG_LINES
+        body = ''.join(f'{line}\n' for line in lines[:count]).encode()
+        return LOG_START + body + (LOG_END if status in ['finished', 'errored', 'canceled', 'unreachable'] else b'')
+
+
+class RateLimiter:
+    """Token bucket shared by all connections; a rate of 0 disables it"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> Optional[float]:
+        """Take a token, or return the seconds until one is available"""
+        if not self.rate:
+            return None
+
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return None
+            return (1 - self.tokens) / self.rate
+
+
+class FakeTFCServer(ThreadingHTTPServer):
+    """HTTP server holding the fake state, settings and request statistics"""
+
+    daemon_threads = True
+
+    # The default backlog of 5 drops connects from concurrent clients, which
+    # then stall for a SYN retransmit
+    request_queue_size = 128
+
+    def __init__(self, port: int = 0, latency: float = 0.0, rate_limit: float = 0.0,
+                 token: str = FAKE_TOKEN, state: Optional[FakeState] = None):
+        super().__init__(('127.0.0.1', port), FakeTFCHandler)
+        self.latency = latency
+        self.limiter = RateLimiter(rate_limit)
+        self.token = token
+        self.state = state or FakeState()
+        self.stats = {'requests': 0, 'connections': 0, 'rate_limited': 0, 'not_modified': 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}/api/v2'
+
+    def count(self, key: str):
+        with self.stats_lock:
+            self.stats[key] += 1
+
+    def set_rate_limit(self, rate: float):
+        self.limiter = RateLimiter(rate)
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats = {key: 0 for key in self.stats}
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables that point the example clients at this server"""
+        return {'TFC_TOKEN': self.token, 'TFC_ORG': self.state.org, 'TFC_ADDRESS': self.url}
+
+
+# (method, path pattern, handler method name); patterns are matched in order
+ROUTES: List[Tuple[str, str, str]] = [
+    ('GET', r'/organizations/(?P<org>[^/]+)/workspaces', 'list_workspaces'),
+    ('POST', r'/organizations/(?P<org>[^/]+)/workspaces', 'create_workspace'),
+    ('GET', r'/organizations/(?P<org>[^/]+)/workspaces/(?P<name>[^/]+)', 'get_workspace'),
+    ('PATCH', r'/organizations/(?P<org>[^/]+)/workspaces/(?P<name>[^/]+)', 'update_workspace'),
+    ('DELETE', r'/organizations/(?P<org>[^/]+)/workspaces/(?P<name>[^/]+)', 'delete_workspace'),
+    ('GET', r'/workspaces/(?P<workspace_id>ws-[^/]+)', 'get_workspace'),
+    ('PATCH', r'/workspaces/(?P<workspace_id>ws-[^/]+)', 'update_workspace'),
+    ('DELETE', r'/workspaces/(?P<workspace_id>ws-[^/]+)', 'delete_workspace'),
+    ('POST', r'/workspaces/(?P<workspace_id>ws-[^/]+)/relationships/tags', 'add_tags'),
+    ('DELETE', r'/workspaces/(?P<workspace_id>ws-[^/]+)/relationships/tags', 'remove_tags'),
+    ('GET', r'/workspaces/(?P<workspace_id>ws-[^/]+)/run-triggers', 'list_run_triggers'),
+    ('POST', r'/workspaces/(?P<workspace_id>ws-[^/]+)/run-triggers', 'create_run_trigger'),
+    ('DELETE', r'/run-triggers/(?P<run_trigger_id>rt-[^/]+)', 'delete_run_trigger'),
+    ('GET', r'/workspaces/(?P<workspace_id>ws-[^/]+)/runs', 'list_runs'),
+    ('POST', r'/runs', 'create_run'),
+    ('GET', r'/runs/(?P<run_id>run-[^/]+)', 'get_run'),
+    ('POST', r'/runs/(?P<run_id>run-[^/]+)/actions/(?P<action>apply|cancel|discard)', 'run_action'),
+    ('GET', r'/runs/(?P<run_id>run-[^/]+)/(?P<phase>plan|apply)', 'get_phase'),
+    ('GET', r'/workspaces/(?P<workspace_id>ws-[^/]+)/vars', 'list_vars'),
+    ('POST', r'/workspaces/(?P<workspace_id>ws-[^/]+)/vars', 'create_var'),
+    ('PATCH', r'/workspaces/(?P<workspace_id>ws-[^/]+)/vars/(?P<var_id>var-[^/]+)', 'update_var'),
+    ('DELETE', r'/workspaces/(?P<workspace_id>ws-[^/]+)/vars/(?P<var_id>var-[^/]+)', 'delete_var'),
+    ('GET', r'/organizations/(?P<org>[^/]+)/varsets', 'list_varsets'),
+    ('POST', r'/organizations/(?P<org>[^/]+)/varsets', 'create_varset'),
+    ('GET', r'/varsets/(?P<varset_id>varset-[^/]+)/relationships/vars', 'list_vars'),
+    ('POST', r'/varsets/(?P<varset_id>varset-[^/]+)/relationships/vars', 'create_var'),
+    ('PATCH', r'/varsets/(?P<varset_id>varset-[^/]+)/relationships/vars/(?P<var_id>var-[^/]+)', 'update_var'),
+    ('DELETE', r'/varsets/(?P<varset_id>varset-[^/]+)/relationships/vars/(?P<var_id>var-[^/]+)', 'delete_var'),
+]
+
+
+class FakeTFCHandler(BaseHTTPRequestHandler):
+    """Serves the fake API over keep-alive HTTP/1.1 connections"""
+
+    protocol_version = 'HTTP/1.1'
+    server: FakeTFCServer
+
+    # Headers and body go out as separate writes; without TCP_NODELAY the
+    # body waits on the client's delayed ACK and every keep-alive response
+    # gains ~40 ms, which would hide the benefit of connection reuse
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # One handler instance per connection, so this counts connections
+        super().setup()
+        self.server.count('connections')
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PATCH(self):
+        self.dispatch('PATCH')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def dispatch(self, method: str):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b''
+        self.server.count('requests')
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        url = urlparse(self.path)
+        if url.path.startswith('/_archivist/') and method == 'GET':
+            # Log read URLs are pre-signed: no token, no API rate limit
+            return self.serve_log(url.path)
+
+        if self.headers.get('Authorization') != f'Bearer {self.server.token}':
+            return self.reply(401, {'errors': [{'status': '401', 'title': 'unauthorized'}]})
+
+        wait = self.server.limiter.take()
+        if wait is not None:
+            self.server.count('rate_limited')
+            return self.reply(429, {'errors': [{'status': '429', 'title': 'Too many requests'}]},
+                              {'X-RateLimit-Limit': f'{self.server.limiter.rate:g}', 'X-RateLimit-Reset': f'{wait:.3f}'})
+
+        path = url.path[len('/api/v2'):] if url.path.startswith('/api/v2') else url.path
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        for route_method, pattern, handler_name in ROUTES:
+            match = re.fullmatch(pattern, path)
+            if route_method == method and match:
+                try:
+                    payload = json.loads(body) if body else {}
+                except ValueError:
+                    return self.reply(400, {'errors': [{'status': '400', 'title': 'invalid JSON'}]})
+                with self.server.state.lock:
+                    status, response = getattr(self, handler_name)(query=query, payload=payload, **match.groupdict())
+
+                if method == 'GET' and status == 200:
+                    # Strong validator so clients can revalidate with If-None-Match
+                    etag = '"' + hashlib.sha1(json.dumps(response, sort_keys=True).encode()).hexdigest() + '"'
+                    if self.headers.get('If-None-Match') == etag:
+                        self.server.count('not_modified')
+                        return self.reply(304, None, {'ETag': etag})
+                    return self.reply(status, response, {'ETag': etag})
+                return self.reply(status, response)
+
+        self.reply(404, {'errors': [{'status': '404', 'title': 'not found'}]})
+
+    def reply(self, status: int, payload: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/vnd.api+json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def serve_log(self, path: str):
+        """Serve a plan or apply log as it stands, honouring a 'bytes=N-' Range"""
+        match = re.fullmatch(r'/_archivist/(?P<run_id>run-[^/]+)/(?P<phase>plan|apply)', path)
+        with self.server.state.lock:
+            run = self.state.runs.get(match['run_id']) if match else None
+            content = self.state.log_content(run, match['phase']) if run else None
+        if content is None:
+            return self.reply(404, {'errors': [{'status': '404'}]})
+
+        start = re.fullmatch(r'bytes=(\d+)-', self.headers.get('Range', ''))
+        status, offset = (206, int(start[1])) if start else (200, 0)
+        if offset >= len(content):
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(content)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = content[offset:]
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {offset}-{len(content) - 1}/{len(content)}')
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Helpers
+
+    @property
+    def state(self) -> FakeState:
+        return self.server.state
+
+    def resolve_workspace(self, org: Optional[str] = None, name: Optional[str] = None,
+                          workspace_id: Optional[str] = None) -> Optional[Dict]:
+        if workspace_id:
+            return self.state.workspaces.get(workspace_id)
+        if org != self.state.org:
+            return None
+        return self.state.find_workspace(name)
+
+    def paginate(self, items: List[Dict], query: Dict[str, str]) -> Dict:
+        size = min(int(query.get('page[size]', 20)), MAX_PAGE_SIZE)
+        number = max(int(query.get('page[number]', 1)), 1)
+        total_pages = max(1, -(-len(items) // size))
+        links = {'next': f'?page[number]={number + 1}&page[size]={size}'} if number < total_pages else {}
+        return {
+            'data': items[(number - 1) * size:number * size],
+            'links': links,
+            'meta': {'pagination': {
+                'current-page': number,
+                'page-size': size,
+                'total-pages': total_pages,
+                'total-count': len(items)
+            }}
+        }
+
+    # Workspaces
+
+    def list_workspaces(self, org: str, query: Dict, **_) -> Tuple[int, Dict]:
+        if org != self.state.org:
+            return 404, {'errors': [{'status': '404'}]}
+        return 200, self.paginate(list(self.state.workspaces.values()), query)
+
+    def create_workspace(self, org: str, payload: Dict, **_) -> Tuple[int, Dict]:
+        attributes = payload.get('data', {}).get('attributes', {})
+        name = attributes.get('name')
+        if org != self.state.org:
+            return 404, {'errors': [{'status': '404'}]}
+        if not name or self.state.find_workspace(name):
+            return 422, {'errors': [{'status': '422', 'title': 'invalid attribute', 'detail': 'Name has already been taken'}]}
+        return 201, {'data': self.state.add_workspace(**attributes)}
+
+    def get_workspace(self, **params) -> Tuple[int, Dict]:
+        workspace = self.resolve_workspace(params.get('org'), params.get('name'), params.get('workspace_id'))
+        return (200, {'data': workspace}) if workspace else (404, {'errors': [{'status': '404'}]})
+
+    def update_workspace(self, payload: Dict, **params) -> Tuple[int, Dict]:
+        workspace = self.resolve_workspace(params.get('org'), params.get('name'), params.get('workspace_id'))
+        if not workspace:
+            return 404, {'errors': [{'status': '404'}]}
+        workspace['attributes'].update(payload.get('data', {}).get('attributes', {}))
+        return 200, {'data': workspace}
+
+    def delete_workspace(self, **params) -> Tuple[int, None]:
+        workspace = self.resolve_workspace(params.get('org'), params.get('name'), params.get('workspace_id'))
+        if not workspace:
+            return 404, {'errors': [{'status': '404'}]}
+        del self.state.workspaces[workspace['id']]
+        self.state.vars.pop(workspace['id'], None)
+        self.state.workspace_runs.pop(workspace['id'], None)
+        for trigger_id, trigger in list(self.state.run_triggers.items()):
+            if workspace['id'] in [trigger['workspace_id'], trigger['sourceable_id']]:
+                del self.state.run_triggers[trigger_id]
+        return 204, None
+
+    def add_tags(self, workspace_id: str, payload: Dict, **_) -> Tuple[int, None]:
+        workspace = self.state.workspaces.get(workspace_id)
+        if not workspace:
+            return 404, {'errors': [{'status': '404'}]}
+        names = [tag['attributes']['name'] for tag in payload.get('data', [])]
+        workspace['attributes']['tag-names'] = sorted(set(workspace['attributes']['tag-names']) | set(names))
+        return 204, None
+
+    def remove_tags(self, workspace_id: str, payload: Dict, **_) -> Tuple[int, None]:
+        workspace = self.state.workspaces.get(workspace_id)
+        if not workspace:
+            return 404, {'errors': [{'status': '404'}]}
+        names = [tag['attributes']['name'] for tag in payload.get('data', [])]
+        workspace['attributes']['tag-names'] = sorted(set(workspace['attributes']['tag-names']) - set(names))
+        return 204, None
+
+    # Run triggers
+
+    def run_trigger_view(self, trigger: Dict) -> Dict:
+        return {
+            'id': trigger['id'],
+            'type': 'run-triggers',
+            'attributes': {
+                'workspace-name': self.state.workspaces[trigger['workspace_id']]['attributes']['name'],
+                'sourceable-name': self.state.workspaces[trigger['sourceable_id']]['attributes']['name'],
+                'created-at': trigger['created-at']
+            },
+            'relationships': {
+                'workspace': {'data': {'type': 'workspaces', 'id': trigger['workspace_id']}},
+                'sourceable': {'data': {'type': 'workspaces', 'id': trigger['sourceable_id']}}
+            }
+        }
+
+    def list_run_triggers(self, workspace_id: str, query: Dict, **_) -> Tuple[int, Dict]:
+        if workspace_id not in self.state.workspaces:
+            return 404, {'errors': [{'status': '404'}]}
+        direction = query.get('filter[run-trigger][type]')
+        if direction not in ['inbound', 'outbound']:
+            return 400, {'errors': [{'status': '400', 'title': 'filter[run-trigger][type] is required'}]}
+        side = 'workspace_id' if direction == 'inbound' else 'sourceable_id'
+        triggers = [self.run_trigger_view(trigger) for trigger in self.state.run_triggers.values()
+                    if trigger[side] == workspace_id]
+        return 200, self.paginate(triggers, query)
+
+    def create_run_trigger(self, workspace_id: str, payload: Dict, **_) -> Tuple[int, Dict]:
+        source_id = payload.get('data', {}).get('relationships', {}).get('sourceable', {}).get('data', {}).get('id')
+        if workspace_id not in self.state.workspaces or source_id not in self.state.workspaces:
+            return 404, {'errors': [{'status': '404'}]}
+        if source_id == workspace_id or any(
+                trigger['workspace_id'] == workspace_id and trigger['sourceable_id'] == source_id
+                for trigger in self.state.run_triggers.values()):
+            return 422, {'errors': [{'status': '422', 'detail': 'Sourceable has already been taken'}]}
+        trigger = {'id': self.state.new_id('rt'), 'workspace_id': workspace_id,
+                   'sourceable_id': source_id, 'created-at': now_iso()}
+        self.state.run_triggers[trigger['id']] = trigger
+        return 201, {'data': self.run_trigger_view(trigger)}
+
+    def delete_run_trigger(self, run_trigger_id: str, **_) -> Tuple[int, None]:
+        if not self.state.run_triggers.pop(run_trigger_id, None):
+            return 404, {'errors': [{'status': '404'}]}
+        return 204, None
+
+    # Runs
+
+    def create_run(self, payload: Dict, **_) -> Tuple[int, Dict]:
+        data = payload.get('data', {})
+        workspace_id = data.get('relationships', {}).get('workspace', {}).get('data', {}).get('id')
+        workspace = self.state.workspaces.get(workspace_id)
+        if not workspace:
+            return 404, {'errors': [{'status': '404'}]}
+
+        attributes = data.get('attributes', {})
+        run = self.state.add_run(workspace_id, attributes.get('message', ''), attributes.get('is-destroy', False),
+                                 workspace['attributes'].get('auto-apply', False))
+        return 201, {'data': self.state.run_view(run)}
+
+    def get_run(self, run_id: str, **_) -> Tuple[int, Dict]:
+        run = self.state.runs.get(run_id)
+        return (200, {'data': self.state.run_view(run)}) if run else (404, {'errors': [{'status': '404'}]})
+
+    def list_runs(self, workspace_id: str, query: Dict, **_) -> Tuple[int, Dict]:
+        if workspace_id not in self.state.workspaces:
+            return 404, {'errors': [{'status': '404'}]}
+        # Newest first; only the requested page is rendered
+        page = self.paginate(self.state.workspace_runs[workspace_id][::-1], query)
+        page['data'] = [self.state.run_view(self.state.runs[run_id]) for run_id in page['data']]
+        return 200, page
+
+    def run_action(self, run_id: str, action: str, **_) -> Tuple[int, Optional[Dict]]:
+        run = self.state.runs.get(run_id)
+        if not run:
+            return 404, {'errors': [{'status': '404'}]}
+
+        status = self.state.run_view(run)['attributes']['status']
+        if action == 'apply':
+            if status != 'planned':
+                return 409, {'errors': [{'status': '409', 'title': 'transition not allowed'}]}
+            run['confirmed'] = True
+            # Continue from 'apply_queued' rather than replaying the plan
+            run['started'] = time.monotonic() - 3 * self.state.run_step
+        elif action == 'cancel':
+            run['final_status'] = 'canceled'
+            run['ended'] = time.monotonic()
+        else:
+            run['final_status'] = 'discarded'
+            run['ended'] = time.monotonic()
+        return 202, None
+
+    def get_phase(self, run_id: str, phase: str, **_) -> Tuple[int, Dict]:
+        run = self.state.runs.get(run_id)
+        if not run:
+            return 404, {'errors': [{'status': '404'}]}
+        status, _ = self.state.phase_view(run, phase)
+        host, port = self.server.server_address[:2]
+        return 200, {'data': {
+            'id': f"{phase}-{run_id.split('-', 1)[1]}",
+            'type': f'{phase}s',
+            'attributes': {
+                'status': status,
+                'log-read-url': f'http://{host}:{port}/_archivist/{run_id}/{phase}'
+            }
+        }}
+
+    # Variables (on a workspace or a variable set)
+
+    def list_vars(self, **params) -> Tuple[int, Dict]:
+        owner = params.get('workspace_id') or params.get('varset_id')
+        if owner not in self.state.vars:
+            return 404, {'errors': [{'status': '404'}]}
+        return 200, {'data': [self.masked(var) for var in self.state.vars[owner].values()]}
+
+    def create_var(self, payload: Dict, **params) -> Tuple[int, Dict]:
+        owner = params.get('workspace_id') or params.get('varset_id')
+        if owner not in self.state.vars:
+            return 404, {'errors': [{'status': '404'}]}
+        attributes = {'category': 'terraform', 'hcl': False, 'sensitive': False, 'description': '',
+                      **payload.get('data', {}).get('attributes', {})}
+        if any(var['attributes']['key'] == attributes.get('key') and
+               var['attributes']['category'] == attributes['category']
+               for var in self.state.vars[owner].values()):
+            return 422, {'errors': [{'status': '422', 'detail': 'Key has already been taken'}]}
+        var = {'id': self.state.new_id('var'), 'type': 'vars', 'attributes': attributes}
+        self.state.vars[owner][var['id']] = var
+        return 201, {'data': self.masked(var)}
+
+    def update_var(self, var_id: str, payload: Dict, **params) -> Tuple[int, Dict]:
+        owner = params.get('workspace_id') or params.get('varset_id')
+        var = self.state.vars.get(owner, {}).get(var_id)
+        if not var:
+            return 404, {'errors': [{'status': '404'}]}
+        attributes = payload.get('data', {}).get('attributes', {})
+        if var['attributes'].get('sensitive') and attributes.get('sensitive') is False:
+            return 422, {'errors': [{'status': '422', 'detail': 'Sensitive variables cannot be made non-sensitive'}]}
+        var['attributes'].update(attributes)
+        return 200, {'data': self.masked(var)}
+
+    def delete_var(self, var_id: str, **params) -> Tuple[int, None]:
+        owner = params.get('workspace_id') or params.get('varset_id')
+        if not self.state.vars.get(owner, {}).pop(var_id, None):
+            return 404, {'errors': [{'status': '404'}]}
+        return 204, None
+
+    # Variable sets
+
+    def list_varsets(self, org: str, query: Dict, **_) -> Tuple[int, Dict]:
+        if org != self.state.org:
+            return 404, {'errors': [{'status': '404'}]}
+        return 200, self.paginate(list(self.state.varsets.values()), query)
+
+    def create_varset(self, org: str, payload: Dict, **_) -> Tuple[int, Dict]:
+        attributes = payload.get('data', {}).get('attributes', {})
+        name = attributes.get('name')
+        if org != self.state.org:
+            return 404, {'errors': [{'status': '404'}]}
+        if not name or any(varset['attributes']['name'] == name for varset in self.state.varsets.values()):
+            return 422, {'errors': [{'status': '422', 'detail': 'Name has already been taken'}]}
+        return 201, {'data': self.state.add_varset(**attributes)}
+
+    @staticmethod
+    def masked(var: Dict) -> Dict:
+        """Sensitive values are write-only, as in the real API"""
+        if not var['attributes'].get('sensitive'):
+            return var
+        return dict(var, attributes=dict(var['attributes'], value=None))
+
+
+def iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def now_iso() -> str:
+    return iso(time.time())
+
+
+def seed_workspaces(state: FakeState, count: int, prefix: str = 'workspace') -> None:
+    """Add count workspaces named prefix-00001, prefix-00002, ..."""
+    with state.lock:
+        for index in range(1, count + 1):
+            state.add_workspace(f'{prefix}-{index:05d}')
+
+
+def seed_run_history(state: FakeState, runs_per_workspace: int, seed: int = 0) -> None:
+    """
+    Give every workspace a history of finished runs with realistic timings.
+
+    Every fourth workspace runs on one of two agent pools; the smaller pool
+    queues runs noticeably longer, so analytics have a bottleneck to find.
+    """
+    rng = random.Random(seed)
+    now = time.time()
+    pools = ['apool-000000000large', 'apool-000000000small']
+
+    with state.lock:
+        for index, workspace in enumerate(list(state.workspaces.values())):
+            pool = pools[(index // 4) % 2] if index % 4 == 3 else None
+            if pool:
+                workspace['attributes']['execution-mode'] = 'agent'
+                workspace['relationships'] = {'agent-pool': {'data': {'type': 'agent-pools', 'id': pool}}}
+
+            created = now - runs_per_workspace * 3600
+            for _ in range(runs_per_workspace):
+                queue = rng.expovariate(1 / (90 if pool == pools[1] else 15))
+                plan = rng.lognormvariate(3.5, 0.5)
+                outcome = rng.choices(['applied', 'planned_and_finished', 'errored'], [0.7, 0.2, 0.1])[0]
+
+                timestamps = {'plan-queued-at': created, 'planning-at': created + queue}
+                if outcome == 'errored':
+                    timestamps['errored-at'] = timestamps['planning-at'] + plan
+                else:
+                    timestamps['planned-at'] = timestamps['planning-at'] + plan
+                if outcome == 'applied':
+                    timestamps['apply-queued-at'] = timestamps['planned-at'] + rng.uniform(5, 600)
+                    timestamps['applying-at'] = timestamps['apply-queued-at'] + rng.expovariate(1 / 10)
+                    timestamps['applied-at'] = timestamps['applying-at'] + rng.lognormvariate(4, 0.6)
+
+                state.add_run(workspace['id'], 'Seeded run', confirmed=outcome == 'applied',
+                              final_status=outcome, timestamps=timestamps)
+                created += rng.uniform(600, 2 * 3600)
+
+
+@contextlib.contextmanager
+def fake_tfc_api(port: int = 0, latency: float = 0.0, rate_limit: float = 0.0,
+                 workspaces: int = 0, run_step: float = RUN_STEP_SECONDS, runs: int = 0) -> Iterator[FakeTFCServer]:
+    """
+    Run the fake API in a background thread for the duration of the context.
+
+    Args:
+        port: Port to listen on (a free port is picked when 0)
+        latency: Seconds added to every response
+        rate_limit: Requests per second before 429s (0 for unlimited)
+        workspaces: Number of workspaces to seed
+        run_step: Seconds a run spends in each status
+        runs: Finished runs to seed per workspace
+
+    Yields:
+        The running server; see .url, .stats and .environment()
+    """
+    server = FakeTFCServer(port, latency, rate_limit, state=FakeState(run_step=run_step))
+    seed_workspaces(server.state, workspaces)
+    seed_run_history(server.state, runs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Run a local HCP Terraform API stand-in')
+    parser.add_argument('--port', type=int, default=8800, help='Port to listen on')
+    parser.add_argument('--workspaces', type=int, default=25, help='Workspaces to seed')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--rate-limit', type=float, default=30.0, help='Requests per second (0 for unlimited)')
+    parser.add_argument('--run-step', type=float, default=RUN_STEP_SECONDS, help='Seconds per run status')
+    parser.add_argument('--runs', type=int, default=0, help='Finished runs to seed per workspace')
+
+    args = parser.parse_args()
+
+    with fake_tfc_api(args.port, args.latency, args.rate_limit, args.workspaces, args.run_step,
+                      args.runs) as server:
+        print(f"🧪 Fake HCP Terraform API on {server.url} ({args.workspaces} workspaces)")
+        for name, value in server.environment().items():
+            print(f"   export {name}={value}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\n📊 {server.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,7 +14,7 @@ NC='\033[0m' # No Color
 # Configuration
 TFC_TOKEN="${TFC_TOKEN}"
 TFC_ORG="${TFC_ORG:-my-organization}"
-BASE_URL="https://app.terraform.io/api/v2"
+BASE_URL="${TFC_ADDRESS:-https://app.terraform.io/api/v2}"
 
 # Check if token is set
 if [ -z "$TFC_TOKEN" ]; then
@@ -53,16 +53,30 @@ fi
 echo -e "${GREEN}✅ Workspace ID: $WORKSPACE_ID${NC}"
 echo ""
 
-# List existing variables
-list_variables() {
-    echo -e "${YELLOW}📋 Listing existing variables...${NC}"
-    
+# Fetch the workspace's variables once; lookups below reuse this copy
+load_variables() {
     VARS=$(curl -s \
         --header "Authorization: Bearer $TFC_TOKEN" \
         --header "Content-Type: application/vnd.api+json" \
         "$BASE_URL/workspaces/$WORKSPACE_ID/vars")
+}
+
+# Look up a variable ID by key and category in the loaded variables
+find_variable_id() {
+    local key="$1"
+    local category="${2:-terraform}"
+    
+    echo "$VARS" | jq -r --arg key "$key" --arg category "$category" \
+        '.data[] | select(.attributes.key == $key and .attributes.category == $category) | .id'
+}
+
+# List existing variables
+list_variables() {
+    echo -e "${YELLOW}📋 Listing existing variables...${NC}"
+    
+    load_variables
     
-    echo "$VARS" | jq -r '.data[] | "   - \(.attributes.key) = \(if .attributes.sensitive then \"***\" else .attributes.value end) (\(.attributes.category))"'
+    echo "$VARS" | jq -r '.data[] | "   - \(.attributes.key) = \(if .attributes.sensitive then "***" else .attributes.value end) (\(.attributes.category))"'
     echo ""
 }
 
@@ -75,11 +89,7 @@ set_variable() {
     local description="${5:-}"
     
     # Check if variable exists
-    existing_var=$(curl -s \
-        --header "Authorization: Bearer $TFC_TOKEN" \
-        --header "Content-Type: application/vnd.api+json" \
-        "$BASE_URL/workspaces/$WORKSPACE_ID/vars" \
-        | jq -r ".data[] | select(.attributes.key == \"$key\") | .id")
+    existing_var=$(find_variable_id "$key" "$category")
     
     if [ -n "$existing_var" ] && [ "$existing_var" != "null" ]; then
         # Update existing variable
@@ -147,13 +157,10 @@ EOF
 # Delete variable
 delete_variable() {
     local key="$1"
+    local category="${2:-terraform}"
     
     # Get variable ID
-    var_id=$(curl -s \
-        --header "Authorization: Bearer $TFC_TOKEN" \
-        --header "Content-Type: application/vnd.api+json" \
-        "$BASE_URL/workspaces/$WORKSPACE_ID/vars" \
-        | jq -r ".data[] | select(.attributes.key == \"$key\") | .id")
+    var_id=$(find_variable_id "$key" "$category")
     
     if [ -z "$var_id" ] || [ "$var_id" == "null" ]; then
         echo -e "${RED}❌ Variable not found: $key${NC}"
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform Workspace Provisioning
+Creates or updates workspaces from a manifest, with their attributes, VCS
+settings, tags, variables and run triggers. Idempotent: a re-run only
+changes what drifted
+
+Manifest (JSON, or YAML with PyYAML installed):
+    defaults:                      # attributes for every workspace
+      terraform-version: 1.6.6
+      execution-mode: remote
+    workspaces:
+      bu-a-network:
+        attributes: {auto-apply: true, working-directory: network}
+        vcs-repo: {identifier: acme/bu-a, oauth-token-id: ot-abc123, branch: main}
+        tags: [bu-a, network]
+        variables:
+          terraform: {region: us-east-1}
+          env: {AWS_ROLE_ARN: {value_from_env: BU_A_ROLE, sensitive: true}}
+      bu-a-app:
+        tags: [bu-a]
+        run-triggers: [bu-a-network]     # source workspaces
+
+Usage:
+    ./provision.py manifest.yaml --dry-run
+    ./provision.py manifest.yaml --prune --workers 16
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from sync_variables import (SYNC_WORKERS, apply_change as apply_variable_change, load_document,
+                            normalize_variables, plan_changes as plan_variable_changes, read_target,
+                            unverified_sensitive)
+from tfc_client import get_client
+from workspace_manager import ORG_NAME, iter_workspaces
+
+MANIFEST_KEYS = ['attributes', 'vcs-repo', 'tags', 'variables', 'run-triggers']
+
+SYMBOLS = {'create': '+', 'update': '~', 'replace': '±', 'delete': '-'}
+
+
+def load_manifest(path: str) -> Dict[str, Dict]:
+    """
+    Load and validate a provisioning manifest.
+
+    Returns:
+        Workspace name -> {'attributes', 'tags', 'variables', 'run-triggers'},
+        with defaults merged into the attributes
+    """
+    document = load_document(path)
+    defaults = document.get('defaults') or {}
+    manifest = {}
+
+    for name, spec in (document.get('workspaces') or {}).items():
+        spec = spec or {}
+        unknown = set(spec) - set(MANIFEST_KEYS)
+        if unknown:
+            raise SystemExit(f"❌ {name}: unknown keys {sorted(unknown)}")
+
+        attributes = {**defaults, **(spec.get('attributes') or {})}
+        if spec.get('vcs-repo'):
+            attributes['vcs-repo'] = spec['vcs-repo']
+
+        manifest[name] = {
+            'attributes': attributes,
+            'tags': sorted(set(spec.get('tags') or [])),
+            'variables': normalize_variables(name, spec.get('variables')),
+            'run-triggers': sorted(set(spec.get('run-triggers') or []))
+        }
+        if name in manifest[name]['run-triggers']:
+            raise SystemExit(f"❌ {name}: a workspace cannot trigger itself")
+
+    return manifest
+
+
+def attribute_drift(current: Dict, desired: Dict) -> Dict:
+    """Desired attributes that differ from the current ones; nested settings
+    such as vcs-repo only compare the keys the manifest sets"""
+    drift = {}
+    for name, value in desired.items():
+        actual = current.get(name)
+        if isinstance(value, dict):
+            if any((actual or {}).get(key) != item for key, item in value.items()):
+                drift[name] = value
+        elif actual != value:
+            drift[name] = value
+    return drift
+
+
+def record(result: Dict, kind: str, action: str, name: str, reason: str, error: Optional[str] = None,
+           dry_run: bool = False):
+    """Add a change to a workspace's result"""
+    status = 'planned' if dry_run else ('error' if error else 'success')
+    change = {'kind': kind, 'action': action, 'name': name, 'reason': reason, 'status': status}
+    if error:
+        change['error'] = error
+    result['changes'].append(change)
+
+
+def error_text(response) -> str:
+    return f"{response.status_code} - {response.text}"
+
+
+def ensure_workspace(result: Dict, spec: Dict, current: Optional[Dict], dry_run: bool) -> Optional[str]:
+    """
+    Create the workspace, or update its drifted attributes.
+
+    Returns:
+        Workspace ID, or None when it does not exist (yet)
+    """
+    client = get_client()
+    name = result['name']
+
+    if current is None:
+        if dry_run:
+            record(result, 'workspace', 'create', name, 'missing', dry_run=True)
+            return None
+        payload = {'data': {'type': 'workspaces', 'attributes': {'name': name, **spec['attributes']}}}
+        response = client.post(f'/organizations/{ORG_NAME}/workspaces', json=payload)
+        if response.status_code != 201:
+            record(result, 'workspace', 'create', name, 'missing', error_text(response))
+            return None
+        record(result, 'workspace', 'create', name, 'missing')
+        return response.json()['data']['id']
+
+    drift = attribute_drift(current['attributes'], spec['attributes'])
+    if drift:
+        reason = ', '.join(sorted(drift))
+        if dry_run:
+            record(result, 'workspace', 'update', name, reason, dry_run=True)
+            return current['id']
+        payload = {'data': {'type': 'workspaces', 'attributes': drift}}
+        response = client.patch(f"/workspaces/{current['id']}", json=payload)
+        client.invalidate(current['id'])
+        record(result, 'workspace', 'update', name, reason, None if response.status_code == 200 else error_text(response))
+    return current['id']
+
+
+def sync_tags(result: Dict, workspace_id: Optional[str], desired: List[str], current: List[str],
+              prune: bool, dry_run: bool):
+    """Add missing tags and, with prune, remove extra ones, one request each way"""
+    changes = [('create', sorted(set(desired) - set(current)), 'post')]
+    if prune:
+        changes.append(('delete', sorted(set(current) - set(desired)), 'delete'))
+
+    for action, names, method in changes:
+        if not names:
+            continue
+        if dry_run:
+            record(result, 'tags', action, ', '.join(names), 'tags', dry_run=True)
+            continue
+        payload = {'data': [{'type': 'tags', 'attributes': {'name': name}} for name in names]}
+        response = get_client().request(method.upper(), f'/workspaces/{workspace_id}/relationships/tags', json=payload)
+        record(result, 'tags', action, ', '.join(names), 'tags',
+               None if response.status_code in [200, 204] else error_text(response))
+
+
+def sync_run_triggers(result: Dict, workspace_id: Optional[str], sources: List[str], ids: Dict[str, str],
+                      prune: bool, dry_run: bool, created: bool):
+    """Create missing inbound run triggers and, with prune, delete extra ones"""
+    client = get_client()
+    current: Dict[str, str] = {}
+    if workspace_id and not created:
+        response = client.get(f'/workspaces/{workspace_id}/run-triggers',
+                              params={'filter[run-trigger][type]': 'inbound', 'page[size]': 100})
+        if response.status_code != 200:
+            record(result, 'run trigger', 'create', ', '.join(sources), 'listing', error_text(response))
+            return
+        current = {trigger['relationships']['sourceable']['data']['id']: trigger['id']
+                   for trigger in response.json()['data']}
+
+    names = {workspace_id: name for name, workspace_id in ids.items()}
+    for source in sources:
+        source_id = ids.get(source)
+        if source_id in current:
+            continue
+        if dry_run:
+            record(result, 'run trigger', 'create', f'{source} → {result["name"]}', 'missing', dry_run=True)
+            continue
+        if not source_id or not workspace_id:
+            record(result, 'run trigger', 'create', f'{source} → {result["name"]}', 'missing',
+                   'source or target workspace does not exist')
+            continue
+        payload = {'data': {'relationships': {'sourceable': {'data': {'id': source_id, 'type': 'workspaces'}}}}}
+        response = client.post(f'/workspaces/{workspace_id}/run-triggers', json=payload)
+        record(result, 'run trigger', 'create', f'{source} → {result["name"]}', 'missing',
+               None if response.status_code == 201 else error_text(response))
+
+    if not prune:
+        return
+    wanted = {ids.get(source) for source in sources}
+    for source_id, trigger_id in current.items():
+        if source_id in wanted:
+            continue
+        label = f'{names.get(source_id, source_id)} → {result["name"]}'
+        if dry_run:
+            record(result, 'run trigger', 'delete', label, 'not in manifest', dry_run=True)
+            continue
+        response = client.delete(f'/run-triggers/{trigger_id}')
+        record(result, 'run trigger', 'delete', label, 'not in manifest',
+               None if response.status_code == 204 else error_text(response))
+
+
+def sync_workspace_variables(result: Dict, workspace_id: Optional[str], desired: Dict,
+                             prune: bool, dry_run: bool, rewrite_sensitive: bool, created: bool):
+    """Diff and apply variables with the sync_variables engine"""
+    target = {'kind': 'workspace', 'name': result['name'], 'path': f'/workspaces/{workspace_id}/vars'}
+    if workspace_id and not created:
+        read_target(target)
+    else:
+        target['current'] = {}
+
+    if 'error' in target:
+        record(result, 'variables', 'update', result['name'], 'listing', target['error'])
+        return
+
+    if not rewrite_sensitive:
+        result['unverified'] = [f"{category}.{key}" for category, key in
+                                unverified_sensitive(target['current'], desired)]
+    for change in plan_variable_changes(target['current'], desired, prune, rewrite_sensitive):
+        name = f"{change['category']}.{change['key']}"
+        if dry_run:
+            record(result, 'variable', change['action'], name, change['reason'], dry_run=True)
+        else:
+            record(result, 'variable', change['action'], name, change['reason'],
+                   apply_variable_change(target['path'], change))
+
+
+def converge_workspace(result: Dict, spec: Dict, current: Optional[Dict], ids: Dict[str, str],
+                       prune: bool, dry_run: bool, rewrite_sensitive: bool):
+    """Bring an existing (or just created) workspace's tags, variables and run triggers in line"""
+    workspace_id = ids.get(result['name'])
+    # A workspace created in this run has nothing to read back
+    created = current is None
+    current_tags = (current or {}).get('attributes', {}).get('tag-names') or []
+    sync_tags(result, workspace_id, spec['tags'], current_tags, prune, dry_run)
+    if spec['variables'] or prune:
+        sync_workspace_variables(result, workspace_id, spec['variables'], prune, dry_run, rewrite_sensitive,
+                                 created)
+    if spec['run-triggers'] or prune:
+        sync_run_triggers(result, workspace_id, spec['run-triggers'], ids, prune, dry_run, created)
+
+
+def provision(manifest: Dict[str, Dict], prune: bool = False, dry_run: bool = False,
+              max_workers: int = SYNC_WORKERS, rewrite_sensitive: bool = False) -> List[Dict]:
+    """
+    Provision every workspace in the manifest.
+
+    Work runs in two stages on one thread pool. Workspaces are created or
+    updated first, all concurrently, since run triggers need their source
+    workspace to exist and variables need a workspace to live on. Then tags,
+    variables and run triggers of every workspace converge concurrently.
+    Workspaces missing from the manifest are never deleted.
+
+    Args:
+        manifest: Output of load_manifest()
+        prune: Remove tags, variables and run triggers the manifest omits
+        dry_run: Plan without changing anything
+        max_workers: Workspaces processed at once
+        rewrite_sensitive: Also rewrite existing sensitive variable values,
+            which cannot be compared (e.g. after rotating a secret)
+
+    Returns:
+        One result per workspace, with its changes and the sensitive
+        variables whose values were not compared
+    """
+    existing = {workspace['attributes']['name']: workspace for workspace in iter_workspaces()}
+    ids = {name: workspace['id'] for name, workspace in existing.items()}
+    results = {name: {'name': name, 'changes': [], 'unverified': []} for name in manifest}
+
+    unknown_sources = {source for spec in manifest.values() for source in spec['run-triggers']} - set(manifest) - set(ids)
+    if unknown_sources:
+        raise RuntimeError(f"run trigger sources not in the manifest or organization: {sorted(unknown_sources)}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Stage 1: the workspaces themselves
+        futures = {name: executor.submit(ensure_workspace, results[name], spec, existing.get(name), dry_run)
+                   for name, spec in manifest.items()}
+        for name, future in futures.items():
+            workspace_id = future.result()
+            if workspace_id:
+                ids[name] = workspace_id
+
+        # Stage 2: everything that hangs off a workspace
+        failed = {name for name, result in results.items()
+                  if any(change['status'] == 'error' for change in result['changes'])}
+        futures = [executor.submit(converge_workspace, results[name], manifest[name], existing.get(name),
+                                   ids, prune, dry_run, rewrite_sensitive)
+                   for name in manifest if name not in failed]
+        for future in futures:
+            future.result()
+
+    return list(results.values())
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Provision HCP Terraform workspaces from a manifest')
+    parser.add_argument('manifest', help='JSON or YAML manifest of workspaces')
+    parser.add_argument('--prune', action='store_true',
+                        help='Remove tags, variables and run triggers missing from the manifest')
+    parser.add_argument('--rewrite-sensitive', action='store_true',
+                        help='Rewrite existing sensitive variable values, which cannot be compared')
+    parser.add_argument('--workers', type=int, default=SYNC_WORKERS, help='Workspaces processed at once')
+    parser.add_argument('--output', help='Write per-workspace results to this JSON file')
+    parser.add_argument('--dry-run', action='store_true', help='Show the changes without applying them')
+
+    args = parser.parse_args()
+    manifest = load_manifest(args.manifest)
+
+    print("=" * 70)
+    print(f"HCP Terraform Provisioning ({len(manifest)} workspaces in {ORG_NAME})")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    try:
+        results = provision(manifest, args.prune, args.dry_run, args.workers, args.rewrite_sensitive)
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if not result['changes']:
+            continue
+        print(f"\n📝 {result['name']}")
+        for change in result['changes']:
+            marker = {'success': ' ✅', 'error': f" ❌ {change.get('error')}"}.get(change['status'], '')
+            print(f"   {SYMBOLS[change['action']]} {change['kind']} {change['name']} ({change['reason']}){marker}")
+
+    changes = [change for result in results for change in result['changes']]
+    failed = [change for change in changes if change['status'] == 'error']
+    unverified = sum(len(result['unverified']) for result in results)
+
+    if args.dry_run:
+        print(f"\n📋 {len(changes)} changes planned (dry run)")
+    elif not changes and unverified:
+        print(f"\n✅ Nothing to change ({elapsed:.1f}s)")
+    elif not changes:
+        print(f"\n✅ No drift: nothing to change ({elapsed:.1f}s)")
+    else:
+        print(f"\n✅ {len(changes) - len(failed)} applied, {len(failed)} failed in {elapsed:.1f}s")
+    if unverified:
+        print(f"⚠️  {unverified} sensitive values were not compared; use --rewrite-sensitive to rewrite them")
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform Run Analytics
+Queue wait, plan and apply duration percentiles per workspace or agent pool,
+computed from the full run history of many workspaces
+
+Run history is fetched concurrently and cached locally (TFC_RUN_HISTORY_FILE).
+Reruns are incremental: each workspace's run list is read newest first, and
+reading stops at the first run already in the cache. Runs still in progress
+are remembered and looked up again on the next rerun.
+
+Usage:
+    ./run_analytics.py
+    ./run_analytics.py --workspace prod-infrastructure --workspace prod-eu --since 30
+    ./run_analytics.py --group-by agent-pool --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from run_tracker import TERMINAL_STATUSES
+from tfc_client import get_client
+from workspace_manager import ORG_NAME, PAGE_WORKERS, iter_workspaces
+
+# Configuration
+HISTORY_FILE = os.environ.get('TFC_RUN_HISTORY_FILE', '.tfc-run-history.json')
+RUNS_PAGE_SIZE = 100  # API maximum
+PERCENTILES = [50, 90, 99]
+
+# Each metric is the time between two status timestamps
+METRICS = {
+    'queue': ('plan-queued-at', 'planning-at'),
+    'plan': ('planning-at', 'planned-at'),
+    'apply': ('applying-at', 'applied-at')
+}
+TIMESTAMP_KEYS = sorted({key for keys in METRICS.values() for key in keys})
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """ISO 8601 timestamp from the API to epoch seconds"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def run_row(run: Dict) -> List:
+    """Compact cache row: [id, status, created, *TIMESTAMP_KEYS]"""
+    attrs = run['attributes']
+    timestamps = attrs.get('status-timestamps') or {}
+    return [run['id'], attrs['status'], parse_timestamp(attrs.get('created-at'))] + \
+        [parse_timestamp(timestamps.get(key)) for key in TIMESTAMP_KEYS]
+
+
+def load_history(path: str) -> Dict:
+    """Load the run history cache, or start an empty one for this organization"""
+    source = f'{get_client().base_url}/organizations/{ORG_NAME}'
+    try:
+        with open(path) as history_file:
+            history = json.load(history_file)
+        if history.get('source') == source and history.get('columns') == TIMESTAMP_KEYS:
+            return history
+    except (OSError, ValueError):
+        pass
+    return {'source': source, 'columns': TIMESTAMP_KEYS, 'workspaces': {}}
+
+
+def save_history(history: Dict, path: str):
+    # Write then rename so an interrupted run never leaves a corrupt file
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as history_file:
+        json.dump(history, history_file)
+    os.replace(temp_path, path)
+
+
+def fetch_runs_page(workspace_id: str, page: int) -> Dict:
+    """Fetch one page of a workspace's runs, newest first, raising RuntimeError on an API error"""
+    response = get_client().get(
+        f'/workspaces/{workspace_id}/runs',
+        params={'page[size]': RUNS_PAGE_SIZE, 'page[number]': page}
+    )
+
+    if response.status_code != 200:
+        raise RuntimeError(f"{workspace_id}: {response.status_code} - {response.text}")
+
+    return response.json()
+
+
+def fetch_run(run_id: str) -> Optional[Dict]:
+    """Fetch one run, or None if it no longer exists, raising RuntimeError on an API error"""
+    response = get_client().get(f'/runs/{run_id}')
+
+    if response.status_code == 404:
+        return None
+    if response.status_code != 200:
+        raise RuntimeError(f"{run_id}: {response.status_code} - {response.text}")
+
+    return response.json()['data']
+
+
+def update_history(history: Dict, workspace_ids: List[str], max_workers: int = PAGE_WORKERS) -> int:
+    """
+    Add runs not yet in the history for every workspace.
+
+    First pages of all workspaces are fetched concurrently. A workspace with
+    nothing cached has the rest of its pages fetched concurrently too; one
+    with a cache is read page by page until a cached run shows up, which is
+    usually on the first page. Only finished runs are cached; the IDs of
+    runs still in progress are kept in the workspace's 'pending' list, and
+    those not reached by paging on a later update are fetched one by one.
+
+    Returns:
+        Number of runs added
+    """
+    entries = {workspace_id: history['workspaces'].setdefault(workspace_id, {'runs': []})
+               for workspace_id in workspace_ids}
+    known = {workspace_id: {row[0] for row in entry['runs']} for workspace_id, entry in entries.items()}
+    new_runs: Dict[str, Dict[str, List]] = {workspace_id: {} for workspace_id in workspace_ids}
+    in_progress: Dict[str, set] = {workspace_id: set() for workspace_id in workspace_ids}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(fetch_runs_page, workspace_id, 1): (workspace_id, 1)
+                   for workspace_id in workspace_ids}
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                workspace_id, page = pending.pop(future)
+                data = future.result()
+
+                reached_cache = False
+                for run in data['data']:
+                    if run['id'] in known[workspace_id]:
+                        reached_cache = True
+                    elif run['attributes']['status'] in TERMINAL_STATUSES:
+                        new_runs[workspace_id][run['id']] = run_row(run)
+                    else:
+                        in_progress[workspace_id].add(run['id'])
+
+                total_pages = data.get('meta', {}).get('pagination', {}).get('total-pages')
+                has_next = page < total_pages if total_pages else bool(data.get('links', {}).get('next'))
+                if reached_cache or not has_next:
+                    continue
+
+                if page == 1 and total_pages and not known[workspace_id]:
+                    next_pages = range(2, total_pages + 1)
+                elif total_pages and not known[workspace_id]:
+                    # Already requested with the first page
+                    next_pages = range(0)
+                else:
+                    next_pages = range(page + 1, page + 2)
+                for next_page in next_pages:
+                    pending[executor.submit(fetch_runs_page, workspace_id, next_page)] = (workspace_id, next_page)
+
+        # Runs in progress last time that paging stopped before
+        unresolved = {
+            executor.submit(fetch_run, run_id): workspace_id
+            for workspace_id, entry in entries.items()
+            for run_id in entry.get('pending', [])
+            if run_id not in new_runs[workspace_id] and run_id not in in_progress[workspace_id]
+        }
+        for future, workspace_id in unresolved.items():
+            run = future.result()
+            if not run:
+                continue
+            if run['attributes']['status'] in TERMINAL_STATUSES:
+                new_runs[workspace_id][run['id']] = run_row(run)
+            else:
+                in_progress[workspace_id].add(run['id'])
+
+    for workspace_id, runs in new_runs.items():
+        # Newest first, like the API; runs resolved by ID may be older than cached ones
+        entries[workspace_id]['runs'] = sorted(list(runs.values()) + entries[workspace_id]['runs'],
+                                               key=lambda row: row[2] or 0, reverse=True)
+        entries[workspace_id]['pending'] = sorted(in_progress[workspace_id])
+    return sum(len(runs) for runs in new_runs.values())
+
+
+def group_percentiles(values: np.ndarray, groups: np.ndarray, group_count: int,
+                      percentiles: List[float] = PERCENTILES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Percentiles of values per group, without a Python loop over groups.
+
+    Values are sorted by (group, value) once; each group's percentiles are
+    then read at interpolated offsets into its slice of the sorted array
+    (linear interpolation, as numpy.percentile). NaN values are ignored.
+
+    Args:
+        values: One value per run (NaN when the run has none)
+        groups: Group index of each run
+        group_count: Number of groups
+        percentiles: Percentiles to compute (0-100)
+
+    Returns:
+        (counts per group, array of shape [group_count, len(percentiles)],
+        NaN for groups without values)
+    """
+    valid = ~np.isnan(values)
+    values, groups = values[valid], groups[valid]
+    order = np.lexsort((values, groups))
+    values, groups = values[order], groups[order]
+
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    result = np.full((group_count, len(percentiles)), np.nan)
+    has_values = counts > 0
+    if not has_values.any():
+        return counts, result
+
+    positions = starts[has_values, None] + (counts[has_values, None] - 1) * (np.asarray(percentiles) / 100.0)
+    lower = np.floor(positions).astype(int)
+    upper = np.ceil(positions).astype(int)
+    result[has_values] = values[lower] + (values[upper] - values[lower]) * (positions - lower)
+    return counts, result
+
+
+def analyze(history: Dict, workspaces: List[Dict], group_by: str = 'workspace',
+            since_days: Optional[float] = None) -> List[Dict]:
+    """
+    Compute duration percentiles per group.
+
+    Args:
+        history: Run history (see update_history)
+        workspaces: Workspaces to include, as returned by the API
+        group_by: 'workspace' or 'agent-pool' (agent pool ID, or the
+            execution mode for workspaces not on an agent pool)
+        since_days: Only runs created in the last N days
+
+    Returns:
+        One entry per group: name, runs and per-metric count and percentiles
+        in seconds
+    """
+    names, group_of = [], {}
+    for workspace in workspaces:
+        if group_by == 'agent-pool':
+            pool = (workspace.get('relationships', {}).get('agent-pool') or {}).get('data')
+            name = pool['id'] if pool else workspace['attributes'].get('execution-mode', 'remote')
+        else:
+            name = workspace['attributes']['name']
+        if name not in names:
+            names.append(name)
+        group_of[workspace['id']] = names.index(name)
+
+    rows, groups = [], []
+    for workspace_id, group in group_of.items():
+        runs = history['workspaces'].get(workspace_id, {}).get('runs', [])
+        rows.extend(row[2:] for row in runs)
+        groups.extend([group] * len(runs))
+
+    # Columns: created, then TIMESTAMP_KEYS; missing timestamps become NaN
+    table = np.array(rows, dtype=float).reshape(len(rows), 1 + len(TIMESTAMP_KEYS))
+    groups = np.array(groups, dtype=int)
+    if since_days is not None:
+        recent = table[:, 0] >= time.time() - since_days * 86400
+        table, groups = table[recent], groups[recent]
+
+    column = {key: index + 1 for index, key in enumerate(TIMESTAMP_KEYS)}
+    run_counts = np.bincount(groups, minlength=len(names))
+    results = [{'name': name, 'runs': int(run_counts[index]), 'metrics': {}} for index, name in enumerate(names)]
+
+    for metric, (start_key, end_key) in METRICS.items():
+        durations = table[:, column[end_key]] - table[:, column[start_key]]
+        counts, values = group_percentiles(durations, groups, len(names))
+        for index, result in enumerate(results):
+            result['metrics'][metric] = {'count': int(counts[index])}
+            result['metrics'][metric].update({
+                f'p{percentile}': None if np.isnan(value) else round(float(value), 1)
+                for percentile, value in zip(PERCENTILES, values[index])
+            })
+
+    return results
+
+
+def format_seconds(value: Optional[float]) -> str:
+    if value is None:
+        return '-'
+    return f'{value:.0f}s' if value < 120 else f'{value / 60:.1f}m'
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Run duration percentiles per workspace or agent pool')
+    parser.add_argument('--workspace', action='append', default=[], help='Workspace to include (repeatable; default all)')
+    parser.add_argument('--group-by', choices=['workspace', 'agent-pool'], default='workspace')
+    parser.add_argument('--since', type=float, help='Only runs created in the last N days')
+    parser.add_argument('--sort', choices=list(METRICS), default='queue', help='Rank groups by this metric\'s p90')
+    parser.add_argument('--top', type=int, default=20, help='Groups to show')
+    parser.add_argument('--workers', type=int, default=PAGE_WORKERS, help='Pages fetched at once')
+    parser.add_argument('--history-file', default=HISTORY_FILE, help='Run history cache')
+    parser.add_argument('--offline', action='store_true', help='Use the cached history only')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    args = parser.parse_args()
+    log = sys.stderr if args.json else sys.stdout
+
+    try:
+        workspaces = list(iter_workspaces())
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if args.workspace:
+        missing = set(args.workspace) - {workspace['attributes']['name'] for workspace in workspaces}
+        if missing:
+            print(f"❌ Workspaces not found: {', '.join(sorted(missing))}")
+            sys.exit(1)
+        workspaces = [workspace for workspace in workspaces if workspace['attributes']['name'] in args.workspace]
+
+    history = load_history(args.history_file)
+    if not args.offline:
+        start = time.perf_counter()
+        try:
+            added = update_history(history, [workspace['id'] for workspace in workspaces], args.workers)
+        except RuntimeError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        save_history(history, args.history_file)
+        print(f"📥 {added} new runs from {len(workspaces)} workspaces in {time.perf_counter() - start:.1f}s",
+              file=log)
+
+    results = analyze(history, workspaces, args.group_by, args.since)
+    results.sort(key=lambda result: result['metrics'][args.sort]['p90'] or -1, reverse=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 94)
+    print(f"Run durations by {args.group_by} (p50 / p90 / p99), slowest {args.sort} p90 first")
+    print("=" * 94)
+    print(f"{'Name':<34}{'Runs':>6}  " + ''.join(f"{metric.capitalize():<18}" for metric in METRICS))
+    for result in results[:args.top]:
+        cells = [' / '.join(format_seconds(result['metrics'][metric][f'p{percentile}'])
+                            for percentile in PERCENTILES) for metric in METRICS]
+        print(f"{result['name'][:33]:<34}{result['runs']:>6}  " + ''.join(f"{cell:<18}" for cell in cells))
+
+
+if __name__ == '__main__':
+    main()
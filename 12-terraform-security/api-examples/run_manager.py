@@ -2,39 +2,47 @@
 """
 HCP Terraform Run Manager
 Demonstrates run management via HCP Terraform API
+
+Usage:
+    ./run_manager.py                                  # interactive demo
+    ./run_manager.py --tail run-abc123 run-def456     # stream plan/apply logs
 """
 
-import requests
+import argparse
 import json
 import os
 import sys
+import threading
 import time
-from typing import Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+from run_tracker import TERMINAL_STATUSES, RunTracker
+from tfc_cache import WORKSPACE_ID_TTL
+from tfc_client import get_client
 
 # Configuration
-API_TOKEN = os.environ.get('TFC_TOKEN')
 ORG_NAME = os.environ.get('TFC_ORG', 'my-organization')
-BASE_URL = 'https://app.terraform.io/api/v2'
 
-if not API_TOKEN:
-    print("❌ Error: TFC_TOKEN environment variable not set")
-    sys.exit(1)
+# Plan and apply logs are framed by STX and, once complete, ETX
+LOG_START = b'\x02'
+LOG_END = b'\x03'
+LOG_CHUNK_SIZE = 8192
 
-headers = {
-    'Authorization': f'Bearer {API_TOKEN}',
-    'Content-Type': 'application/vnd.api+json'
-}
+# Seconds between reads of a log that has not grown: start fast, back off
+LOG_MIN_INTERVAL = 0.5
+LOG_MAX_INTERVAL = 5.0
+
+PHASE_DONE_STATUSES = ['finished', 'errored', 'canceled', 'unreachable']
+APPLY_STATUSES = ['confirmed', 'apply_queued', 'applying', 'applied']
 
 
 def get_workspace_id(workspace_name: str) -> Optional[str]:
-    """Get workspace ID by name"""
-    response = requests.get(
-        f'{BASE_URL}/organizations/{ORG_NAME}/workspaces/{workspace_name}',
-        headers=headers
-    )
+    """Get workspace ID by name, served from the cache when known"""
+    body = get_client().cached_get(f'/organizations/{ORG_NAME}/workspaces/{workspace_name}', WORKSPACE_ID_TTL)
     
-    if response.status_code == 200:
-        return response.json()['data']['id']
+    if body:
+        return body['data']['id']
     else:
         print(f"❌ Workspace not found: {workspace_name}")
         return None
@@ -65,9 +73,8 @@ def create_run(workspace_id: str, message: str = 'Triggered via API',
         }
     }
     
-    response = requests.post(
-        f'{BASE_URL}/runs',
-        headers=headers,
+    response = get_client().post(
+        '/runs',
         json=payload
     )
     
@@ -85,10 +92,7 @@ def create_run(workspace_id: str, message: str = 'Triggered via API',
 
 def get_run_status(run_id: str) -> Optional[Dict]:
     """Get run status and details"""
-    response = requests.get(
-        f'{BASE_URL}/runs/{run_id}',
-        headers=headers
-    )
+    response = get_client().get(f'/runs/{run_id}')
     
     if response.status_code == 200:
         return response.json()['data']
@@ -103,9 +107,8 @@ def apply_run(run_id: str, comment: str = 'Approved via API') -> bool:
     
     payload = {'comment': comment}
     
-    response = requests.post(
-        f'{BASE_URL}/runs/{run_id}/actions/apply',
-        headers=headers,
+    response = get_client().post(
+        f'/runs/{run_id}/actions/apply',
         json=payload
     )
     
@@ -124,9 +127,8 @@ def cancel_run(run_id: str, comment: str = 'Canceled via API') -> bool:
     
     payload = {'comment': comment}
     
-    response = requests.post(
-        f'{BASE_URL}/runs/{run_id}/actions/cancel',
-        headers=headers,
+    response = get_client().post(
+        f'/runs/{run_id}/actions/cancel',
         json=payload
     )
     
@@ -139,36 +141,190 @@ def cancel_run(run_id: str, comment: str = 'Canceled via API') -> bool:
 
 
 def wait_for_run(run_id: str, timeout: int = 600) -> str:
-    """Wait for run to complete"""
+    """Wait for run to complete or to need confirmation"""
     print(f"\n⏳ Waiting for run to complete (timeout: {timeout}s)...")
     
-    start_time = time.time()
-    terminal_statuses = ['applied', 'errored', 'canceled', 'discarded', 'planned_and_finished']
+    tracker = RunTracker(on_change=lambda run: print(f"   Status: {run.status}"))
+    tracker.track(run_id)
+    status = tracker.wait(timeout)[run_id]
     
-    while time.time() - start_time < timeout:
+    if status == 'timeout':
+        print(f"⚠️  Timeout reached")
+    return status
+
+
+class LogWriter:
+    """
+    Writes log output to a binary stream as it arrives. With a prefix, output
+    goes out a whole line at a time so concurrent tails never interleave
+    mid-line.
+    """
+
+    def __init__(self, stream: BinaryIO, prefix: str = '', lock: Optional[threading.Lock] = None):
+        self.stream = stream
+        self.prefix = prefix.encode()
+        self.lock = lock or threading.Lock()
+        self.partial = b''
+
+    def write(self, data: bytes):
+        if self.prefix:
+            lines = (self.partial + data).split(b'\n')
+            self.partial = lines.pop()
+            data = b''.join(self.prefix + line + b'\n' for line in lines)
+        if data:
+            with self.lock:
+                self.stream.write(data)
+                self.stream.flush()
+
+    def close(self):
+        """Write out a final line that had no newline"""
+        if self.partial:
+            self.partial, data = b'', self.partial
+            self.write(data + b'\n')
+
+
+def get_phase(run_id: str, phase: str) -> Optional[Dict]:
+    """Get a run's plan or apply ('plan' / 'apply'), including its log-read-url"""
+    response = get_client().get(f'/runs/{run_id}/{phase}')
+    return response.json()['data']['attributes'] if response.status_code == 200 else None
+
+
+def read_log(url: str, offset: int, writer: LogWriter) -> Tuple[int, bool]:
+    """
+    Stream the part of a log past offset to writer.
+
+    Asks for the new bytes only with a Range request and writes them chunk
+    by chunk as they are received, so a log is never held in memory. A
+    server that ignores the range gets the already-written bytes skipped.
+
+    Returns:
+        The new offset, and whether the log's end marker was seen
+    """
+    client = get_client()
+    # Log URLs are pre-signed; the API token must not be sent with them
+    headers = {'Range': f'bytes={offset}-', 'Authorization': None}
+    complete = False
+
+    with client.session.get(url, headers=headers, stream=True, timeout=client.timeout) as response:
+        if response.status_code not in [200, 206]:
+            # 416: nothing new yet; 403/404: expired URL, refreshed by the caller
+            return offset, False
+
+        skip = offset if response.status_code == 200 else 0
+        for chunk in response.iter_content(LOG_CHUNK_SIZE):
+            if skip:
+                chunk, skip = chunk[skip:], max(0, skip - len(chunk))
+            offset += len(chunk)
+            complete = complete or LOG_END in chunk
+            writer.write(chunk.replace(LOG_START, b'').replace(LOG_END, b''))
+
+    return offset, complete
+
+
+def tail_phase(run_id: str, phase: str, writer: LogWriter, deadline: float) -> str:
+    """
+    Follow a plan or apply log until it is complete.
+
+    The log is re-read as soon as it grows; while it is idle, reads back off
+    from LOG_MIN_INTERVAL to LOG_MAX_INTERVAL and each idle round also
+    refreshes the phase status and log URL (which expires) from the API.
+
+    Returns:
+        Final phase status, or 'timeout'
+    """
+    offset, interval, url, status = 0, LOG_MIN_INTERVAL, None, 'pending'
+
+    while time.monotonic() < deadline:
+        if url:
+            previous = offset
+            offset, complete = read_log(url, offset, writer)
+            if complete:
+                if status not in PHASE_DONE_STATUSES:
+                    status = (get_phase(run_id, phase) or {}).get('status', status)
+                return status
+            if offset > previous:
+                interval = LOG_MIN_INTERVAL
+                continue
+
+        if status in PHASE_DONE_STATUSES:
+            # Done, and the remainder is read: the log had no end marker
+            return status
+
+        attrs = get_phase(run_id, phase)
+        if not attrs:
+            return 'errored'
+        status, url = attrs['status'], attrs.get('log-read-url')
+        if status not in PHASE_DONE_STATUSES:
+            time.sleep(interval)
+            interval = min(interval * 1.5, LOG_MAX_INTERVAL)
+
+    return 'timeout'
+
+
+def tail_run(run_id: str, writer: LogWriter, timeout: int = 600) -> str:
+    """
+    Stream a run's plan log, then its apply log if the run goes on to apply.
+
+    Stops once the run finishes or waits for confirmation.
+
+    Returns:
+        The run's status when tailing stopped, or 'timeout'
+    """
+    deadline = time.monotonic() + timeout
+    if tail_phase(run_id, 'plan', writer, deadline) == 'timeout':
+        return 'timeout'
+
+    interval = LOG_MIN_INTERVAL
+    while time.monotonic() < deadline:
         run = get_run_status(run_id)
         if not run:
-            return 'error'
-        
-        status = run['attributes']['status']
-        print(f"   Status: {status}")
-        
-        if status in terminal_statuses:
-            return status
-        
-        time.sleep(10)
-    
-    print(f"⚠️  Timeout reached")
+            return 'errored'
+        attrs = run['attributes']
+        if attrs['status'] in APPLY_STATUSES:
+            if tail_phase(run_id, 'apply', writer, deadline) == 'timeout':
+                return 'timeout'
+            run = get_run_status(run_id)
+            return run['attributes']['status'] if run else 'errored'
+        if attrs['status'] in TERMINAL_STATUSES or attrs.get('actions', {}).get('is-confirmable'):
+            return attrs['status']
+        # Policy checks or cost estimation between plan and apply
+        time.sleep(interval)
+        interval = min(interval * 1.5, LOG_MAX_INTERVAL)
+
     return 'timeout'
 
 
+def tail_runs(run_ids: Iterable[str], stream: BinaryIO, timeout: int = 600) -> Dict[str, str]:
+    """
+    Tail several runs at once, each line prefixed with its run ID.
+
+    Args:
+        run_ids: Runs to follow
+        stream: Binary stream to write to (e.g. sys.stdout.buffer or a file)
+        timeout: Seconds to follow them overall
+
+    Returns:
+        Mapping of run ID to the status when tailing stopped
+    """
+    run_ids = list(run_ids)
+    lock = threading.Lock()
+    writers = {run_id: LogWriter(stream, f'[{run_id}] ' if len(run_ids) > 1 else '', lock) for run_id in run_ids}
+
+    with ThreadPoolExecutor(max_workers=max(1, len(run_ids))) as executor:
+        futures = {run_id: executor.submit(tail_run, run_id, writers[run_id], timeout) for run_id in run_ids}
+        results = {run_id: future.result() for run_id, future in futures.items()}
+
+    for writer in writers.values():
+        writer.close()
+    return results
+
+
 def list_runs(workspace_id: str, limit: int = 10) -> list:
     """List recent runs for a workspace"""
     print(f"\n📋 Listing recent runs (limit: {limit})...")
     
-    response = requests.get(
-        f'{BASE_URL}/workspaces/{workspace_id}/runs',
-        headers=headers,
+    response = get_client().get(
+        f'/workspaces/{workspace_id}/runs',
         params={'page[size]': limit}
     )
     
@@ -188,6 +344,26 @@ def list_runs(workspace_id: str, limit: int = 10) -> list:
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='HCP Terraform run management demo')
+    parser.add_argument('--tail', nargs='+', metavar='RUN_ID', help='Stream the plan/apply logs of these runs')
+    parser.add_argument('--output', help='Write tailed logs to this file instead of stdout')
+    parser.add_argument('--timeout', type=int, default=600, help='Seconds to tail for')
+
+    args = parser.parse_args()
+
+    if args.tail:
+        if args.output:
+            with open(args.output, 'ab') as output_file:
+                results = tail_runs(args.tail, output_file, args.timeout)
+        else:
+            results = tail_runs(args.tail, sys.stdout.buffer, args.timeout)
+
+        for run_id, status in results.items():
+            print(f"📊 {run_id}: {status}", file=sys.stderr)
+        if any(status in ['errored', 'timeout', 'canceled', 'force_canceled'] for status in results.values()):
+            sys.exit(1)
+        return
+
     print("=" * 70)
     print("HCP Terraform Run Manager")
     print("=" * 70)
@@ -215,7 +391,10 @@ def main():
     )
     
     if run_id:
-        # Wait for plan to complete
+        # Stream the plan as it runs, then confirm where it stopped
+        print(f"\n📜 Plan output:")
+        sys.stdout.flush()
+        tail_run(run_id, LogWriter(sys.stdout.buffer), timeout=300)
         final_status = wait_for_run(run_id, timeout=300)
         print(f"\n📊 Final Status: {final_status}")
         
@@ -234,6 +413,9 @@ def main():
                 apply_choice = input("\nApply this run? (yes/no): ").strip().lower()
                 if apply_choice == 'yes':
                     apply_run(run_id, 'Applied via API demo')
+                    print(f"\n📜 Apply output:")
+                    sys.stdout.flush()
+                    tail_phase(run_id, 'apply', LogWriter(sys.stdout.buffer), time.monotonic() + 300)
                     wait_for_run(run_id, timeout=300)
     
     print("\n" + "=" * 70)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform Run Tracker
+Watches many runs at once with adaptive polling, batched status lookups and
+optional notification webhooks
+
+Usage:
+    ./run_tracker.py run-abc123 run-def456
+    ./run_tracker.py run-abc123 --webhook-port 8080 --timeout 1800
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional
+
+from tfc_client import get_client
+
+# Statuses after which a run never changes again
+TERMINAL_STATUSES = [
+    'applied', 'errored', 'canceled', 'force_canceled', 'discarded', 'planned_and_finished'
+]
+
+# Statuses where a run waits on capacity rather than doing work, so it is
+# polled at the slower MAX_QUEUED_INTERVAL
+QUEUED_STATUSES = ['pending', 'fetching', 'queuing', 'plan_queued', 'apply_queued', 'planning']
+
+# Polling intervals in seconds: start fast, back off while a status holds
+MIN_INTERVAL = float(os.environ.get('TFC_POLL_MIN_INTERVAL', '2'))
+MAX_ACTIVE_INTERVAL = float(os.environ.get('TFC_POLL_MAX_INTERVAL', '15'))
+MAX_QUEUED_INTERVAL = float(os.environ.get('TFC_POLL_MAX_QUEUED_INTERVAL', '30'))
+BACKOFF_FACTOR = 1.5
+
+# With webhooks feeding status changes, polling is only a safety net
+WEBHOOK_FALLBACK_INTERVAL = 60.0
+
+# Runs returned per page when listing a workspace's runs
+RUNS_PAGE_SIZE = 50
+
+
+class TrackedRun:
+    """Polling state of a single run"""
+
+    def __init__(self, run_id: str, workspace_id: Optional[str] = None):
+        self.run_id = run_id
+        self.workspace_id = workspace_id
+        self.status: Optional[str] = None
+        self.confirmable = False
+        self.interval = MIN_INTERVAL
+        self.next_check = 0.0
+        self.run: Optional[Dict] = None
+
+    @property
+    def done(self) -> bool:
+        # A plan waiting for confirmation will not progress on its own
+        return self.status in TERMINAL_STATUSES or self.confirmable
+
+    def observe(self, run: Dict, max_interval: float):
+        """Record a status lookup and schedule the next one"""
+        attrs = run['attributes']
+        status = attrs['status']
+
+        if status != self.status:
+            self.interval = MIN_INTERVAL
+        else:
+            ceiling = MAX_QUEUED_INTERVAL if status in QUEUED_STATUSES else MAX_ACTIVE_INTERVAL
+            self.interval = min(self.interval * BACKOFF_FACTOR, max(ceiling, max_interval))
+
+        self.status = status
+        self.confirmable = attrs.get('actions', {}).get('is-confirmable', False)
+        self.workspace_id = self.workspace_id or run.get('relationships', {}).get('workspace', {}).get('data', {}).get('id')
+        self.run = run
+        self.next_check = time.monotonic() + self.interval
+
+
+class RunTracker:
+    """Tracks runs until they finish or need confirmation"""
+
+    def __init__(self, on_change=None):
+        self.runs: Dict[str, TrackedRun] = {}
+        self.on_change = on_change
+        self.requests = 0
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.webhooks_enabled = False
+
+    def track(self, run_id: str, workspace_id: Optional[str] = None):
+        """Start tracking a run; the workspace ID enables batched lookups"""
+        with self.lock:
+            self.runs.setdefault(run_id, TrackedRun(run_id, workspace_id))
+
+    def pending(self) -> List[TrackedRun]:
+        return [run for run in self.runs.values() if not run.done]
+
+    def wait(self, timeout: int = 600) -> Dict[str, str]:
+        """
+        Wait for all tracked runs.
+
+        Args:
+            timeout: Seconds to wait overall
+
+        Returns:
+            Mapping of run ID to final status ('timeout' for runs still going)
+        """
+        deadline = time.monotonic() + timeout
+
+        while self.pending() and time.monotonic() < deadline:
+            now = time.monotonic()
+            due = [run for run in self.pending() if run.next_check <= now]
+            if due:
+                self.poll(due)
+                continue
+
+            next_check = min(run.next_check for run in self.pending())
+            self.wakeup.wait(max(0.0, min(next_check, deadline) - time.monotonic()))
+            self.wakeup.clear()
+
+        return {run_id: ('timeout' if not run.done else run.status) for run_id, run in self.runs.items()}
+
+    def poll(self, due: List[TrackedRun]):
+        """
+        Look up the status of due runs, batching by workspace.
+
+        A due run whose workspace has other pending runs is read, along
+        with all of them, from one list request; runs on their own (or not
+        found in the list) are read individually.
+        """
+        max_interval = WEBHOOK_FALLBACK_INTERVAL if self.webhooks_enabled else 0.0
+        due_workspaces = {run.workspace_id for run in due}
+        by_workspace: Dict[Optional[str], List[TrackedRun]] = {}
+        for run in self.pending():
+            if run in due or (run.workspace_id and run.workspace_id in due_workspaces):
+                by_workspace.setdefault(run.workspace_id, []).append(run)
+
+        individual = list(by_workspace.pop(None, []))
+        for workspace_id, runs in by_workspace.items():
+            if len(runs) < 2:
+                individual.extend(run for run in runs if run in due)
+                continue
+
+            listed = self.list_workspace_runs(workspace_id)
+            for run in runs:
+                if run.run_id in listed:
+                    self.record(run, listed[run.run_id], max_interval)
+                else:
+                    individual.append(run)
+
+        for run in individual:
+            data = self.get_run(run.run_id)
+            if data:
+                self.record(run, data, max_interval)
+            else:
+                # Unknown to the API: stop tracking it as errored
+                run.status = 'errored'
+
+    def record(self, run: TrackedRun, data: Dict, max_interval: float):
+        previous = run.status
+        run.observe(data, max_interval)
+        if run.status != previous and self.on_change:
+            self.on_change(run)
+
+    def get_run(self, run_id: str) -> Optional[Dict]:
+        self.requests += 1
+        response = get_client().get(f'/runs/{run_id}')
+        return response.json()['data'] if response.status_code == 200 else None
+
+    def list_workspace_runs(self, workspace_id: str) -> Dict[str, Dict]:
+        self.requests += 1
+        response = get_client().get(f'/workspaces/{workspace_id}/runs', params={'page[size]': RUNS_PAGE_SIZE})
+        if response.status_code != 200:
+            return {}
+        return {run['id']: run for run in response.json()['data']}
+
+    def handle_notification(self, payload: Dict):
+        """
+        Wake the polling loop for the run a notification webhook is about.
+
+        The payload is only a hint: the run's status is always read from
+        the API, so a forged or stale notification costs one extra lookup.
+        """
+        run = self.runs.get(payload.get('run_id'))
+        if not run:
+            return
+
+        with self.lock:
+            run.next_check = 0.0
+        self.wakeup.set()
+
+    def start_webhook_receiver(self, port: int, token: str = '') -> ThreadingHTTPServer:
+        """
+        Receive HCP Terraform notification webhooks on a local port.
+
+        Without a token, signatures cannot be checked, so the receiver only
+        listens on 127.0.0.1 (for a tunnel or local relay).
+
+        Args:
+            port: Port to listen on
+            token: Notification configuration token, used to verify the
+                X-TFE-Notification-Signature HMAC
+
+        Returns:
+            The running server (call shutdown() to stop it)
+        """
+        tracker = self
+
+        class NotificationHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if token:
+                    expected = hmac.new(token.encode(), body, hashlib.sha512).hexdigest()
+                    if not hmac.compare_digest(expected, self.headers.get('X-TFE-Notification-Signature', '')):
+                        self.send_response(401)
+                        self.end_headers()
+                        return
+
+                try:
+                    tracker.handle_notification(json.loads(body))
+                except ValueError:
+                    self.send_response(400)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('0.0.0.0' if token else '127.0.0.1', port), NotificationHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.webhooks_enabled = True
+        return server
+
+
+def wait_for_runs(run_ids: Iterable[str], timeout: int = 600, webhook_port: Optional[int] = None) -> Dict[str, str]:
+    """Wait for several runs, printing status changes as they happen"""
+    tracker = RunTracker(on_change=lambda run: print(f"   {run.run_id}: {run.status}"))
+    for run_id in run_ids:
+        tracker.track(run_id)
+
+    server = None
+    if webhook_port:
+        token = os.environ.get('TFC_NOTIFICATION_TOKEN', '')
+        server = tracker.start_webhook_receiver(webhook_port, token)
+        print(f"📡 Listening for notifications on port {webhook_port}")
+        if not token:
+            print("⚠️  TFC_NOTIFICATION_TOKEN is not set: signatures are not verified, listening on 127.0.0.1 only")
+
+    try:
+        results = tracker.wait(timeout)
+    finally:
+        if server:
+            server.shutdown()
+
+    print(f"📊 {tracker.requests} status requests for {len(results)} runs")
+    return results
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Wait for HCP Terraform runs')
+    parser.add_argument('run_ids', nargs='+', help='Run IDs to track')
+    parser.add_argument('--timeout', type=int, default=600, help='Seconds to wait')
+    parser.add_argument('--webhook-port', type=int, help='Receive notification webhooks on this port')
+
+    args = parser.parse_args()
+
+    print(f"\n⏳ Tracking {len(args.run_ids)} runs (timeout: {args.timeout}s)...")
+    results = wait_for_runs(args.run_ids, args.timeout, args.webhook_port)
+
+    for run_id, status in results.items():
+        print(f"   - {run_id}: {status}")
+
+    if any(status in ['errored', 'timeout', 'canceled', 'force_canceled'] for status in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
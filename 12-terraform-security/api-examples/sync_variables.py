@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform Variable Sync
+Declarative, bulk variable management: reads each workspace's and variable
+set's variables once, diffs them against a desired-state file and applies
+only the creates, updates and deletes, concurrently
+
+Desired state (JSON, or YAML with PyYAML installed):
+    workspaces:
+      prod-infrastructure:
+        terraform:
+          region: us-east-1
+          allowed_cidrs: ["10.0.0.0/8"]           # lists and maps become HCL
+          db_password: {value_from_env: PROD_DB_PASSWORD, sensitive: true}
+        env:
+          TF_LOG: ""
+    variable_sets:
+      shared-aws:
+        env:
+          AWS_DEFAULT_REGION: {value: us-east-1, description: Provider region}
+
+A .tfvars file sets Terraform variables on every workspace given with
+--workspace.
+
+Usage:
+    ./sync_variables.py variables.yaml --dry-run
+    ./sync_variables.py variables.json --prune
+    ./sync_variables.py prod.tfvars --workspace prod-us --workspace prod-eu
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from tfc_cache import WORKSPACE_ID_TTL
+from tfc_client import get_client
+
+try:
+    import yaml
+except ImportError:  # Only needed for YAML desired-state files
+    yaml = None
+
+# Configuration
+ORG_NAME = os.environ.get('TFC_ORG', 'my-organization')
+SYNC_WORKERS = int(os.environ.get('TFC_SYNC_WORKERS', '8'))
+PAGE_SIZE = 100
+
+CATEGORIES = ['terraform', 'env']
+
+# Attributes compared to detect drift; values of sensitive variables are
+# write-only, so those are never compared
+COMPARED_ATTRIBUTES = ['value', 'hcl', 'description']
+
+# (category, key) identifies a variable within a workspace or variable set
+VarKey = Tuple[str, str]
+
+
+def normalize_variable(key: str, category: str, spec: Any) -> Dict:
+    """
+    Turn a desired-state entry into API attributes.
+
+    Args:
+        key: Variable name
+        category: 'terraform' or 'env'
+        spec: A scalar, list or map value, or a dict with value (or
+            value_from_env) and optional sensitive, description and hcl
+
+    Returns:
+        Attributes for the vars API
+    """
+    if not (isinstance(spec, dict) and ({'value', 'value_from_env'} & spec.keys())):
+        spec = {'value': spec}
+
+    if 'value_from_env' in spec:
+        if spec['value_from_env'] not in os.environ:
+            raise SystemExit(f"❌ {category}.{key}: environment variable {spec['value_from_env']} not set")
+        value = os.environ[spec['value_from_env']]
+    else:
+        value = spec['value']
+
+    hcl = spec.get('hcl', False)
+    if isinstance(value, (list, dict)):
+        # JSON lists and objects are valid HCL expressions
+        value, hcl = json.dumps(value), True
+    elif isinstance(value, bool):
+        value = 'true' if value else 'false'
+    elif value is None:
+        value = ''
+
+    return {
+        'key': key,
+        'value': str(value),
+        'category': category,
+        'hcl': bool(hcl) and category == 'terraform',
+        'sensitive': bool(spec.get('sensitive', False)),
+        'description': spec.get('description', '')
+    }
+
+
+def parse_tfvars(path: str) -> Dict[str, Dict]:
+    """
+    Parse a .tfvars file of `key = value` assignments.
+
+    Quoted strings and bare numbers/booleans become plain values; lists,
+    maps and other expressions (which may span lines) are kept as HCL.
+    """
+    variables: Dict[str, Dict] = {}
+    pending_key, pending_lines, depth = None, [], 0
+
+    with open(path) as tfvars_file:
+        for line in tfvars_file:
+            stripped = line.strip()
+            if pending_key:
+                pending_lines.append(line.rstrip('\n'))
+                depth += stripped.count('[') + stripped.count('{') - stripped.count(']') - stripped.count('}')
+                if depth <= 0:
+                    variables[pending_key] = {'value': '\n'.join(pending_lines), 'hcl': True}
+                    pending_key, pending_lines = None, []
+                continue
+
+            if not stripped or stripped.startswith(('#', '//')):
+                continue
+
+            match = re.match(r'^([A-Za-z_][\w-]*)\s*=\s*(.+)$', stripped)
+            if not match:
+                raise SystemExit(f"❌ Cannot parse {path}: {stripped}")
+
+            key, value = match.groups()
+            depth = value.count('[') + value.count('{') - value.count(']') - value.count('}')
+            if depth > 0:
+                pending_key, pending_lines = key, [value]
+            elif re.fullmatch(r'"(?:[^"\\]|\\.)*"', value):
+                variables[key] = {'value': json.loads(value)}
+            elif re.fullmatch(r'true|false|-?\d+(\.\d+)?', value):
+                variables[key] = {'value': value}
+            else:
+                variables[key] = {'value': value, 'hcl': True}
+
+    if pending_key:
+        raise SystemExit(f"❌ Cannot parse {path}: unterminated value for {pending_key}")
+
+    return variables
+
+
+def load_desired_state(path: str, workspaces: List[str]) -> Dict[str, Dict[str, Dict[VarKey, Dict]]]:
+    """
+    Load the desired variables from a JSON, YAML or .tfvars file.
+
+    Args:
+        path: Desired-state file
+        workspaces: Workspaces a .tfvars file applies to
+
+    Returns:
+        {'workspaces': {name: {(category, key): attributes}},
+         'variable_sets': {name: {(category, key): attributes}}}
+    """
+    if path.endswith('.tfvars'):
+        if not workspaces:
+            raise SystemExit("❌ A .tfvars file needs at least one --workspace")
+        variables = parse_tfvars(path)
+        document = {'workspaces': {name: {'terraform': variables} for name in workspaces}}
+    else:
+        document = load_document(path)
+
+    return {
+        kind: {owner: normalize_variables(owner, categories) for owner, categories in (document.get(kind) or {}).items()}
+        for kind in ['workspaces', 'variable_sets']
+    }
+
+
+def load_document(path: str) -> Dict:
+    """Load a JSON or YAML file"""
+    with open(path) as document_file:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise SystemExit("❌ YAML files need PyYAML: pip install pyyaml")
+            return yaml.safe_load(document_file) or {}
+        return json.load(document_file)
+
+
+def normalize_variables(owner: str, categories: Optional[Dict]) -> Dict[VarKey, Dict]:
+    """Index one owner's {category: {key: spec}} entries by (category, key)"""
+    categories = categories or {}
+    unknown = set(categories) - set(CATEGORIES)
+    if unknown:
+        raise SystemExit(f"❌ {owner}: unknown variable categories {sorted(unknown)}")
+    return {
+        (category, key): normalize_variable(key, category, spec)
+        for category in CATEGORIES
+        for key, spec in (categories.get(category) or {}).items()
+    }
+
+
+def find_variable_sets() -> Dict[str, str]:
+    """Map variable set names to IDs across all pages"""
+    varsets, page = {}, 1
+    while True:
+        response = get_client().get(f'/organizations/{ORG_NAME}/varsets',
+                                    params={'page[size]': PAGE_SIZE, 'page[number]': page})
+        if response.status_code != 200:
+            raise RuntimeError(f"listing variable sets: {response.status_code} - {response.text}")
+
+        data = response.json()
+        varsets.update({varset['attributes']['name']: varset['id'] for varset in data['data']})
+        if 'next' not in data.get('links', {}) or not data['links']['next']:
+            return varsets
+        page += 1
+
+
+def create_variable_set(name: str) -> str:
+    """Create an empty, non-global variable set and return its ID"""
+    payload = {'data': {'type': 'varsets', 'attributes': {'name': name, 'global': False}}}
+    response = get_client().post(f'/organizations/{ORG_NAME}/varsets', json=payload)
+    if response.status_code != 201:
+        raise RuntimeError(f"creating variable set {name}: {response.status_code} - {response.text}")
+    return response.json()['data']['id']
+
+
+def read_target(target: Dict) -> Dict:
+    """
+    Resolve a workspace or variable set and index its variables.
+
+    Fills in target['path'] (the vars endpoint) and target['current'], a
+    (category, key) -> variable index, from a single list request. A
+    target that already has a path is not looked up again.
+    """
+    if target.get('path'):
+        pass
+    elif target['kind'] == 'workspace':
+        body = get_client().cached_get(f"/organizations/{ORG_NAME}/workspaces/{target['name']}", WORKSPACE_ID_TTL)
+        if not body:
+            target['error'] = 'workspace not found'
+            return target
+        target['path'] = f"/workspaces/{body['data']['id']}/vars"
+    elif target.get('id'):
+        target['path'] = f"/varsets/{target['id']}/relationships/vars"
+    else:
+        # Variable set still to be created: everything in it is new
+        target['current'] = {}
+        return target
+
+    response = get_client().get(target['path'])
+    if response.status_code != 200:
+        target['error'] = f"{response.status_code} - {response.text}"
+        return target
+
+    target['current'] = {
+        (var['attributes']['category'], var['attributes']['key']): var
+        for var in response.json()['data']
+    }
+    return target
+
+
+def plan_changes(current: Dict[VarKey, Dict], desired: Dict[VarKey, Dict], prune: bool = False,
+                 rewrite_sensitive: bool = False) -> List[Dict]:
+    """
+    Diff current variables against the desired ones.
+
+    Args:
+        current: (category, key) -> variable as returned by the API
+        desired: (category, key) -> desired attributes
+        prune: Delete variables that are not in the desired state
+        rewrite_sensitive: Also rewrite existing sensitive values, which
+            cannot be read back to compare; by default only their
+            description and HCL flag are checked
+
+    Returns:
+        Changes with action (create, update, replace or delete), key,
+        category, var_id, attributes and the reason for the change
+    """
+    changes = []
+    for var_key, attributes in sorted(desired.items()):
+        existing = current.get(var_key)
+        change = {'category': var_key[0], 'key': var_key[1], 'attributes': attributes}
+
+        if not existing:
+            changes.append(dict(change, action='create', var_id=None, reason='missing'))
+            continue
+
+        change['var_id'] = existing['id']
+        # The API may send null for an empty description
+        actual = dict(existing['attributes'], hcl=bool(existing['attributes'].get('hcl')),
+                      description=existing['attributes'].get('description') or '')
+        if actual.get('sensitive') and not attributes['sensitive']:
+            # The API cannot make a sensitive variable readable again
+            changes.append(dict(change, action='replace', reason='no longer sensitive'))
+        elif actual.get('sensitive'):
+            drifted = [name for name in ['hcl', 'description'] if actual[name] != attributes[name]]
+            if rewrite_sensitive:
+                drifted.insert(0, 'sensitive value')
+            if drifted:
+                changes.append(dict(change, action='update', reason=', '.join(drifted)))
+        else:
+            drifted = [name for name in COMPARED_ATTRIBUTES + ['sensitive']
+                       if actual.get(name, False) != attributes[name]]
+            if drifted:
+                changes.append(dict(change, action='update', reason=', '.join(drifted)))
+
+    if prune:
+        for var_key in sorted(set(current) - set(desired)):
+            changes.append({'category': var_key[0], 'key': var_key[1], 'attributes': None,
+                            'var_id': current[var_key]['id'], 'action': 'delete', 'reason': 'not in desired state'})
+
+    return changes
+
+
+def unverified_sensitive(current: Dict[VarKey, Dict], desired: Dict[VarKey, Dict]) -> List[VarKey]:
+    """Keys of variables that stay sensitive, whose values plan_changes cannot compare"""
+    return [var_key for var_key, attributes in sorted(desired.items())
+            if attributes['sensitive'] and current.get(var_key, {}).get('attributes', {}).get('sensitive')]
+
+
+def apply_change(path: str, change: Dict) -> Optional[str]:
+    """Apply one change to the vars endpoint at path; returns an error message or None"""
+    client = get_client()
+    payload = {'data': {'type': 'vars', 'attributes': change['attributes']}}
+
+    if change['action'] in ['delete', 'replace']:
+        response = client.delete(f"{path}/{change['var_id']}")
+        if response.status_code not in [200, 204]:
+            return f"{response.status_code} - {response.text}"
+        if change['action'] == 'delete':
+            return None
+
+    if change['action'] == 'update':
+        payload['data']['id'] = change['var_id']
+        response = client.patch(f"{path}/{change['var_id']}", json=payload)
+        expected = 200
+    else:
+        response = client.post(path, json=payload)
+        expected = 201
+
+    return None if response.status_code == expected else f"{response.status_code} - {response.text}"
+
+
+def sync_variables(desired: Dict[str, Dict[str, Dict[VarKey, Dict]]], prune: bool = False,
+                   dry_run: bool = False, max_workers: int = SYNC_WORKERS,
+                   rewrite_sensitive: bool = False) -> List[Dict]:
+    """
+    Bring workspaces and variable sets in line with the desired state.
+
+    Every target's variables are read with one request, all reads run
+    concurrently, and then all changes across all targets are applied
+    concurrently through the shared, rate-limited client.
+
+    Args:
+        desired: Output of load_desired_state()
+        prune: Delete variables that are not in the desired state
+        dry_run: Plan without applying
+        max_workers: Concurrent requests
+        rewrite_sensitive: Rewrite existing sensitive values (see plan_changes)
+
+    Returns:
+        One entry per target with its planned changes, each carrying a
+        status of 'planned', 'success' or 'error', and the keys of sensitive
+        variables whose values were not compared
+    """
+    targets = [{'kind': 'workspace', 'name': name, 'desired': variables}
+               for name, variables in desired['workspaces'].items()]
+
+    if desired['variable_sets']:
+        varset_ids = find_variable_sets()
+        for name, variables in desired['variable_sets'].items():
+            varset_id = varset_ids.get(name)
+            if not varset_id and not dry_run:
+                varset_id = create_variable_set(name)
+            targets.append({'kind': 'variable set', 'name': name, 'id': varset_id, 'desired': variables})
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(read_target, targets))
+
+        work = []
+        for target in targets:
+            target['changes'] = []
+            target['unverified'] = []
+            if 'error' in target:
+                continue
+            target['changes'] = plan_changes(target['current'], target['desired'], prune, rewrite_sensitive)
+            if not rewrite_sensitive:
+                target['unverified'] = unverified_sensitive(target['current'], target['desired'])
+            for change in target['changes']:
+                change['status'] = 'planned'
+                if not dry_run:
+                    work.append((target, change, executor.submit(apply_change, target.get('path'), change)))
+
+        for target, change, future in work:
+            error = future.result()
+            change['status'] = 'error' if error else 'success'
+            if error:
+                change['error'] = error
+
+    return targets
+
+
+def print_plan(targets: List[Dict]):
+    """Print each target's changes; values are never shown"""
+    symbols = {'create': '+', 'update': '~', 'replace': '±', 'delete': '-'}
+    for target in targets:
+        if 'error' in target:
+            print(f"❌ {target['kind']} {target['name']}: {target['error']}")
+            continue
+        if not target['changes']:
+            continue
+
+        print(f"\n📝 {target['kind']} {target['name']}")
+        for change in target['changes']:
+            marker = {'success': ' ✅', 'error': f" ❌ {change.get('error')}"}.get(change['status'], '')
+            print(f"   {symbols[change['action']]} {change['category']}.{change['key']} ({change['reason']}){marker}")
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Sync HCP Terraform variables to a desired-state file')
+    parser.add_argument('desired_state', help='JSON, YAML or .tfvars file of desired variables')
+    parser.add_argument('--workspace', action='append', default=[], help='Workspace for a .tfvars file (repeatable)')
+    parser.add_argument('--prune', action='store_true', help='Delete variables missing from the desired state')
+    parser.add_argument('--rewrite-sensitive', action='store_true',
+                        help='Rewrite existing sensitive values, which cannot be compared')
+    parser.add_argument('--workers', type=int, default=SYNC_WORKERS, help='Concurrent requests')
+    parser.add_argument('--dry-run', action='store_true', help='Show the changes without applying them')
+
+    args = parser.parse_args()
+    desired = load_desired_state(args.desired_state, args.workspace)
+
+    print("=" * 70)
+    print(f"HCP Terraform Variable Sync ({len(desired['workspaces'])} workspaces, "
+          f"{len(desired['variable_sets'])} variable sets)")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    try:
+        targets = sync_variables(desired, args.prune, args.dry_run, args.workers,
+                                 rewrite_sensitive=args.rewrite_sensitive)
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    print_plan(targets)
+
+    changes = [change for target in targets for change in target['changes']]
+    failed_targets = [target for target in targets if 'error' in target]
+    failed = [change for change in changes if change['status'] == 'error']
+    unverified = sum(len(target['unverified']) for target in targets)
+
+    if args.dry_run:
+        print(f"\n📋 {len(changes)} changes planned (dry run)")
+    elif not changes and unverified:
+        print(f"\n✅ Nothing to change ({elapsed:.1f}s)")
+    elif not changes:
+        print(f"\n✅ No drift: nothing to change ({elapsed:.1f}s)")
+    else:
+        print(f"\n✅ {len(changes) - len(failed)} applied, {len(failed)} failed in {elapsed:.1f}s")
+    if unverified:
+        print(f"⚠️  {unverified} sensitive values were not compared; use --rewrite-sensitive to rewrite them")
+
+    if failed or failed_targets:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform Async API Client
+Non-blocking counterpart of tfc_client.py for bulk operations: many requests
+in flight over one pooled aiohttp session, bounded by a semaphore
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from tfc_client import BASE_URL, MAX_RETRIES, RATE_LIMIT, REQUEST_TIMEOUT, TFCClient, should_retry
+
+# Requests in flight at once
+CONCURRENCY = int(os.environ.get('TFC_CONCURRENCY', '20'))
+
+
+class TFCAPIError(Exception):
+    """Raised when the API returns an unexpected status"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code} - {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class AsyncRateLimiter:
+    """Spaces requests evenly across all tasks sharing the client"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+
+    async def acquire(self):
+        """Wait for the next request slot"""
+        if not self.interval:
+            return
+
+        # No await between reading and updating next_slot, so no lock is needed
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncTFCClient:
+    """Async client for the HCP Terraform API, used as an async context manager"""
+
+    def __init__(self, token: str, org: str, base_url: str = BASE_URL,
+                 concurrency: int = CONCURRENCY, max_retries: int = MAX_RETRIES,
+                 rate_limit: float = RATE_LIMIT, timeout: int = REQUEST_TIMEOUT,
+                 backoff_factor: float = 0.5):
+        self.org = org
+        self.base_url = base_url.rstrip('/')
+        self.token = token
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = AsyncRateLimiter(rate_limit)
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'AsyncTFCClient':
+        """Create a client from TFC_TOKEN, TFC_ORG and TFC_ADDRESS"""
+        token = os.environ.get('TFC_TOKEN')
+        if not token:
+            raise SystemExit("❌ Error: TFC_TOKEN environment variable not set")
+
+        kwargs.setdefault('base_url', os.environ.get('TFC_ADDRESS', BASE_URL))
+        return cls(token, os.environ.get('TFC_ORG', 'my-organization'), **kwargs)
+
+    async def __aenter__(self) -> 'AsyncTFCClient':
+        # The session binds to the running event loop, so it is opened here
+        self.session = aiohttp.ClientSession(
+            headers={
+                'Authorization': f'Bearer {self.token}',
+                'Content-Type': 'application/vnd.api+json'
+            },
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def request(self, method: str, path: str, expected: int = 200, **kwargs) -> Optional[Dict]:
+        """
+        Send a request, retrying rate-limited and transient failures.
+
+        Uses the same per-method rules as TFCClient.request (see should_retry).
+
+        Args:
+            method: HTTP method
+            path: Path below the API base URL
+            expected: Success status code
+            **kwargs: Passed to aiohttp (params, json, ...)
+
+        Returns:
+            Parsed JSON body, or None for empty responses
+
+        Raises:
+            TFCAPIError: If the final response has another status
+        """
+        url = f'{self.base_url}{path}'
+
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.rate_limiter.acquire()
+                try:
+                    async with self.session.request(method, url, **kwargs) as response:
+                        body = await response.read()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    # Connector errors and connect timeouts mean nothing was sent
+                    connect_error = isinstance(e, (aiohttp.ClientConnectorError, aiohttp.ConnectionTimeoutError))
+                    if attempt == self.max_retries or not (connect_error or should_retry(method)):
+                        raise
+                    await asyncio.sleep(self.backoff_delay(attempt))
+                    continue
+
+                if not should_retry(method, response.status) or attempt == self.max_retries:
+                    break
+
+                delay = TFCClient.retry_after(response)
+                await asyncio.sleep(delay if delay is not None else self.backoff_delay(attempt))
+
+        if response.status != expected:
+            raise TFCAPIError(response.status, body.decode(errors='replace'))
+        return json.loads(body) if body else None
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, self.backoff_factor * (2 ** attempt))
+
+    def workspace_path(self, workspace: str) -> str:
+        """Path of a workspace given by ID (ws-...) or name"""
+        if workspace.startswith('ws-'):
+            return f'/workspaces/{workspace}'
+        return f'/organizations/{self.org}/workspaces/{workspace}'
+
+    async def create_workspace(self, name: str, terraform_version: str = '1.6.0',
+                               auto_apply: bool = False, description: str = '',
+                               **attributes) -> Dict:
+        """Create a new workspace"""
+        payload = {
+            'data': {
+                'type': 'workspaces',
+                'attributes': {
+                    'name': name,
+                    'terraform-version': terraform_version,
+                    'auto-apply': auto_apply,
+                    'execution-mode': 'remote',
+                    'description': description or 'Created via API',
+                    **attributes
+                }
+            }
+        }
+        response = await self.request('POST', f'/organizations/{self.org}/workspaces', expected=201, json=payload)
+        return response['data']
+
+    async def get_workspace(self, workspace: str) -> Dict:
+        """Get a workspace by ID or name"""
+        response = await self.request('GET', self.workspace_path(workspace))
+        return response['data']
+
+    async def update_workspace(self, workspace: str, **attributes) -> Dict:
+        """Update workspace attributes, by workspace ID or name"""
+        payload = {'data': {'type': 'workspaces', 'attributes': attributes}}
+        response = await self.request('PATCH', self.workspace_path(workspace), json=payload)
+        return response['data']
+
+    async def delete_workspace(self, workspace: str) -> None:
+        """Delete a workspace by ID or name"""
+        await self.request('DELETE', self.workspace_path(workspace), expected=204)
+
+    async def create_run(self, workspace_id: str, message: str = 'Triggered via API',
+                         is_destroy: bool = False) -> Dict:
+        """Create a new run (queue plan)"""
+        payload = {
+            'data': {
+                'type': 'runs',
+                'attributes': {
+                    'message': message,
+                    'is-destroy': is_destroy
+                },
+                'relationships': {
+                    'workspace': {
+                        'data': {
+                            'type': 'workspaces',
+                            'id': workspace_id
+                        }
+                    }
+                }
+            }
+        }
+        response = await self.request('POST', '/runs', expected=201, json=payload)
+        return response['data']
+
+    async def get_run_status(self, run_id: str) -> Dict:
+        """Get run status and details"""
+        response = await self.request('GET', f'/runs/{run_id}')
+        return response['data']
+
+    async def list_runs(self, workspace_id: str, limit: int = 10) -> List[Dict]:
+        """List recent runs for a workspace"""
+        response = await self.request('GET', f'/workspaces/{workspace_id}/runs', params={'page[size]': limit})
+        return response['data']
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform Response Cache
+TTL + LRU cache of GET responses used by tfc_client.py, with validators for
+conditional revalidation, tag-based invalidation and optional persistence
+across runs
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+CACHE_SIZE = int(os.environ.get('TFC_CACHE_SIZE', '1024'))
+
+# Seconds a cached workspace is served without asking the API. Workspace IDs
+# only change when a workspace is deleted and recreated, so name to ID
+# lookups can be trusted for much longer than attributes
+WORKSPACE_TTL = float(os.environ.get('TFC_CACHE_TTL', '60'))
+WORKSPACE_ID_TTL = float(os.environ.get('TFC_ID_CACHE_TTL', '3600'))
+
+# Optional JSON file that keeps the cache between tooling runs
+CACHE_FILE = os.environ.get('TFC_CACHE_FILE', '')
+
+
+class ResponseCache:
+    """Thread-safe LRU of JSON bodies keyed by request path"""
+
+    def __init__(self, max_entries: int = CACHE_SIZE, path: str = CACHE_FILE):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        if path:
+            self.load()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get an entry, fresh or not.
+
+        Returns:
+            Dict with body, fetched_at, etag, last_modified and tags, or None
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+            return entry
+
+    def is_fresh(self, entry: Dict, max_age: float) -> bool:
+        return time.time() - entry['fetched_at'] < max_age
+
+    def record(self, outcome: str):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def put(self, key: str, body: Dict, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, tags: Iterable[str] = ()):
+        """Store a response body, evicting the least recently used entry when full"""
+        with self.lock:
+            self.entries[key] = {
+                'body': body,
+                'fetched_at': time.time(),
+                'etag': etag,
+                'last_modified': last_modified,
+                'tags': sorted(tags)
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def touch(self, key: str):
+        """Mark an entry as just revalidated"""
+        with self.lock:
+            if key in self.entries:
+                self.entries[key]['fetched_at'] = time.time()
+
+    def invalidate(self, key: str):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def invalidate_tag(self, tag: str):
+        """Drop every entry carrying a tag, e.g. all cached views of one workspace"""
+        with self.lock:
+            for key in [key for key, entry in self.entries.items() if tag in entry['tags']]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def load(self):
+        try:
+            with open(self.path) as cache_file:
+                self.entries = OrderedDict(json.load(cache_file))
+        except (OSError, ValueError):
+            self.entries = OrderedDict()
+
+    def save(self):
+        """Write the cache to its file, if it has one"""
+        if not self.path:
+            return
+        with self.lock:
+            snapshot = list(self.entries.items())
+        # Write then rename so an interrupted run never leaves a corrupt file
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as cache_file:
+            json.dump(snapshot, cache_file)
+        os.replace(temp_path, self.path)
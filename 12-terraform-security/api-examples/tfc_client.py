@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+HCP Terraform API Client
+Shared HTTP client for the API examples: one pooled keep-alive session,
+client-side rate limiting and retries with exponential backoff
+"""
+
+import atexit
+import os
+import random
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from tfc_cache import ResponseCache
+
+# Configuration
+BASE_URL = 'https://app.terraform.io/api/v2'
+POOL_SIZE = int(os.environ.get('TFC_POOL_SIZE', '10'))
+MAX_RETRIES = int(os.environ.get('TFC_MAX_RETRIES', '5'))
+REQUEST_TIMEOUT = int(os.environ.get('TFC_TIMEOUT', '30'))
+
+# HCP Terraform allows 30 requests per second per user token
+RATE_LIMIT = float(os.environ.get('TFC_RATE_LIMIT', '30'))
+
+# Responses worth retrying: rate limited or a transient server error
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+
+# Methods that are safe to repeat if the server may already have acted on them.
+# A POST or PATCH that failed with a 5xx or a read timeout may have been
+# applied, so those are only retried when the server certainly did nothing.
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+def should_retry(method: str, status: Optional[int] = None) -> bool:
+    """
+    Whether a failed request may be sent again.
+
+    Requests that failed while connecting never reached the server and are
+    always retried; this covers the other failures.
+
+    Args:
+        method: HTTP method
+        status: Response status, or None if the request was sent but no response arrived
+
+    Returns:
+        True for 429s, and for transient failures of idempotent methods
+    """
+    if status == 429:
+        return True
+    return method.upper() in IDEMPOTENT_METHODS and (status is None or status in RETRY_STATUSES)
+
+
+def is_connect_error(error: requests.RequestException) -> bool:
+    """Whether a request failed while connecting, before anything was sent"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    # Refused connections and DNS failures surface as MaxRetryError(reason=NewConnectionError)
+    cause = error.args[0] if error.args else None
+    return isinstance(cause, MaxRetryError) and isinstance(cause.reason, NewConnectionError)
+
+
+class RateLimiter:
+    """Spaces requests evenly so a burst of threads stays under the API limit"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until the next request slot"""
+        if not self.interval:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class TFCClient:
+    """Pooled, retrying client for the HCP Terraform API"""
+
+    def __init__(self, token: str, org: str, base_url: str = BASE_URL,
+                 pool_size: int = POOL_SIZE, max_retries: int = MAX_RETRIES,
+                 rate_limit: float = RATE_LIMIT, timeout: int = REQUEST_TIMEOUT,
+                 backoff_factor: float = 0.5):
+        self.org = org
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.backoff_factor = backoff_factor
+        self.rate_limiter = RateLimiter(rate_limit)
+        self.cache = ResponseCache()
+        if self.cache.path:
+            atexit.register(self.cache.save)
+
+        # Keep-alive connections are reused across calls and threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/vnd.api+json'
+        })
+
+    @classmethod
+    def from_env(cls, **kwargs) -> 'TFCClient':
+        """Create a client from TFC_TOKEN, TFC_ORG and TFC_ADDRESS"""
+        token = os.environ.get('TFC_TOKEN')
+        if not token:
+            print("❌ Error: TFC_TOKEN environment variable not set")
+            print("   Export your HCP Terraform token: export TFC_TOKEN='your-token'")
+            sys.exit(1)
+
+        kwargs.setdefault('base_url', os.environ.get('TFC_ADDRESS', BASE_URL))
+        return cls(token, os.environ.get('TFC_ORG', 'my-organization'), **kwargs)
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying rate-limited and transient failures.
+
+        POST and PATCH are only retried on 429s and connection failures, as
+        anything else may have left the change applied (see should_retry).
+
+        Args:
+            method: HTTP method
+            path: Path below the API base URL, or an absolute URL
+            **kwargs: Passed to requests (params, json, ...)
+
+        Returns:
+            The final response; callers check the status code as before
+        """
+        url = path if path.startswith('http') else f'{self.base_url}{path}'
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries or not (is_connect_error(e) or should_retry(method)):
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                continue
+
+            if not should_retry(method, response.status_code) or attempt == self.max_retries:
+                return response
+
+            delay = self.retry_after(response)
+            time.sleep(delay if delay is not None else self.backoff_delay(attempt))
+
+        return response
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, self.backoff_factor * (2 ** attempt))
+
+    @staticmethod
+    def retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds to wait from Retry-After or X-RateLimit-Reset, if the server sent one"""
+        for header in ['Retry-After', 'X-RateLimit-Reset']:
+            try:
+                return max(0.0, float(response.headers[header]))
+            except (KeyError, ValueError):
+                continue
+        return None
+
+    def cached_get(self, path: str, max_age: float) -> Optional[Dict]:
+        """
+        GET a JSON document through the response cache.
+
+        Entries younger than max_age are served without a request. Older
+        ones are revalidated with If-None-Match / If-Modified-Since when the
+        API sent a validator, so an unchanged document costs a bodiless 304.
+
+        Args:
+            path: Path below the API base URL
+            max_age: Seconds a cached copy may be served as is
+
+        Returns:
+            Parsed body of a 200 response, or None
+        """
+        # Keyed by full URL so a persisted cache never mixes API endpoints
+        key = path if path.startswith('http') else f'{self.base_url}{path}'
+        entry = self.cache.get(key)
+        if entry and self.cache.is_fresh(entry, max_age):
+            self.cache.record('hits')
+            return entry['body']
+
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.get(path, headers=headers)
+        if response.status_code == 304 and entry:
+            self.cache.touch(key)
+            self.cache.record('revalidated')
+            return entry['body']
+
+        self.cache.record('misses')
+        if response.status_code != 200:
+            self.cache.invalidate(key)
+            return None
+
+        body = response.json()
+        data = body.get('data')
+        # Tag with the resource ID so every path it was read through can be invalidated
+        tags = [data['id']] if isinstance(data, dict) and 'id' in data else []
+        self.cache.put(key, body, response.headers.get('ETag'), response.headers.get('Last-Modified'), tags)
+        return body
+
+    def invalidate(self, resource_id: str):
+        """Forget cached responses for a resource after changing or deleting it"""
+        self.cache.invalidate_tag(resource_id)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request('POST', path, **kwargs)
+
+    def patch(self, path: str, **kwargs) -> requests.Response:
+        return self.request('PATCH', path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request('DELETE', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[TFCClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> TFCClient:
+    """Get the process-wide client shared by the example scripts"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TFCClient.from_env()
+    return _client
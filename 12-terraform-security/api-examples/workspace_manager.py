@@ -4,66 +4,88 @@ HCP Terraform Workspace Manager
 Demonstrates workspace management via HCP Terraform API
 """
 
-import requests
 import json
 import os
-import sys
-from typing import Optional, Dict, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, Dict, Iterator, List
+
+from tfc_cache import WORKSPACE_TTL
+from tfc_client import get_client
 
 # Configuration
-API_TOKEN = os.environ.get('TFC_TOKEN')
 ORG_NAME = os.environ.get('TFC_ORG', 'my-organization')
-BASE_URL = 'https://app.terraform.io/api/v2'
-
-if not API_TOKEN:
-    print("❌ Error: TFC_TOKEN environment variable not set")
-    print("   Export your HCP Terraform token: export TFC_TOKEN='your-token'")
-    sys.exit(1)
-
-headers = {
-    'Authorization': f'Bearer {API_TOKEN}',
-    'Content-Type': 'application/vnd.api+json'
-}
+PAGE_SIZE = 100  # API maximum
+PAGE_WORKERS = int(os.environ.get('TFC_PAGE_WORKERS', '8'))
 
 
-def list_workspaces() -> List[Dict]:
-    """List all workspaces in the organization"""
-    print(f"\n📋 Listing workspaces in organization: {ORG_NAME}")
+def fetch_workspace_page(page: int) -> Dict:
+    """Fetch one page of workspaces, raising RuntimeError on an API error"""
+    response = get_client().get(
+        f'/organizations/{ORG_NAME}/workspaces',
+        params={'page[size]': PAGE_SIZE, 'page[number]': page}
+    )
     
-    workspaces = []
-    page = 1
+    if response.status_code != 200:
+        raise RuntimeError(f"{response.status_code} - {response.text}")
+    
+    return response.json()
+
+
+def iter_workspaces(max_workers: int = PAGE_WORKERS) -> Iterator[Dict]:
+    """
+    Yield all workspaces in the organization, in page order.
+    
+    The first page reports the total page count; the remaining pages are
+    fetched concurrently, at most max_workers ahead of the consumer, and
+    yielded in order. The shared client keeps requests under the rate limit.
+    """
+    first = fetch_workspace_page(1)
+    yield from first['data']
+    
+    total_pages = first.get('meta', {}).get('pagination', {}).get('total-pages')
+    if total_pages is None:
+        # No pagination metadata: follow the next links one page at a time
+        data, page = first, 1
+        while 'next' in data.get('links', {}):
+            page += 1
+            data = fetch_workspace_page(page)
+            yield from data['data']
+        return
+    
+    pages = iter(range(2, total_pages + 1))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = deque(executor.submit(fetch_workspace_page, page) for page in islice(pages, max_workers))
+        while in_flight:
+            data = in_flight.popleft().result()
+            for page in islice(pages, 1):
+                in_flight.append(executor.submit(fetch_workspace_page, page))
+            yield from data['data']
+
+
+def list_workspaces(show: bool = False) -> List[Dict]:
+    """List all workspaces in the organization; show=True also prints each one"""
+    print(f"\n📋 Listing workspaces in organization: {ORG_NAME}")
     
-    while True:
-        response = requests.get(
-            f'{BASE_URL}/organizations/{ORG_NAME}/workspaces',
-            headers=headers,
-            params={'page[size]': 100, 'page[number]': page}
-        )
-        
-        if response.status_code != 200:
-            print(f"❌ Error: {response.status_code} - {response.text}")
-            return []
-        
-        data = response.json()
-        workspaces.extend(data['data'])
-        
-        # Check if there are more pages
-        if 'next' not in data.get('links', {}):
-            break
-        
-        page += 1
+    try:
+        workspaces = list(iter_workspaces())
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        return []
     
     print(f"✅ Found {len(workspaces)} workspaces")
-    for ws in workspaces:
-        attrs = ws['attributes']
-        print(f"   - {attrs['name']} (Terraform {attrs.get('terraform-version', 'N/A')})")
+    if show:
+        for ws in workspaces:
+            attrs = ws['attributes']
+            print(f"   - {attrs['name']} (Terraform {attrs.get('terraform-version', 'N/A')})")
     
     return workspaces
 
 
 def create_workspace(name: str, terraform_version: str = '1.6.0', 
-                    auto_apply: bool = False, description: str = '') -> Optional[str]:
-    """Create a new workspace"""
+                    auto_apply: bool = False, description: str = '', **attributes) -> Optional[str]:
+    """Create a new workspace; extra attributes (e.g. execution-mode, vcs-repo) override the defaults"""
     print(f"\n🔨 Creating workspace: {name}")
     
     payload = {
@@ -74,14 +96,14 @@ def create_workspace(name: str, terraform_version: str = '1.6.0',
                 'terraform-version': terraform_version,
                 'auto-apply': auto_apply,
                 'execution-mode': 'remote',
-                'description': description or f'Created via API'
+                'description': description or f'Created via API',
+                **attributes
             }
         }
     }
     
-    response = requests.post(
-        f'{BASE_URL}/organizations/{ORG_NAME}/workspaces',
-        headers=headers,
+    response = get_client().post(
+        f'/organizations/{ORG_NAME}/workspaces',
         json=payload
     )
     
@@ -102,17 +124,10 @@ def create_workspace(name: str, terraform_version: str = '1.6.0',
         return None
 
 
-def get_workspace(name: str) -> Optional[Dict]:
-    """Get workspace by name"""
-    response = requests.get(
-        f'{BASE_URL}/organizations/{ORG_NAME}/workspaces/{name}',
-        headers=headers
-    )
-    
-    if response.status_code == 200:
-        return response.json()['data']
-    else:
-        return None
+def get_workspace(name: str, max_age: float = WORKSPACE_TTL) -> Optional[Dict]:
+    """Get workspace by name, served from the cache when recently fetched"""
+    body = get_client().cached_get(f'/organizations/{ORG_NAME}/workspaces/{name}', max_age)
+    return body['data'] if body else None
 
 
 def update_workspace(workspace_id: str, **kwargs) -> bool:
@@ -126,14 +141,13 @@ def update_workspace(workspace_id: str, **kwargs) -> bool:
         }
     }
     
-    response = requests.patch(
-        f'{BASE_URL}/workspaces/{workspace_id}',
-        headers=headers,
+    response = get_client().patch(
+        f'/workspaces/{workspace_id}',
         json=payload
     )
     
     if response.status_code == 200:
-        workspace = response.json()['data']
+        get_client().invalidate(workspace_id)
         print(f"✅ Workspace updated successfully")
         for key, value in kwargs.items():
             print(f"   {key}: {value}")
@@ -147,12 +161,10 @@ def delete_workspace(workspace_id: str) -> bool:
     """Delete a workspace"""
     print(f"\n🗑️  Deleting workspace: {workspace_id}")
     
-    response = requests.delete(
-        f'{BASE_URL}/workspaces/{workspace_id}',
-        headers=headers
-    )
+    response = get_client().delete(f'/workspaces/{workspace_id}')
     
     if response.status_code == 204:
+        get_client().invalidate(workspace_id)
         print(f"✅ Workspace deleted successfully")
         return True
     else:
@@ -167,7 +179,7 @@ def main():
     print("=" * 70)
     
     # List existing workspaces
-    workspaces = list_workspaces()
+    workspaces = list_workspaces(show=True)
     
     # Create a new workspace
     workspace_name = 'api-demo-workspace'
@@ -10,11 +10,10 @@ from diagrams.aws.compute import EC2, EC2AutoScaling
 from diagrams.aws.network import VPC, PublicSubnet, PrivateSubnet, InternetGateway, NATGateway, Route53, ELB, CloudFront
 from diagrams.aws.database import RDS, RDSPostgresqlInstance
 from diagrams.aws.storage import S3
-from diagrams.aws.security import IAM, KMS, SecretsManager
+from diagrams.aws.security import IAM, KMS
 from diagrams.aws.management import Cloudwatch, CloudwatchAlarm
 from diagrams.aws.integration import SNS
 from diagrams.onprem.client import Users, Client
-from diagrams.onprem.monitoring import Grafana
 
 # Configuration
 OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -4,7 +4,7 @@ Diagram Generation Script for Project 2: Modular Infrastructure
 Generates architecture diagrams showing module composition and dependencies
 """
 
-from diagrams import Diagram, Cluster, Edge
+from diagrams import Diagram, Cluster
 from diagrams.aws.compute import EC2, EC2AutoScaling
 from diagrams.aws.network import VPC, ELB, Route53, NATGateway, InternetGateway
 from diagrams.aws.database import RDS
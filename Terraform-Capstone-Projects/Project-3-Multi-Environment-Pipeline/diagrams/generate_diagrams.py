@@ -6,10 +6,9 @@ Generates architecture diagrams showing multi-environment setup and CI/CD pipeli
 
 from diagrams import Diagram, Cluster, Edge
 from diagrams.aws.compute import EC2, EC2AutoScaling
-from diagrams.aws.network import VPC, ELB, Route53, NATGateway, InternetGateway
+from diagrams.aws.network import VPC, ELB, NATGateway, InternetGateway
 from diagrams.aws.database import RDS
 from diagrams.aws.storage import S3
-from diagrams.aws.security import IAM, Shield
 from diagrams.aws.management import Cloudwatch
 from diagrams.aws.general import Users
 from diagrams.onprem.vcs import Github
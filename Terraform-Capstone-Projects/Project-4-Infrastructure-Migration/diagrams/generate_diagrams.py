@@ -6,7 +6,7 @@ Generates architecture diagrams showing migration and import workflows
 
 from diagrams import Diagram, Cluster, Edge
 from diagrams.aws.compute import EC2, EC2AutoScaling
-from diagrams.aws.network import VPC, ELB, Route53, InternetGateway
+from diagrams.aws.network import VPC, ELB
 from diagrams.aws.database import RDS
 from diagrams.aws.storage import S3
 from diagrams.aws.security import IAM
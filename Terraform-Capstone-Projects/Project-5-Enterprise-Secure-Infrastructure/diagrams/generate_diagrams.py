@@ -4,7 +4,7 @@ Diagram Generation Script for Project 5: Enterprise-Grade Secure Infrastructure
 Generates comprehensive security architecture diagrams
 """
 
-from diagrams import Diagram, Cluster, Edge
+from diagrams import Diagram, Cluster
 from diagrams.aws.compute import EC2
 from diagrams.aws.network import VPC, NATGateway, Endpoint, ELB
 from diagrams.aws.database import RDS
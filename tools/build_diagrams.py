@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Diagram Build
+Builds every Diagram-as-Code target in the repository in one command
+
+Targets are discovered, not listed: any Python file that calls Diagram(...)
+or savefig(...) is a target, whatever its entry style (a main() function, a
+generator class, or rendering at import time). Each target is run in-process
+as __main__, from its own directory, on a pool of worker processes.
+
+The targets form a dependency graph:
+- a target that imports another target from its directory depends on it
+- targets that write the same output file run in discovery order instead
+  of racing. Outputs are known from earlier builds, or from literal
+  Diagram(...) names and filenames
+
+Ready targets run as soon as their dependencies finish. Builds are
+incremental (see diagram_cache.py), so unchanged targets are skipped.
+
+With --formats, every Graphviz diagram is also written in each listed
+format. Each graph is laid out once and all formats are rendered from that
+cached layout (see diagram_layout.py). With --variants, each PNG a target
+renders is post-processed into print, web and thumbnail versions (see
+image_variants.py) in the same worker.
+
+Usage:
+    ./tools/build_diagrams.py
+    ./tools/build_diagrams.py --list
+    ./tools/build_diagrams.py --only 12-terraform-security --only 'Project-2*'
+    ./tools/build_diagrams.py --changed-since origin/main
+    ./tools/build_diagrams.py --force --workers 8
+    ./tools/build_diagrams.py --formats png,svg,pdf
+    ./tools/build_diagrams.py --variants web,thumb
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import logging
+import os
+import runpy
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Set
+
+from diagram_cache import DiagramCache, local_modules, track_outputs
+from diagram_layout import FORMATS
+from image_variants import VARIANTS, is_variant, parse_variants, write_variants
+
+# Configuration
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.environ.get('DIAGRAM_CACHE_DIR', REPO_ROOT / '.diagram-cache'))
+SKIP_DIRS = {'.git', 'venv', '.venv', 'node_modules', '__pycache__', 'tools'}
+RENDER_CALLS = {'Diagram', 'savefig'}
+
+
+def is_target(path: Path) -> bool:
+    """Whether a Python file renders diagrams itself (runners that call other scripts don't)"""
+    try:
+        tree = ast.parse(path.read_text(encoding='utf-8'))
+    except (SyntaxError, UnicodeDecodeError):
+        return False
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, 'id', None)
+            if name in RENDER_CALLS:
+                return True
+    return False
+
+
+def declared_outputs(path: Path) -> List[Path]:
+    """Outputs named by literal Diagram(name, filename=..., outformat=...) arguments"""
+    outputs = []
+    for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+        if not (isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'Diagram'):
+            continue
+        arguments = {keyword.arg: keyword.value for keyword in node.keywords}
+        if node.args:
+            arguments.setdefault('name', node.args[0])
+        literal = {key: value.value for key, value in arguments.items()
+                   if isinstance(value, ast.Constant) and isinstance(value.value, str)}
+
+        # Same default as diagrams: the name, lowercased, with spaces as underscores
+        if 'filename' in literal:
+            filename = literal['filename']
+        elif 'filename' not in arguments and 'name' in literal:
+            filename = '_'.join(literal['name'].split()).lower()
+        else:
+            continue
+        outputs.append(path.parent / f"{filename}.{literal.get('outformat', 'png')}")
+    return outputs
+
+
+def discover_targets(root: Path = REPO_ROOT) -> List[Path]:
+    """All diagram targets under root, in path order"""
+    targets = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS and not name.startswith('.'))
+        for filename in sorted(filenames):
+            path = Path(directory) / filename
+            if filename.endswith('.py') and is_target(path):
+                targets.append(path)
+    return targets
+
+
+def build_graph(targets: List[Path], cache: DiagramCache) -> Dict[Path, Set[Path]]:
+    """
+    Dependencies of each target.
+
+    Args:
+        targets: Targets in discovery order
+        cache: Build cache, whose manifest holds the outputs of earlier builds
+
+    Returns:
+        {target: set of targets it must wait for}
+    """
+    graph = {target: set() for target in targets}
+
+    # Imports of other targets
+    for target in targets:
+        graph[target].update(module for module in local_modules(target) if module in graph)
+
+    # Shared outputs: each writer waits for the previous one
+    last_writer: Dict[str, Path] = {}
+    for target in targets:
+        entry = cache.manifest['targets'].get(cache.key(target), {})
+        # Imported modules render too, when they render at import time
+        declared = [output for path in [target] + local_modules(target) for output in declared_outputs(path)]
+        outputs = set(entry.get('outputs', {})) | {cache.key(output) for output in declared}
+        for output in sorted(outputs):
+            previous = last_writer.get(output)
+            if previous and previous != target:
+                graph[target].add(previous)
+            last_writer[output] = target
+
+    return graph
+
+
+def changed_files(revision: str) -> Set[Path]:
+    """Files changed since a git revision, including uncommitted and untracked ones"""
+    changed = set()
+    for command in (['git', 'diff', '--name-only', revision, '--'],
+                    ['git', 'ls-files', '--others', '--exclude-standard']):
+        result = subprocess.run(command, cwd=REPO_ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        changed.update((REPO_ROOT / line).resolve() for line in result.stdout.splitlines() if line)
+    return changed
+
+
+def select_targets(targets: List[Path], only: List[str], changed: Optional[Set[Path]]) -> List[Path]:
+    """
+    Apply the --only and --changed-since filters.
+
+    --only patterns match a target's path relative to the repository, any of
+    its parent directories or any single path component. With
+    --changed-since, a target is kept if its script or a module it imports
+    changed.
+    """
+    selected = []
+    for target in targets:
+        key = PurePosixPath(target.relative_to(REPO_ROOT).as_posix())
+        candidates = [str(key)] + [str(parent) for parent in key.parents] + list(key.parts)
+        if only and not any(fnmatch(candidate, pattern.rstrip('/')) for pattern in only for candidate in candidates):
+            continue
+        if changed is not None and not ({target} | set(local_modules(target))) & changed:
+            continue
+        selected.append(target)
+    return selected
+
+
+def init_worker():
+    """Import the diagram libraries once per worker process"""
+    import diagrams  # noqa: F401
+    import graphviz  # noqa: F401
+
+
+def run_target(path: str, libraries: List[str], formats: Optional[List[str]] = None,
+               variants: Optional[List[str]] = None) -> Dict:
+    """
+    Run one target in the current process, as `python <path>` from its directory would.
+
+    With formats, Graphviz diagrams are rendered in each of them from one
+    layout, kept in the build cache. With variants, the PNGs it renders are
+    then post-processed into those image variants.
+
+    Modules the script imports from its directory, and logging handlers it
+    adds, are removed afterwards so the next target in this worker starts clean.
+
+    Returns:
+        {'success', 'output', 'seconds', 'outputs'}
+    """
+    script = Path(path)
+    os.chdir(script.parent)
+    sys.path.insert(0, str(script.parent))
+    modules_before = set(sys.modules)
+    handlers_before = list(logging.root.handlers)
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    success = True
+    with track_outputs(libraries, formats, CACHE_DIR / 'layouts') as outputs:
+        try:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                runpy.run_path(str(script), run_name='__main__')
+        except SystemExit as e:
+            success = e.code in (None, 0)
+            if not success:
+                output.write(f"Exited with {e.code}\n")
+        except Exception as e:
+            success = False
+            output.write(f"{type(e).__name__}: {e}\n")
+        finally:
+            sys.path.remove(str(script.parent))
+            for name in set(sys.modules) - modules_before:
+                if str(getattr(sys.modules[name], '__file__', None) or '').startswith(str(script.parent) + os.sep):
+                    del sys.modules[name]
+            for handler in logging.root.handlers[:]:
+                if handler not in handlers_before:
+                    logging.root.removeHandler(handler)
+                    handler.close()
+            if 'matplotlib.pyplot' in sys.modules:
+                sys.modules['matplotlib.pyplot'].close('all')
+
+    if success and variants:
+        for rendered in sorted(set(outputs)):
+            if not rendered.endswith('.png') or is_variant(Path(rendered)) or not os.path.isfile(rendered):
+                continue
+            try:
+                written = write_variants(rendered, variants)
+            except Exception as e:
+                success = False
+                output.write(f"{type(e).__name__} writing variants of {rendered}: {e}\n")
+                break
+            outputs.extend(path for variant, (path, _, _) in written.items() if variant != 'print')
+
+    return {'success': success, 'output': output.getvalue(), 'seconds': time.perf_counter() - start,
+            'outputs': list(outputs)}
+
+
+def build(targets: List[Path], graph: Dict[Path, Set[Path]], cache: DiagramCache, force: bool = False,
+          max_workers: Optional[int] = None, dry_run: bool = False, verbose: bool = False,
+          formats: Optional[List[str]] = None, variants: Optional[List[str]] = None) -> Dict[Path, str]:
+    """
+    Run the targets in dependency order, as many at once as there are workers.
+
+    Dependencies outside the selected targets are treated as already built.
+    Targets built with other formats or variants than last time are rebuilt.
+
+    Returns:
+        {target: 'built' | 'cached' | 'failed' | 'skipped'}
+    """
+    selected = set(targets)
+    waiting = {target: graph[target] & selected for target in targets}
+    dependents: Dict[Path, List[Path]] = {target: [] for target in targets}
+    for target, dependencies in waiting.items():
+        for dependency in dependencies:
+            dependents[dependency].append(target)
+
+    status: Dict[Path, str] = {}
+    ready = [target for target in targets if not waiting[target]]
+    running = {}
+    workers = max_workers or os.cpu_count() or 1
+    settings = {name: value for name, value in (('formats', formats), ('variants', variants)) if value} or None
+
+    def finish(target: Path, result: str):
+        status[target] = result
+        for dependent in dependents[target]:
+            if result == 'failed' or result == 'skipped':
+                if dependent not in status:
+                    print(f"⏭️  {cache.key(dependent)} (skipped: {cache.key(target)} failed)")
+                    finish(dependent, 'skipped')
+                continue
+            waiting[dependent].discard(target)
+            if not waiting[dependent] and dependent not in status:
+                ready.append(dependent)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        while ready or running:
+            while ready:
+                target = ready.pop(0)
+                reason, inputs = cache.check(target, settings)
+                if force:
+                    reason = reason or 'forced'
+                if not reason:
+                    print(f"♻️  {cache.key(target)} (up to date)")
+                    finish(target, 'cached')
+                elif dry_run:
+                    print(f"📝 {cache.key(target)} would be built: {reason}")
+                    finish(target, 'built')
+                else:
+                    future = executor.submit(run_target, str(target), list(inputs['libraries']), formats, variants)
+                    running[future] = (target, reason, inputs)
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                target, reason, inputs = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'success': False, 'output': f"{type(e).__name__}: {e}", 'seconds': 0.0, 'outputs': []}
+
+                if result['success']:
+                    cache.record(target, inputs, result['outputs'], reason, result['seconds'])
+                    print(f"✅ {cache.key(target)} ({result['seconds']:.1f}s, {len(result['outputs'])} outputs, {reason})")
+                else:
+                    cache.forget(target)
+                    print(f"❌ {cache.key(target)} ({result['seconds']:.1f}s)")
+                if verbose or not result['success']:
+                    for line in result['output'].strip().splitlines():
+                        print(f"   {line}")
+                finish(target, 'built' if result['success'] else 'failed')
+
+    if not dry_run:
+        cache.save()
+
+    # Anything left is part of a dependency cycle
+    for target in targets:
+        if target not in status:
+            print(f"❌ {cache.key(target)} (dependency cycle)")
+            status[target] = 'failed'
+    return status
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Build every diagram in the repository')
+    parser.add_argument('--only', action='append', default=[], metavar='PATTERN',
+                        help='Only targets whose path, a parent directory or a path component matches (repeatable)')
+    parser.add_argument('--changed-since', metavar='REV', help='Only targets whose script or imports changed since a git revision')
+    parser.add_argument('--force', action='store_true', help='Rebuild selected targets, ignoring the cache')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--list', action='store_true', help='List targets and their dependencies')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would be built')
+    parser.add_argument('--formats', metavar='LIST',
+                        help=f"Comma-separated output formats for Graphviz diagrams, from one layout ({', '.join(FORMATS)})")
+    parser.add_argument('--variants', metavar='LIST',
+                        help=f"Comma-separated image variants to write for each PNG ({', '.join(VARIANTS)})")
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print each target\'s output')
+
+    args = parser.parse_args()
+    formats = [name.strip().lower() for name in args.formats.split(',') if name.strip()] if args.formats else None
+    unknown = sorted(set(formats or []) - set(FORMATS))
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)} (choose from {', '.join(FORMATS)})")
+    variants = parse_variants(args.variants) if args.variants else None
+    unknown = sorted(set(variants or []) - set(VARIANTS))
+    if unknown:
+        parser.error(f"unknown variant(s): {', '.join(unknown)} (choose from {', '.join(VARIANTS)})")
+
+    cache = DiagramCache(CACHE_DIR, REPO_ROOT)
+    targets = discover_targets()
+    graph = build_graph(targets, cache)
+
+    try:
+        changed = changed_files(args.changed_since) if args.changed_since else None
+    except RuntimeError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    selected = select_targets(targets, args.only, changed)
+
+    if args.list:
+        for target in selected:
+            dependencies = ', '.join(cache.key(dependency) for dependency in sorted(graph[target]))
+            print(f"{cache.key(target)}" + (f"  <- {dependencies}" if dependencies else ''))
+        print(f"\n{len(selected)} of {len(targets)} targets")
+        return
+
+    print("=" * 70)
+    print(f"Building {len(selected)} of {len(targets)} diagram targets")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    status = build(selected, graph, cache, args.force, args.workers, args.dry_run, args.verbose, formats, variants)
+    elapsed = time.perf_counter() - start
+
+    counts = {result: sum(1 for value in status.values() if value == result)
+              for result in ('built', 'cached', 'failed', 'skipped')}
+    print("=" * 70)
+    print(f"📊 {counts['built']} {'to build' if args.dry_run else 'built'}, {counts['cached']} up to date, "
+          f"{counts['failed']} failed, {counts['skipped']} skipped in {elapsed:.1f}s")
+
+    if counts['failed'] or counts['skipped']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Diagram Build Cache
+Content-hash incremental builds for the Diagram-as-Code scripts
+
+Each diagram script is fingerprinted from its source, the modules it imports
+from its own directory, the versions of the rendering libraries it imports
+(plus the Graphviz `dot` binary) and the output settings it is built with. A script whose fingerprint matches the manifest and
+whose outputs are intact is skipped. Outputs that were deleted or edited are
+restored from the object store instead of being rendered again.
+
+Cache directory layout (DIAGRAM_CACHE_DIR, default .diagram-cache):
+    manifest.json      - per script: fingerprint inputs, outputs, when and why it was built
+    objects/ab/cdef... - output files by SHA-256
+    layouts/ab/cdef... - Graphviz layouts for multi-format builds (see diagram_layout.py)
+
+Usage (from a runner):
+    cache = DiagramCache(cache_dir, root)
+    reason, inputs = cache.check(script)
+    if reason:                      # None when up to date
+        with track_outputs(inputs['libraries']) as outputs:
+            runpy.run_path(str(script), run_name='__main__')
+        cache.record(script, inputs, outputs, reason, seconds)
+    cache.save()
+"""
+
+import ast
+import contextlib
+import hashlib
+import importlib.abc
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Import name -> distribution, for the libraries that affect rendered output
+LIBRARIES = {
+    'diagrams': 'diagrams',
+    'graphviz': 'graphviz',
+    'matplotlib': 'matplotlib',
+    'numpy': 'numpy',
+    'seaborn': 'seaborn',
+    'plotly': 'plotly',
+    'PIL': 'Pillow',
+}
+MANIFEST_VERSION = 1
+
+
+def file_hash(path) -> str:
+    """SHA-256 of a file, read in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def imported_modules(source: str) -> Set[str]:
+    """Top-level names of the modules a script imports anywhere in its source"""
+    names = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return names
+
+
+def imported_libraries(source: str) -> List[str]:
+    """Rendering libraries (see LIBRARIES) a script imports"""
+    names = imported_modules(source)
+    # diagrams renders through graphviz and the dot binary
+    if 'diagrams' in names:
+        names.add('graphviz')
+    return sorted(names & LIBRARIES.keys())
+
+
+def local_modules(script) -> List[Path]:
+    """Modules a script imports, directly or through each other, from its own directory"""
+    script = Path(script)
+    found: Set[Path] = set()
+    queue = [script]
+    while queue:
+        names = imported_modules(queue.pop().read_text(encoding='utf-8'))
+        for path in (script.parent / f'{name}.py' for name in names):
+            if path.is_file() and path != script and path not in found:
+                found.add(path)
+                queue.append(path)
+    return sorted(found)
+
+
+@lru_cache(maxsize=None)
+def library_version(name: str) -> str:
+    """Installed version of a library from LIBRARIES, or of 'dot'"""
+    if name == 'dot':
+        try:
+            result = subprocess.run(['dot', '-V'], capture_output=True, text=True)
+        except OSError:
+            return 'not installed'
+        return (result.stderr or result.stdout).strip()
+
+    try:
+        return metadata.version(LIBRARIES[name])
+    except metadata.PackageNotFoundError:
+        return 'not installed'
+
+
+def fingerprint_inputs(script: Path, settings: Optional[Dict] = None) -> Dict:
+    """
+    Everything a script's outputs depend on.
+
+    Args:
+        script: Diagram script
+        settings: Output settings the runner builds with (e.g. format, dpi)
+
+    Returns:
+        {'source': sha256, 'modules': {file: sha256}, 'libraries': {name: version},
+        'settings': {...}}
+    """
+    source = Path(script).read_bytes()
+    libraries = imported_libraries(source.decode('utf-8'))
+    versions = {name: library_version(name) for name in libraries}
+    if 'graphviz' in versions:
+        versions['dot'] = library_version('dot')
+
+    return {
+        'source': hashlib.sha256(source).hexdigest(),
+        'modules': {path.name: file_hash(path) for path in local_modules(script)},
+        'libraries': versions,
+        'settings': dict(settings or {}),
+    }
+
+
+def fingerprint(inputs: Dict) -> str:
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def change_reason(old: Optional[Dict], new: Dict) -> Optional[str]:
+    """Why a script must be rebuilt, comparing fingerprint inputs; None if nothing changed"""
+    if old is None:
+        return 'new diagram'
+    if old['source'] != new['source']:
+        return 'script changed'
+    if old.get('modules', {}) != new['modules']:
+        changed = sorted(name for name in set(old.get('modules', {})) | set(new['modules'])
+                         if old.get('modules', {}).get(name) != new['modules'].get(name))
+        return f"imported module changed: {', '.join(changed)}"
+
+    libraries = sorted(set(old['libraries']) | set(new['libraries']))
+    changed = [f"{name} {old['libraries'].get(name, 'none')} -> {new['libraries'].get(name, 'none')}"
+               for name in libraries if old['libraries'].get(name) != new['libraries'].get(name)]
+    if changed:
+        return f"library changed: {', '.join(changed)}"
+
+    if old['settings'] != new['settings']:
+        keys = sorted(key for key in set(old['settings']) | set(new['settings'])
+                      if old['settings'].get(key) != new['settings'].get(key))
+        return f"settings changed: {', '.join(keys)}"
+    return None
+
+
+class PatchOnImport(importlib.abc.MetaPathFinder):
+    """
+    Calls patch(module) right after a module is first imported.
+
+    Lets track_outputs() wrap matplotlib without importing it, so scripts
+    that import matplotlib lazily don't pay for it unless they use it.
+    """
+
+    def __init__(self, name: str, patch):
+        self.name = name
+        self.patch = patch
+
+    def find_spec(self, name, path, target=None):
+        if name != self.name:
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            return spec
+
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module):
+            exec_module(module)
+            self.patch(module)
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+@contextlib.contextmanager
+def track_outputs(libraries: Iterable[str] = ('graphviz',), formats: Optional[List[str]] = None,
+                  layout_dir=None) -> Iterator[List[str]]:
+    """
+    Record the files rendered inside the block.
+
+    Wraps graphviz's render() (which diagrams uses) and, for scripts that
+    import it, matplotlib's Figure.savefig(). matplotlib is wrapped when the
+    script imports it rather than up front. Yields the list the absolute
+    output paths are appended to.
+
+    Args:
+        libraries: Rendering libraries the script imports
+        formats: Also write each Graphviz diagram in these formats, from a
+            single layout (see diagram_layout.py)
+        layout_dir: Where to keep layouts; required with formats
+    """
+    outputs: List[str] = []
+    patches = []
+
+    def apply(owner, name, wrapper):
+        patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, wrapper)
+
+    if 'graphviz' in libraries:
+        import graphviz
+        owner = next(cls for cls in graphviz.Digraph.__mro__ if 'render' in cls.__dict__)
+        original_render = owner.render
+
+        if formats:
+            from diagram_layout import render_from_layout
+
+            def render(self, *args, **kwargs):
+                paths = render_from_layout(self, original_render, formats, layout_dir, *args, **kwargs)
+                outputs.extend(os.path.abspath(path) for path in paths)
+                return paths[0]
+        else:
+            def render(self, *args, **kwargs):
+                path = original_render(self, *args, **kwargs)
+                outputs.append(os.path.abspath(path))
+                return path
+        apply(owner, 'render', render)
+
+    def patch_savefig(module):
+        Figure = module.Figure
+        original_savefig = Figure.savefig
+
+        def savefig(self, fname, *args, **kwargs):
+            original_savefig(self, fname, *args, **kwargs)
+            if isinstance(fname, (str, os.PathLike)):
+                path = Path(fname)
+                if not path.suffix:
+                    rc_format = sys.modules['matplotlib'].rcParams['savefig.format']
+                    path = path.with_suffix('.' + (kwargs.get('format') or rc_format))
+                outputs.append(os.path.abspath(path))
+        apply(Figure, 'savefig', savefig)
+
+    hook = None
+    if 'matplotlib' in libraries:
+        if 'matplotlib.figure' in sys.modules:
+            patch_savefig(sys.modules['matplotlib.figure'])
+        else:
+            hook = PatchOnImport('matplotlib.figure', patch_savefig)
+            sys.meta_path.insert(0, hook)
+
+    try:
+        yield outputs
+    finally:
+        if hook in sys.meta_path:
+            sys.meta_path.remove(hook)
+        for owner, name, original in reversed(patches):
+            setattr(owner, name, original)
+
+
+class DiagramCache:
+    """Manifest and object store for incremental diagram builds"""
+
+    def __init__(self, cache_dir, root):
+        """
+        Args:
+            cache_dir: Directory holding manifest.json and objects/
+            root: Directory script and output paths are recorded relative to
+        """
+        self.cache_dir = Path(cache_dir)
+        self.root = Path(root).resolve()
+        self.manifest_path = self.cache_dir / 'manifest.json'
+        self.objects_dir = self.cache_dir / 'objects'
+        self.layouts_dir = self.cache_dir / 'layouts'
+        self.manifest = self.load()
+
+    def load(self) -> Dict:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                return manifest
+        except (OSError, ValueError):
+            pass
+        return {'version': MANIFEST_VERSION, 'targets': {}}
+
+    def save(self):
+        """Write the manifest and drop objects it no longer references, and stale layouts"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted build never leaves a corrupt file
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+        referenced = {digest for entry in self.manifest['targets'].values()
+                      for digest in entry['outputs'].values()}
+        for stored in self.objects_dir.glob('*/*'):
+            if stored.name not in referenced:
+                stored.unlink()
+
+        if self.layouts_dir.is_dir():
+            from diagram_layout import prune_layouts
+            prune_layouts(self.layouts_dir)
+
+    def key(self, path) -> str:
+        path = Path(path).resolve()
+        try:
+            return path.relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def check(self, script, settings: Optional[Dict] = None) -> Tuple[Optional[str], Dict]:
+        """
+        Decide whether a script needs to run, restoring intact cached outputs.
+
+        Args:
+            script: Diagram script
+            settings: Output settings the runner builds with
+
+        Returns:
+            (reason to build, or None when up to date; fingerprint inputs to
+            pass to record())
+        """
+        inputs = fingerprint_inputs(script, settings)
+        entry = self.manifest['targets'].get(self.key(script))
+        reason = change_reason(entry['inputs'] if entry else None, inputs)
+        if reason is None:
+            reason = self.restore(entry['outputs'])
+        return reason, inputs
+
+    def restore(self, outputs: Dict[str, str]) -> Optional[str]:
+        """Put back outputs that were deleted or edited; returns a reason to rebuild if one can't be"""
+        for name, digest in outputs.items():
+            path = Path(name) if os.path.isabs(name) else self.root / name
+            if path.is_file() and file_hash(path) == digest:
+                continue
+
+            stored = self.object_path(digest)
+            if not stored.is_file():
+                return f"output missing: {name}"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(stored, path)
+        return None
+
+    def record(self, script, inputs: Dict, outputs: List[str], reason: str, seconds: float):
+        """Store a successful build's outputs and add it to the manifest"""
+        stored = {}
+        for output in outputs:
+            if not os.path.isfile(output):
+                continue
+            digest = file_hash(output)
+            target = self.object_path(digest)
+            if not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(output, target.with_suffix('.tmp'))
+                os.replace(target.with_suffix('.tmp'), target)
+            stored[self.key(output)] = digest
+
+        self.manifest['targets'][self.key(script)] = {
+            'fingerprint': fingerprint(inputs),
+            'inputs': inputs,
+            'outputs': stored,
+            'reason': reason,
+            'built_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'seconds': round(seconds, 2),
+        }
+
+    def forget(self, script):
+        """Drop a script from the manifest, e.g. after a failed build"""
+        self.manifest['targets'].pop(self.key(script), None)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Diagram Layout Cache
+Lays each Graphviz graph out once and renders every output format from that layout
+
+Nearly all of Graphviz's time goes into layout. `dot -Tdot` writes the graph
+back out with every node, edge, cluster and label position filled in, and
+`neato -n2` renders such a file without laying it out again. So a diagram
+needed as PNG, SVG and PDF costs one layout plus one cheap rendering pass
+that writes all three formats. Layouts are kept by hash of the DOT source,
+so a later build that only adds a format doesn't lay anything out.
+diagrams gives every node a random id, so the hash is taken with the ids
+numbered in order of appearance; ids never show in the rendered image.
+
+Cache directory layout (inside the build cache):
+    layouts/ab/cdef....dot - positioned graphs by SHA-256 of engine, dot version and source
+
+Usage (through track_outputs in diagram_cache.py):
+    with track_outputs(libraries, formats=['png', 'svg', 'pdf'], layout_dir=cache.layouts_dir) as outputs:
+        runpy.run_path(str(script), run_name='__main__')
+"""
+
+import hashlib
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from diagram_cache import library_version
+
+# Formats diagrams.Diagram accepts as outformat
+FORMATS = ('png', 'jpg', 'svg', 'pdf', 'dot')
+LAYOUT_ENGINE = 'dot'
+# Renders a positioned graph as is: node and edge positions are kept
+RENDER_COMMAND = ['neato', '-n2']
+LAYOUT_MAX_AGE_DAYS = 30
+# Node ids diagrams generates with uuid4().hex; DOT quotes those starting with a digit
+NODE_ID = re.compile(r'"?\b([0-9a-f]{32})\b"?')
+
+
+def canonical_source(source: str) -> str:
+    """DOT source with generated node ids replaced by their order of appearance"""
+    ids: Dict[str, str] = {}
+    return NODE_ID.sub(lambda match: ids.setdefault(match.group(1), f'"node{len(ids)}"'), source)
+
+
+def run_graphviz(command: List[str], cwd: Path):
+    """Run a Graphviz command, raising RuntimeError with its stderr if it fails"""
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command[:2])} failed: {result.stderr.strip()}")
+
+
+def layout(source_path: Path, layout_dir: Path, engine: str = LAYOUT_ENGINE) -> Path:
+    """
+    Positioned graph for a DOT source file, laid out only if no build has yet.
+
+    Runs from the source's directory, like graphviz's render(), so relative
+    image paths resolve the same way.
+    """
+    source_path = Path(source_path).resolve()
+    source = canonical_source(source_path.read_text(encoding='utf-8'))
+    digest = hashlib.sha256('\0'.join([engine, library_version('dot'), source]).encode()).hexdigest()
+    path = Path(layout_dir) / digest[:2] / f'{digest}.dot'
+
+    if path.is_file():
+        # Touch it so prune_layouts() keeps layouts that are still in use
+        os.utime(path)
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per-process temp name: parallel workers may lay out the same graph
+    temp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    run_graphviz([engine, '-Tdot', '-o', str(temp_path), source_path.name], source_path.parent)
+    os.replace(temp_path, path)
+    return path
+
+
+def render_layout(layout_path: Path, outputs: Dict[str, Path], cwd: Path):
+    """Render a positioned graph to several {format: path} outputs in one Graphviz run"""
+    command = list(RENDER_COMMAND)
+    for output_format, output in outputs.items():
+        command += [f'-T{output_format}', '-o', str(output)]
+    run_graphviz(command + [str(layout_path)], cwd)
+
+
+def render_from_layout(graph, render: Callable, formats: List[str], layout_dir: Path,
+                       filename=None, directory=None, view=False, cleanup=False, format=None,
+                       **options) -> List[str]:
+    """
+    Stand-in for graphviz's render() that writes every format in `formats`.
+
+    Outputs are named like render() names them (`<source file>.<format>`).
+    Calls the original `render` for what it doesn't cover: viewing, custom
+    renderers or formatters, explicit outfiles and engines other than dot.
+
+    Returns:
+        Rendered paths, the requested format's first
+    """
+    format = format or graph.format
+    engine = options.pop('engine', None) or graph.engine
+    if (view or options.get('quiet_view') or engine != LAYOUT_ENGINE
+            or any(options.get(name) for name in ('renderer', 'formatter', 'neato_no_op', 'outfile'))):
+        return [render(graph, filename, directory, view=view, cleanup=cleanup, format=format,
+                       engine=engine, **options)]
+
+    source_path = Path(graph.save(filename, directory=directory))
+    outputs = {output_format: Path(f'{source_path}.{output_format}')
+               for output_format in [format] + [name for name in formats if name != format]}
+    render_layout(layout(source_path, layout_dir, engine), outputs, source_path.parent)
+
+    if cleanup:
+        os.remove(source_path)
+    return [str(path) for path in outputs.values()]
+
+
+def prune_layouts(layout_dir: Path, max_age_days: int = LAYOUT_MAX_AGE_DAYS):
+    """Delete layouts no build has used for max_age_days"""
+    cutoff = time.time() - max_age_days * 86400
+    for path in Path(layout_dir).glob('*/*.dot'):
+        if path.stat().st_mtime < cutoff:
+            path.unlink()
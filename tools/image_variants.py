@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Diagram Image Variants
+Writes print, web and thumbnail versions of rendered diagram PNGs
+
+The diagrams are rendered at 300 DPI for print, which makes PNGs of 100+
+megapixels and several MB each - far more than a web page or a README
+needs. For each PNG this writes:
+- print: the original, re-encoded losslessly (kept only if smaller)
+- web:   <name>.web.png, at most 1600 px wide, quantized to a 256-color palette
+- thumb: <name>.thumb.png, at most 400 px wide, quantized the same way
+
+Images are never upscaled. The DPI stored in each variant is scaled with
+its width, so all variants print at the same physical size. Files are
+processed in parallel, one per worker process.
+
+Usage:
+    ./tools/image_variants.py                                  # every PNG in the repository
+    ./tools/image_variants.py 07-Modules-Module-Development/diagrams
+    ./tools/image_variants.py --variants web,thumb --workers 2 figure.png
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Configuration
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SKIP_DIRS = {'.git', 'venv', '.venv', 'node_modules', '__pycache__', '.diagram-cache'}
+PRINT_DPI = 300            # DIAGRAM_CONFIG['dpi'] in the DaC scripts; used when a PNG doesn't record its DPI
+VARIANT_WIDTHS = {
+    'web': 1600,           # course site and README pages
+    'thumb': 400,          # indexes and previews
+}
+VARIANTS = ['print'] + list(VARIANT_WIDTHS)
+PALETTE_COLORS = 256
+
+
+def variant_path(path: Path, variant: str) -> Path:
+    """Where a variant of a PNG is written: the PNG itself for print, <name>.<variant>.png otherwise"""
+    return path if variant == 'print' else path.with_name(f'{path.stem}.{variant}{path.suffix}')
+
+
+def is_variant(path: Path) -> bool:
+    return Path(path.stem).suffix[1:] in VARIANT_WIDTHS
+
+
+def find_images(paths: List[Path]) -> List[Path]:
+    """PNGs given directly or found under directories, excluding variants"""
+    images = []
+    for path in paths:
+        if path.is_dir():
+            for directory, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+                images.extend(Path(directory) / name for name in sorted(filenames) if name.endswith('.png'))
+        elif path.suffix == '.png':
+            images.append(path)
+    return [image for image in images if not is_variant(image)]
+
+
+def quantize(image):
+    """Reduce a PIL image to a palette; fast octree is the only built-in method that keeps alpha"""
+    from PIL import Image
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA')
+    method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    return image.quantize(PALETTE_COLORS, method=method)
+
+
+def write_variants(path, variants: List[str] = VARIANTS) -> Dict[str, Tuple[str, int, int]]:
+    """
+    Write the requested variants of one PNG.
+
+    Args:
+        path: Rendered PNG
+        variants: Any of 'print', 'web', 'thumb'
+
+    Returns:
+        {variant: (variant path, bytes before, bytes after)}; 'before' is the source size
+    """
+    # Imported here so build_diagrams.py only needs Pillow when variants are requested
+    from PIL import Image
+
+    # Rendered diagrams are our own output, far above Pillow's decompression-bomb limit
+    Image.MAX_IMAGE_PIXELS = None
+    path = Path(path)
+    source_bytes = path.stat().st_size
+    results = {}
+
+    with Image.open(path) as image:
+        image.load()
+        dpi = image.info.get('dpi', (PRINT_DPI, PRINT_DPI))[0] or PRINT_DPI
+
+        for variant in variants:
+            target = variant_path(path, variant)
+            if variant == 'print':
+                # Lossless: same pixels, better compression; keep the original if it was already smaller
+                temp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+                try:
+                    image.save(temp_path, format='PNG', optimize=True, dpi=(dpi, dpi))
+                    if temp_path.stat().st_size < source_bytes:
+                        os.replace(temp_path, path)
+                finally:
+                    if temp_path.exists():
+                        temp_path.unlink()
+            else:
+                width = min(VARIANT_WIDTHS[variant], image.width)
+                height = max(1, round(image.height * width / image.width))
+                # reducing_gap shrinks by whole factors first, so 100+ MP sources stay fast
+                resized = image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+                scaled_dpi = dpi * width / image.width
+                quantize(resized).save(target, format='PNG', optimize=True, dpi=(scaled_dpi, scaled_dpi))
+            results[variant] = (str(target), source_bytes, target.stat().st_size)
+
+    return results
+
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def parse_variants(value: str) -> List[str]:
+    """Variant names from a comma-separated list, without duplicates, in the order given"""
+    return list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Write print, web and thumbnail variants of diagram PNGs')
+    parser.add_argument('paths', nargs='*', type=Path, help='PNGs or directories (default: the whole repository)')
+    parser.add_argument('--variants', default=','.join(VARIANTS), help=f"Comma-separated ({', '.join(VARIANTS)})")
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count; each large PNG needs ~1-2 GB)')
+
+    args = parser.parse_args()
+    variants = parse_variants(args.variants)
+    unknown = sorted(set(variants) - set(VARIANTS))
+    if not variants:
+        parser.error("no variants given")
+    if unknown:
+        parser.error(f"unknown variant(s): {', '.join(unknown)} (choose from {', '.join(VARIANTS)})")
+
+    images = find_images(args.paths or [REPO_ROOT])
+    if not images:
+        print("No PNG files found")
+        return
+
+    workers = min(len(images), args.workers or os.cpu_count() or 1)
+    print("=" * 70)
+    print(f"Writing {', '.join(variants)} variants of {len(images)} images on {workers} worker processes")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    totals = {variant: [0, 0] for variant in variants}
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(write_variants, str(image), variants): image for image in images}
+        for future in as_completed(futures):
+            image = futures[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ {image}: {type(e).__name__}: {e}")
+                continue
+
+            sizes = []
+            for variant, (_, before, after) in results.items():
+                totals[variant][0] += before
+                totals[variant][1] += after
+                sizes.append(f"{variant} {format_bytes(after)}")
+            print(f"✅ {image} ({format_bytes(before)} -> {', '.join(sizes)})")
+
+    print("=" * 70)
+    print(f"📊 {len(images) - failed} images in {time.perf_counter() - start:.1f}s")
+    for variant, (before, after) in totals.items():
+        if before:
+            print(f"   {variant:<6} {format_bytes(after):>10}  ({after / before:.1%} of the {format_bytes(before)} rendered)")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Import Time Profile
+Measures how long each diagram script takes to load, before it renders anything
+
+Each script is imported (not run as __main__) in a fresh interpreter with
+`python -X importtime`, from a scratch directory. The time is attributed to
+the top-level packages the script pulls in, so heavy libraries imported at
+module level stand out. Scripts that render at import time also render here,
+into the scratch directory.
+
+Usage:
+    ./tools/profile_imports.py                                 # every diagram target
+    ./tools/profile_imports.py 01-*/DaC/diagram_generation_script.py --top 8
+    ./tools/profile_imports.py --output before.json
+    ./tools/profile_imports.py --compare before.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from build_diagrams import REPO_ROOT, discover_targets
+
+MARKER = '--- diagram script ---'
+
+# Imports the script as a module named 'diagram_script', so __main__ blocks don't run
+LOADER = f'''
+import importlib.util, sys
+sys.path.insert(0, sys.argv[1])
+sys.stderr.write({MARKER!r} + "\\n")
+spec = importlib.util.spec_from_file_location("diagram_script", sys.argv[2])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+'''
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """
+    Seconds per top-level package from `-X importtime` output.
+
+    Only imports made after MARKER count, and only outermost ones (nested
+    imports are already in their parent's cumulative time).
+    """
+    packages: Dict[str, float] = {}
+    lines = stderr.splitlines()
+    if MARKER in lines:
+        lines = lines[lines.index(MARKER) + 1:]
+
+    for line in lines:
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith('  '):
+            continue
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0.0) + int(cumulative) / 1e6
+    return packages
+
+
+def profile_script(script: Path, repeat: int = 3) -> Dict:
+    """
+    Import a script `repeat` times and keep the fastest run.
+
+    Returns:
+        {'total': seconds, 'packages': {package: seconds}} or {'error': message}
+    """
+    best = None
+    with tempfile.TemporaryDirectory() as scratch:
+        for _ in range(repeat):
+            result = subprocess.run(
+                [sys.executable, '-X', 'importtime', '-c', LOADER, str(script.parent), str(script)],
+                cwd=scratch, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                errors = [line for line in (result.stdout + result.stderr).splitlines()
+                          if line and line != MARKER and not line.startswith('import time:')]
+                return {'error': errors[-1] if errors else 'failed'}
+
+            packages = parse_importtime(result.stderr)
+            total = sum(packages.values())
+            if best is None or total < best['total']:
+                best = {'total': round(total, 4), 'packages': {name: round(seconds, 4) for name, seconds in packages.items()}}
+    return best
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description='Import-time profile of the diagram scripts')
+    parser.add_argument('scripts', nargs='*', type=Path, help='Scripts to profile (default: every diagram target)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per script; the fastest is kept')
+    parser.add_argument('--top', type=int, default=4, help='Packages to show per script')
+    parser.add_argument('--output', help='Save the results as JSON')
+    parser.add_argument('--compare', help='Earlier results (JSON) to compare against')
+
+    args = parser.parse_args()
+    scripts = [script.resolve() for script in args.scripts] or discover_targets()
+    baseline = json.load(open(args.compare)) if args.compare else {}
+
+    results: Dict[str, Dict] = {}
+    print("=" * 100)
+    print(f"{'Script':<60}{'Import':>9}{'Before':>9}  Slowest packages")
+    print("=" * 100)
+
+    for script in scripts:
+        key = script.relative_to(REPO_ROOT).as_posix()
+        result = profile_script(script, args.repeat)
+        results[key] = result
+        if 'error' in result:
+            print(f"{key[-59:]:<60}  ❌ {result['error']}")
+            continue
+
+        before = baseline.get(key, {}).get('total')
+        slowest: List[str] = [f"{name} {seconds:.2f}s" for name, seconds in
+                              sorted(result['packages'].items(), key=lambda item: -item[1])[:args.top]]
+        print(f"{key[-59:]:<60}{result['total']:>8.2f}s" + (f"{before:>8.2f}s" if before is not None else ' ' * 9)
+              + f"  {', '.join(slowest)}")
+
+    measured = [result['total'] for result in results.values() if 'error' not in result]
+    print("=" * 100)
+    print(f"📊 {len(measured)} scripts, {sum(measured):.2f}s of imports in total", end='')
+    compared = [key for key, result in results.items() if 'error' not in result and 'total' in baseline.get(key, {})]
+    if compared:
+        before = sum(baseline[key]['total'] for key in compared)
+        after = sum(results[key]['total'] for key in compared)
+        print(f" ({before:.2f}s -> {after:.2f}s across {len(compared)} scripts in {args.compare})", end='')
+    print()
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+        print(f"💾 Saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Topic Diagram Runner
+Shared implementation of the per-topic generate_all_diagrams.py scripts
+
+Each topic's generate_all_diagrams.py only lists its diagram scripts and
+calls run_topic(). The scripts are built with build_diagrams.py's machinery:
+worker processes that import diagrams and graphviz once, each script run
+as __main__ from its own directory, and the repository's incremental cache
+(diagram_cache.py). A diagram built here is up to date for build_diagrams.py,
+and the other way round.
+
+Usage (in a topic's generate_all_diagrams.py):
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tools"))
+    from topic_diagrams import run_topic
+
+    if __name__ == "__main__":
+        sys.exit(run_topic("Topic 12: Advanced Security & Compliance", SCRIPTS, Path(__file__).resolve().parent))
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from build_diagrams import CACHE_DIR, REPO_ROOT, build, build_graph
+from diagram_cache import DiagramCache
+
+
+def run_topic(title: str, scripts: List[str], script_dir: Path,
+              descriptions: Optional[Dict[str, str]] = None, argv: Optional[List[str]] = None) -> int:
+    """
+    Generate a topic's diagrams and print a summary.
+
+    Args:
+        title: Heading, e.g. "Topic 12: Advanced Security & Compliance"
+        scripts: Diagram scripts, relative to script_dir, in build order
+        script_dir: Directory of the topic's diagram scripts
+        descriptions: Optional one-line description per script, for the summary
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Exit status: 0 if every diagram is up to date or was built, 1 otherwise
+    """
+    parser = argparse.ArgumentParser(description=f"Generate all {title.split(':')[0]} diagrams")
+    parser.add_argument("--force", action="store_true", help="Rebuild every diagram, ignoring the cache")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print each script's output")
+    args = parser.parse_args(argv)
+
+    script_dir = Path(script_dir).resolve()
+    descriptions = descriptions or {}
+
+    print("=" * 70)
+    print(title)
+    print("Diagram Generation")
+    print("=" * 70)
+
+    targets = []
+    for script in scripts:
+        if (script_dir / script).is_file():
+            targets.append(script_dir / script)
+        else:
+            print(f"❌ Script not found: {script}")
+
+    cache = DiagramCache(CACHE_DIR, REPO_ROOT)
+    start = time.perf_counter()
+    status = build(targets, build_graph(targets, cache), cache, args.force, args.workers, verbose=args.verbose)
+    elapsed = time.perf_counter() - start
+
+    # Summary
+    print("=" * 70)
+    print("📊 Generation Summary")
+    print("=" * 70)
+    for script in scripts:
+        result = status.get(script_dir / script, 'not found')
+        symbol = '✅' if result in ('built', 'cached') else '❌'
+        description = f" - {descriptions[script]}" if script in descriptions else ''
+        print(f"{symbol} {script} ({result}){description}")
+
+        entry = cache.manifest['targets'].get(cache.key(script_dir / script), {})
+        for output in sorted(entry.get('outputs', {})) if result in ('built', 'cached') else []:
+            path = REPO_ROOT / output
+            if path.is_file():
+                print(f"     {os.path.relpath(path, script_dir)} ({path.stat().st_size / 1024:.1f} KB)")
+
+    succeeded = sum(1 for result in status.values() if result in ('built', 'cached'))
+    print(f"\nTotal: {succeeded}/{len(scripts)} diagrams generated successfully in {elapsed:.1f}s")
+
+    if succeeded == len(scripts):
+        print("🎉 All diagrams generated successfully!")
+        return 0
+    print(f"⚠️  {len(scripts) - succeeded} diagram(s) failed to generate")
+    return 1